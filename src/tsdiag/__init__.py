@@ -4,43 +4,91 @@
 提供AR模型平稳性检验和MA模型可逆性检验功能。
 """
 
-from .core import (
-    stationarity_check,
-    invertibility_check,
-    StationarityResult,
-    InvertibilityResult,
-    RootInfo,
-)
-
-from .stationarity import (
-    check_ar_stationarity,
-    analyze_ar_stability_margin,
-    suggest_ar_modifications,
-    batch_stationarity_check,
-)
-
-from .invertibility import (
-    check_ma_invertibility,
-    analyze_ma_invertibility_margin,
-    suggest_ma_modifications,
-    batch_invertibility_check,
-    compare_ma_models,
-)
-
-from .api import (
-    TSModelDiagnostic,
-    quick_ar_check,
-    quick_ma_check,
-    quick_arma_check,
-    analyze_model_stability,
-    batch_model_analysis,
-)
+import importlib
+
+
+# 公开名称所在的子模块。子模块在首次访问其中的名称时才导入，
+# `import tsdiag` 和 `tsdiag --help` 不会加载NumPy和求根代码
+_SUBMODULES = {
+    'core': (
+        'stationarity_check',
+        'invertibility_check',
+        'stationarity_check_batch',
+        'invertibility_check_batch',
+        'BatchCheckResult',
+        'BATCH_RESULT_DTYPE',
+        'open_result_memmap',
+        'aberth_roots',
+        'AberthResult',
+        'set_root_solver',
+        'set_prefilter',
+        'prefilter_stats',
+        'reset_prefilter_stats',
+        'set_precision_escalation',
+        'set_kernel_backend',
+        'StationarityResult',
+        'InvertibilityResult',
+        'RootInfo',
+    ),
+    'stationarity': (
+        'check_ar_stationarity',
+        'analyze_ar_stability_margin',
+        'suggest_ar_modifications',
+        'batch_stationarity_check',
+        'iter_stationarity_check',
+    ),
+    'invertibility': (
+        'check_ma_invertibility',
+        'analyze_ma_invertibility_margin',
+        'suggest_ma_modifications',
+        'batch_invertibility_check',
+        'iter_invertibility_check',
+        'compare_ma_models',
+    ),
+    'batch': (
+        'BatchDiagnostics',
+    ),
+    'tracking': (
+        'RootTracker',
+    ),
+    'cache': (
+        'DiagnosticsCache',
+        'enable_cache',
+        'disable_cache',
+        'get_cache',
+    ),
+    'api': (
+        'TSModelDiagnostic',
+        'quick_ar_check',
+        'quick_ma_check',
+        'quick_arma_check',
+        'analyze_model_stability',
+        'batch_model_analysis',
+        'iter_model_analysis',
+    ),
+}
+
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+
 
 __version__ = "0.1.0"
 __all__ = [
     # 核心功能
     "stationarity_check",
     "invertibility_check",
+    "stationarity_check_batch",
+    "invertibility_check_batch",
+    "BatchCheckResult",
+    "BATCH_RESULT_DTYPE",
+    "open_result_memmap",
+    "aberth_roots",
+    "AberthResult",
+    "set_root_solver",
+    "set_prefilter",
+    "prefilter_stats",
+    "reset_prefilter_stats",
+    "set_precision_escalation",
+    "set_kernel_backend",
     "StationarityResult",
     "InvertibilityResult",
     "RootInfo",
@@ -50,14 +98,28 @@ __all__ = [
     "analyze_ar_stability_margin",
     "suggest_ar_modifications",
     "batch_stationarity_check",
+    "iter_stationarity_check",
 
     # 可逆性检验
     "check_ma_invertibility",
     "analyze_ma_invertibility_margin",
     "suggest_ma_modifications",
     "batch_invertibility_check",
+    "iter_invertibility_check",
     "compare_ma_models",
 
+    # 批量结果容器
+    "BatchDiagnostics",
+
+    # 特征根跟踪
+    "RootTracker",
+
+    # 结果缓存
+    "DiagnosticsCache",
+    "enable_cache",
+    "disable_cache",
+    "get_cache",
+
     # 高级API
     "TSModelDiagnostic",
     "quick_ar_check",
@@ -65,4 +127,30 @@ __all__ = [
     "quick_arma_check",
     "analyze_model_stability",
     "batch_model_analysis",
+    "iter_model_analysis",
 ]
+
+
+def __getattr__(name: str):
+    """
+    按需导入公开名称所在的子模块，并缓存到包的命名空间中
+    
+    子模块本身（如 tsdiag.core）同样在首次访问时导入，与立即导入子模块时的行为一致。
+    """
+    module = _EXPORTS.get(name)
+    if module is None:
+        try:
+            # 导入子模块时会把它设置为包的属性，之后的访问不再经过这里
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
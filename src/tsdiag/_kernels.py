@@ -0,0 +1,128 @@
+"""
+批量判定的逐元素循环内核
+
+这些函数以显式循环实现，安装numba时经JIT编译后替代 core 中的NumPy向量化实现；
+未安装numba时仍可作为普通Python函数调用（仅用于测试，速度较慢）。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def schur_cohn_decide(poly_tail: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    """
+    逐个模型执行Schur–Cohn递推，某一阶的反射系数不满足条件或无法判定时提前结束
+    
+    Args:
+        poly_tail: (N, p) 多项式系数 [c₁, ..., cₚ]
+        lower: 反射系数绝对值小于该值时继续降阶
+        upper: 反射系数绝对值不小于该值时判定为有根在单位圆内或单位圆上
+    
+    Returns:
+        np.ndarray: (N,) int8数组，1 表示所有根都在单位圆外，0 表示不满足，
+        -1 表示某个反射系数落在 [lower, upper) 内而无法判定
+    """
+    n_models, order = poly_tail.shape
+    decisions = np.ones(n_models, dtype=np.int8)
+    work = np.empty(order, dtype=np.float64)
+    reduced = np.empty(order, dtype=np.float64)
+    
+    for row in range(n_models):
+        for i in range(order):
+            work[i] = poly_tail[row, i]
+        
+        for m in range(order, 0, -1):
+            reflection = work[m - 1]
+            if not abs(reflection) < upper:
+                decisions[row] = 0
+                break
+            if not abs(reflection) < lower:
+                decisions[row] = -1
+                break
+            
+            denominator = 1.0 - reflection * reflection
+            for i in range(m - 1):
+                reduced[i] = (work[i] - reflection * work[m - 2 - i]) / denominator
+            for i in range(m - 1):
+                work[i] = reduced[i]
+    
+    return decisions
+
+
+def newton_corrections(coeffs: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """
+    逐个近似根计算Newton修正量 p(z)/p'(z)，|z| > 1 时在互反多项式上做Horner求值
+    
+    Args:
+        coeffs: 多项式系数，从常数项到最高次项
+        z: 近似根
+    
+    Returns:
+        np.ndarray: 每个近似根的修正量，恰好落在根上时为0，导数为零时为非有限值
+    """
+    degree = len(coeffs) - 1
+    ratios = np.empty(len(z), dtype=np.complex128)
+    
+    for i in range(len(z)):
+        x = z[i]
+        outside = abs(x) > 1.0
+        if outside:
+            x = 1.0 / x
+        
+        value = complex(coeffs[0] if outside else coeffs[degree])
+        derivative = 0j
+        for k in range(1, degree + 1):
+            derivative = derivative * x + value
+            value = value * x + (coeffs[k] if outside else coeffs[degree - k])
+        
+        if value == 0:
+            ratios[i] = 0j
+        elif outside:
+            ratios[i] = z[i] / (degree - x * derivative / value)
+        elif derivative == 0:
+            # 导数为零（如重根附近）时与NumPy实现一致返回非有限值，由调用方停止迭代
+            ratios[i] = complex(np.inf, np.nan)
+        else:
+            ratios[i] = value / derivative
+    
+    return ratios
+
+
+def classify_roots(roots: np.ndarray, threshold: float):
+    """
+    逐行统计有限根的最小模长，并判断是否所有根都在单位圆外
+    
+    Args:
+        roots: (N, p) 复数根，无穷远处的根为inf
+        threshold: 单位圆外的模长下限 1 + tol
+    
+    Returns:
+        Tuple: ((N,) 判定结果, (N,) 最小有限根模长，无有限根时为inf)
+    """
+    n_models, order = roots.shape
+    flags = np.empty(n_models, dtype=np.bool_)
+    min_moduli = np.empty(n_models, dtype=np.float64)
+    
+    for row in range(n_models):
+        smallest = np.inf
+        for i in range(order):
+            modulus = abs(roots[row, i])
+            if modulus < smallest:
+                smallest = modulus
+        min_moduli[row] = smallest
+        flags[row] = smallest > threshold
+    
+    return flags, min_moduli
+
+
+if NUMBA_AVAILABLE:
+    schur_cohn_decide = njit(cache=True)(schur_cohn_decide)
+    newton_corrections = njit(cache=True)(newton_corrections)
+    classify_roots = njit(cache=True)(classify_roots)
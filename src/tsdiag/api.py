@@ -4,24 +4,55 @@
 提供简洁易用的Python库接口。
 """
 
+import multiprocessing
 import numpy as np
-from typing import List, Union, Dict, Any, Tuple, Optional
-from .core import stationarity_check, invertibility_check, StationarityResult, InvertibilityResult
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Union, Dict, Any, Tuple, Optional, Iterable, Iterator, Deque
+from .core import (
+    stationarity_check,
+    invertibility_check,
+    stationarity_check_batch,
+    invertibility_check_batch,
+    StationarityResult,
+    InvertibilityResult,
+    _build_stationarity_result,
+    _build_invertibility_result,
+    _build_characteristic_polynomial,
+    _finite_roots,
+    _validate_coefficients,
+    _validate_method,
+    _validate_batch,
+    _bucketed_check,
+    _resolve_n_jobs,
+    _iter_model_chunks,
+    _iter_named_model_chunks,
+    _validate_chunk_size,
+    _risk_level,
+)
 from .stationarity import (
     check_ar_stationarity, 
     analyze_ar_stability_margin, 
     suggest_ar_modifications,
-    batch_stationarity_check
+    batch_stationarity_check,
+    _suggestions_from_result as _ar_suggestions_from_result,
+    _margin_from_result as _ar_margin_from_result,
 )
 from .invertibility import (
     check_ma_invertibility,
     analyze_ma_invertibility_margin,
     suggest_ma_modifications,
     batch_invertibility_check,
-    compare_ma_models
+    compare_ma_models,
+    _suggestions_from_result as _ma_suggestions_from_result,
+    _margin_from_result as _ma_margin_from_result,
 )
 
 
+# batch_model_analysis 的并行方式
+_PARALLEL_BACKENDS = ('processes', 'threads')
+
+
 class TSModelDiagnostic:
     """
     时间序列模型诊断类
@@ -123,37 +154,50 @@ class TSModelDiagnostic:
         return summary
 
 
-def quick_ar_check(coefficients: Union[List[float], np.ndarray]) -> bool:
+def quick_ar_check(coefficients: Union[List[float], np.ndarray], method: str = 'roots') -> bool:
     """
     快速AR平稳性检验，只返回布尔结果
     
     Args:
         coefficients: AR系数
+        method: 判定方法，'roots' 求特征根（默认），'schur' 使用
+            Schur–Cohn递推，不求根，计算量为 O(p²)
         
     Returns:
         bool: 是否平稳
     """
+    if _validate_method(method) == 'schur':
+        coeffs = _validate_coefficients(coefficients, "AR")
+        return bool(stationarity_check_batch([coeffs], method='schur').flags[0])
+    
     result = stationarity_check(coefficients)
     return result.is_stationary
 
 
-def quick_ma_check(coefficients: Union[List[float], np.ndarray]) -> bool:
+def quick_ma_check(coefficients: Union[List[float], np.ndarray], method: str = 'roots') -> bool:
     """
     快速MA可逆性检验，只返回布尔结果
     
     Args:
         coefficients: MA系数
+        method: 判定方法，'roots' 求特征根（默认），'schur' 使用
+            Schur–Cohn递推，不求根，计算量为 O(p²)
         
     Returns:
         bool: 是否可逆
     """
+    if _validate_method(method) == 'schur':
+        coeffs = _validate_coefficients(coefficients, "MA")
+        return bool(invertibility_check_batch([coeffs], method='schur').flags[0])
+    
     result = invertibility_check(coefficients)
     return result.is_invertible
 
 
 def quick_arma_check(
     ar_coefficients: Union[List[float], np.ndarray],
-    ma_coefficients: Union[List[float], np.ndarray]
+    ma_coefficients: Union[List[float], np.ndarray],
+    method: str = 'roots'
 ) -> Tuple[bool, bool]:
     """
     快速ARMA模型检验，只返回布尔结果
@@ -161,12 +205,13 @@ def quick_arma_check(
     Args:
         ar_coefficients: AR系数
         ma_coefficients: MA系数
+        method: 判定方法，'roots' 或 'schur'
         
     Returns:
         Tuple[bool, bool]: (是否平稳, 是否可逆)
     """
-    ar_stationary = quick_ar_check(ar_coefficients)
-    ma_invertible = quick_ma_check(ma_coefficients)
+    ar_stationary = quick_ar_check(ar_coefficients, method=method)
+    ma_invertible = quick_ma_check(ma_coefficients, method=method)
     return ar_stationary, ma_invertible
 
 
@@ -184,6 +229,57 @@ def _convert_numpy_types(obj):
         return float(obj)
     return obj
 
+
+def _ar_analysis(result: StationarityResult, margin: float) -> Dict[str, Any]:
+    """根据已有的平稳性检验结果构建AR部分的分析字典"""
+    suggestions = _ar_suggestions_from_result(result)
+    return {
+        'is_stationary': result.is_stationary,
+        'coefficients': result.ar_coefficients,
+        'roots': [{'value': str(root.value), 'magnitude': root.magnitude,
+                  'outside_unit_circle': root.is_outside_unit_circle}
+                 for root in result.roots],
+        'stability_margin': margin,
+        'precision_escalated': result.precision_escalated,
+        'risk_level': _risk_level(margin),
+        'suggestions': suggestions['suggestions'],
+        'suggested_coefficients': suggestions.get('suggested_coefficients')
+    }
+
+
+def _ma_analysis(result: InvertibilityResult, margin: float) -> Dict[str, Any]:
+    """根据已有的可逆性检验结果构建MA部分的分析字典"""
+    suggestions = _ma_suggestions_from_result(result)
+    return {
+        'is_invertible': result.is_invertible,
+        'coefficients': result.ma_coefficients,
+        'roots': [{'value': str(root.value), 'magnitude': root.magnitude,
+                  'outside_unit_circle': root.is_outside_unit_circle}
+                 for root in result.roots],
+        'invertibility_margin': margin,
+        'precision_escalated': result.precision_escalated,
+        'risk_level': _risk_level(margin),
+        'suggestions': suggestions['suggestions'],
+        'suggested_coefficients': suggestions.get('suggested_coefficients')
+    }
+
+
+def _overall_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """综合AR和MA部分的分析结果"""
+    risk_levels = ['low', 'medium', 'high']
+    return {
+        'model_valid': analysis['ar']['is_stationary'] and analysis['ma']['is_invertible'],
+        'min_stability_margin': min(
+            analysis['ar']['stability_margin'],
+            analysis['ma']['invertibility_margin']
+        ),
+        'max_risk_level': risk_levels[max(
+            risk_levels.index(analysis['ar']['risk_level']),
+            risk_levels.index(analysis['ma']['risk_level'])
+        )]
+    }
+
+
 def analyze_model_stability(
     ar_coefficients: Union[List[float], np.ndarray] = None,
     ma_coefficients: Union[List[float], np.ndarray] = None
@@ -200,71 +296,55 @@ def analyze_model_stability(
     """
     analysis = {}
     
+    # 每个多项式只求一次根，边际、风险等级和建议都由同一个检验结果导出
     if ar_coefficients is not None:
         ar_result = check_ar_stationarity(ar_coefficients, verbose=False)
-        ar_stability = analyze_ar_stability_margin(ar_coefficients)
-        ar_suggestions = suggest_ar_modifications(ar_coefficients)
-        
-        analysis['ar'] = {
-            'is_stationary': ar_result.is_stationary,
-            'coefficients': ar_result.ar_coefficients,
-            'roots': [{'value': str(root.value), 'magnitude': root.magnitude, 
-                      'outside_unit_circle': root.is_outside_unit_circle} 
-                     for root in ar_result.roots],
-            'stability_margin': ar_stability['stability_margin'],
-            'risk_level': ar_stability['risk_level'],
-            'suggestions': ar_suggestions['suggestions'],
-            'suggested_coefficients': ar_suggestions.get('suggested_coefficients')
-        }
+        ar_margin = _ar_margin_from_result(ar_result)['stability_margin']
+        analysis['ar'] = _ar_analysis(ar_result, ar_margin)
     
     if ma_coefficients is not None:
         ma_result = check_ma_invertibility(ma_coefficients, verbose=False)
-        ma_invertibility = analyze_ma_invertibility_margin(ma_coefficients)
-        ma_suggestions = suggest_ma_modifications(ma_coefficients)
-        
-        analysis['ma'] = {
-            'is_invertible': ma_result.is_invertible,
-            'coefficients': ma_result.ma_coefficients,
-            'roots': [{'value': str(root.value), 'magnitude': root.magnitude,
-                      'outside_unit_circle': root.is_outside_unit_circle}
-                     for root in ma_result.roots],
-            'invertibility_margin': ma_invertibility['invertibility_margin'],
-            'risk_level': ma_invertibility['risk_level'],
-            'suggestions': ma_suggestions['suggestions'],
-            'suggested_coefficients': ma_suggestions.get('suggested_coefficients')
-        }
+        ma_margin = _ma_margin_from_result(ma_result)['invertibility_margin']
+        analysis['ma'] = _ma_analysis(ma_result, ma_margin)
     
     # 综合评估
     if 'ar' in analysis and 'ma' in analysis:
-        analysis['overall'] = {
-            'model_valid': analysis['ar']['is_stationary'] and analysis['ma']['is_invertible'],
-            'min_stability_margin': min(
-                analysis['ar']['stability_margin'],
-                analysis['ma']['invertibility_margin']
-            ),
-            'max_risk_level': max(
-                ['low', 'medium', 'high'].index(analysis['ar']['risk_level']),
-                ['low', 'medium', 'high'].index(analysis['ma']['risk_level'])
-            )
-        }
-        analysis['overall']['max_risk_level'] = ['low', 'medium', 'high'][analysis['overall']['max_risk_level']]
+        analysis['overall'] = _overall_analysis(analysis)
     
     return _convert_numpy_types(analysis)
 
 
 def batch_model_analysis(
     models: List[Dict[str, Union[List[float], np.ndarray]]],
-    model_names: List[str] = None
+    model_names: List[str] = None,
+    bucket_width: int = 1,
+    n_jobs: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    backend: str = 'processes'
 ) -> List[Dict[str, Any]]:
     """
     批量模型分析
     
+    模型按阶数分桶，每个桶内的AR（或MA）部分通过一次批量特征值计算求根，
+    结果按输入顺序返回，单个模型的错误不会影响其他模型。
+    
     Args:
         models: 模型列表，每个模型是包含'ar'和/或'ma'键的字典
         model_names: 模型名称列表（可选）
+        bucket_width: 分桶宽度。默认为1，即严格按阶数分组；大于1时阶数向上
+            取整到其倍数并在高次项补零，适合阶数分散、每种阶数模型较少的批量
+        n_jobs: 并行数。None或1表示在当前进程中串行计算，-1表示使用全部CPU核心
+        chunk_size: 每个进程任务包含的模型数，默认按进程数的4倍均分
+        backend: n_jobs大于1时的并行方式
+            - 'processes': 按块分发到进程池，适合大批量离线计算（默认）
+            - 'threads': 在当前进程中用线程池并行求根，没有序列化开销，
+              适合中等阶数、批量较小的场景
         
     Returns:
         List[Dict]: 每个模型的分析结果
+        
+    Raises:
+        ValueError: 如果模型名称数量与模型数量不同，或 n_jobs、chunk_size、backend 无效
     """
     if model_names is None:
         model_names = [f"Model_{i+1}" for i in range(len(models))]
@@ -272,24 +352,318 @@ def batch_model_analysis(
     if len(model_names) != len(models):
         raise ValueError("模型名称数量必须与模型数量相同")
     
-    results = []
+    n_jobs = 1 if n_jobs is None else _resolve_n_jobs(n_jobs)
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size必须是正整数")
+    if backend not in _PARALLEL_BACKENDS:
+        raise ValueError(f"未知的并行方式: {backend}，可选值为 {', '.join(_PARALLEL_BACKENDS)}")
     
-    for i, (model, name) in enumerate(zip(models, model_names)):
-        try:
-            ar_coeffs = model.get('ar')
-            ma_coeffs = model.get('ma')
-            
-            analysis = analyze_model_stability(ar_coeffs, ma_coeffs)
-            analysis['model_name'] = name
-            analysis['model_index'] = i
-            
-            results.append(analysis)
+    ar_valid, ma_valid, errors = _split_models(models)
+    indices = [i for i in range(len(models)) if i not in errors]
+    
+    if n_jobs == 1 or len(indices) == 0:
+        analyses = _analyze_models(indices, ar_valid, ma_valid, bucket_width)
+    elif backend == 'threads':
+        analyses = _analyze_models(indices, ar_valid, ma_valid, bucket_width, backend='threads', n_jobs=n_jobs)
+    else:
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(indices) // (n_jobs * 4)))
+        chunks = [
+            _pack_models(indices[start:start + chunk_size], ar_valid, ma_valid)
+            for start in range(0, len(indices), chunk_size)
+        ]
+        
+        analyses = {}
+        with _process_pool(min(n_jobs, len(chunks))) as executor:
+            futures = [executor.submit(_analyze_packed_models, chunk, bucket_width) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                analyses.update(zip(chunk['indices'].tolist(), _chunk_result(future, chunk, bucket_width)))
+    
+    return _assemble_results(model_names, errors, analyses)
+
+
+def iter_model_analysis(
+    models: Iterable[Dict[str, Union[List[float], np.ndarray]]],
+    model_names: Optional[Iterable[str]] = None,
+    chunk_size: int = 1024,
+    bucket_width: int = 1,
+    n_jobs: Optional[int] = None,
+    backend: str = 'processes'
+) -> Iterator[Dict[str, Any]]:
+    """
+    流式批量模型分析
+    
+    按 chunk_size 从任意可迭代对象中读取模型，每块做一次分桶的向量化分析，
+    按输入顺序逐个产出结果。内存占用只与块大小和并行数有关，与模型总数无关。
+    
+    使用进程池时，每块作为一个任务提交，同时在途的任务最多为进程数的2倍，
+    消费者处理较慢时不会无限制地读入输入。
+    
+    Args:
+        models: 模型的可迭代对象，每个模型是包含'ar'和/或'ma'键的字典
+        model_names: 模型名称的可迭代对象（可选），数量必须与模型数量相同
+        chunk_size: 每块的模型数
+        bucket_width: 分桶宽度
+        n_jobs: 并行数。None或1表示串行计算，-1表示使用全部CPU核心
+        backend: n_jobs大于1时的并行方式，'processes' 或 'threads'
+        
+    Returns:
+        Iterator[Dict]: 与 batch_model_analysis 格式相同的分析结果，model_index 为全局索引
+        
+    Raises:
+        ValueError: 如果参数无效；名称数量与模型数量不同时在迭代过程中抛出
+    """
+    _validate_chunk_size(chunk_size)
+    chunks = _iter_model_chunks(models, model_names, chunk_size)
+    return _iter_chunk_analysis(chunks, bucket_width, n_jobs, backend)
+
+
+def _iter_named_model_analysis(
+    named_models: Iterable[Tuple[str, Dict[str, Union[List[float], np.ndarray]]]],
+    chunk_size: int = 1024,
+    bucket_width: int = 1,
+    n_jobs: Optional[int] = None,
+    backend: str = 'processes'
+) -> Iterator[Dict[str, Any]]:
+    """与 iter_model_analysis 相同，但输入为 (名称, 模型) 对，名称与模型一起读取"""
+    _validate_chunk_size(chunk_size)
+    chunks = _iter_named_model_chunks(named_models, chunk_size)
+    return _iter_chunk_analysis(chunks, bucket_width, n_jobs, backend)
+
+
+def _iter_chunk_analysis(
+    chunks: Iterator[Tuple[int, List[Dict[str, Any]], List[str]]],
+    bucket_width: int,
+    n_jobs: Optional[int],
+    backend: str
+) -> Iterator[Dict[str, Any]]:
+    """逐块分析 (全局偏移, 模型列表, 名称列表)，按输入顺序产出结果"""
+    n_jobs = 1 if n_jobs is None else _resolve_n_jobs(n_jobs)
+    if backend not in _PARALLEL_BACKENDS:
+        raise ValueError(f"未知的并行方式: {backend}，可选值为 {', '.join(_PARALLEL_BACKENDS)}")
+    
+    def generate_serial() -> Iterator[Dict[str, Any]]:
+        for offset, chunk, names in chunks:
+            ar_valid, ma_valid, errors = _split_models(chunk)
+            indices = [i for i in range(len(chunk)) if i not in errors]
+            analyses = _analyze_models(
+                indices, ar_valid, ma_valid, bucket_width,
+                backend='threads' if n_jobs > 1 else 'serial', n_jobs=n_jobs
+            )
+            yield from _assemble_results(names, errors, analyses, offset)
+    
+    def generate_processes() -> Iterator[Dict[str, Any]]:
+        pending: Deque[Tuple[int, List[str], Dict[int, str], Dict[str, np.ndarray], Future]] = deque()
+        
+        with _process_pool(n_jobs) as executor:
+            for offset, chunk, names in chunks:
+                ar_valid, ma_valid, errors = _split_models(chunk)
+                indices = [i for i in range(len(chunk)) if i not in errors]
+                packed = _pack_models(indices, ar_valid, ma_valid)
+                future = executor.submit(_analyze_packed_models, packed, bucket_width)
+                pending.append((offset, names, errors, packed, future))
+                
+                if len(pending) >= 2 * n_jobs:
+                    yield from _collect_chunk(*pending.popleft(), bucket_width)
             
-        except Exception as e:
+            while pending:
+                yield from _collect_chunk(*pending.popleft(), bucket_width)
+    
+    if n_jobs > 1 and backend == 'processes':
+        return generate_processes()
+    return generate_serial()
+
+
+def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """创建批量分析的进程池，调用方可能已有线程，使用spawn启动子进程而不是fork"""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _chunk_result(future: Future, chunk: Dict[str, np.ndarray], bucket_width: int) -> List[Dict[str, Any]]:
+    """取回一个进程任务的结果，任务失败（如工作进程异常退出）时在当前进程中重新分析该块"""
+    try:
+        return future.result()
+    except Exception:
+        return _analyze_packed_models(chunk, bucket_width)
+
+
+def _collect_chunk(
+    offset: int,
+    names: List[str],
+    errors: Dict[int, str],
+    chunk: Dict[str, np.ndarray],
+    future: Future,
+    bucket_width: int
+) -> List[Dict[str, Any]]:
+    """等待一个进程任务完成并组装该块的结果"""
+    analyses = dict(zip(chunk['indices'].tolist(), _chunk_result(future, chunk, bucket_width)))
+    return _assemble_results(names, errors, analyses, offset)
+
+
+def _assemble_results(
+    model_names: List[str],
+    errors: Dict[int, str],
+    analyses: Dict[int, Dict[str, Any]],
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """按输入顺序组装分析结果，出错的模型只包含错误信息，model_index 加上块的全局偏移"""
+    results = []
+    
+    for i, name in enumerate(model_names):
+        if i in errors:
             results.append({
                 'model_name': name,
-                'model_index': i,
-                'error': str(e)
+                'model_index': offset + i,
+                'error': errors[i]
             })
+            continue
+        
+        analysis = analyses[i]
+        analysis['model_name'] = name
+        analysis['model_index'] = offset + i
+        results.append(analysis)
     
     return results
+
+
+def _split_models(
+    models: List[Dict[str, Union[List[float], np.ndarray]]]
+) -> Tuple[Dict[int, List[float]], Dict[int, List[float]], Dict[int, str]]:
+    """拆分出每个模型的AR和MA部分并验证，返回 (AR系数, MA系数, 错误信息)"""
+    ar_inputs: Dict[int, Any] = {}
+    ma_inputs: Dict[int, Any] = {}
+    errors: Dict[int, str] = {}
+    
+    for i, model in enumerate(models):
+        try:
+            if model.get('ar') is not None:
+                ar_inputs[i] = model['ar']
+            if model.get('ma') is not None:
+                ma_inputs[i] = model['ma']
+        except Exception as e:
+            errors[i] = str(e)
+    
+    ar_valid, ar_errors = _validate_batch(ar_inputs, "AR")
+    ma_valid, ma_errors = _validate_batch(ma_inputs, "MA")
+    
+    # AR部分的错误优先报告
+    for i, error in {**ma_errors, **ar_errors}.items():
+        errors.setdefault(i, error)
+    
+    ar_valid = {i: c for i, c in ar_valid.items() if i not in errors}
+    ma_valid = {i: c for i, c in ma_valid.items() if i not in errors}
+    
+    return ar_valid, ma_valid, errors
+
+
+def _analyze_models(
+    indices: List[int],
+    ar_valid: Dict[int, List[float]],
+    ma_valid: Dict[int, List[float]],
+    bucket_width: int,
+    backend: str = 'serial',
+    n_jobs: Optional[int] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    对已验证的模型按阶数分桶检验，返回 {模型索引: 分析结果}，既无AR也无MA部分的模型结果为空
+    
+    分桶计算失败时改为逐个模型分析，出错的模型结果只包含错误信息，不影响其他模型。
+    """
+    try:
+        return _analyze_bucketed(indices, ar_valid, ma_valid, bucket_width, backend, n_jobs)
+    except Exception:
+        return {i: _analyze_single(ar_valid.get(i), ma_valid.get(i)) for i in indices}
+
+
+def _analyze_single(ar_coefficients: Optional[List[float]], ma_coefficients: Optional[List[float]]) -> Dict[str, Any]:
+    """逐个模型分析，出错时返回只包含错误信息的结果"""
+    try:
+        return analyze_model_stability(ar_coefficients, ma_coefficients)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _analyze_bucketed(
+    indices: List[int],
+    ar_valid: Dict[int, List[float]],
+    ma_valid: Dict[int, List[float]],
+    bucket_width: int,
+    backend: str,
+    n_jobs: Optional[int]
+) -> Dict[int, Dict[str, Any]]:
+    """_analyze_models 的分桶批量实现"""
+    ar_outcomes = _bucketed_check(ar_valid, stationarity_check_batch, bucket_width, backend=backend, n_jobs=n_jobs)
+    ma_outcomes = _bucketed_check(ma_valid, invertibility_check_batch, bucket_width, backend=backend, n_jobs=n_jobs)
+    
+    analyses: Dict[int, Dict[str, Any]] = {}
+    
+    for i in indices:
+        analysis = {}
+        
+        if i in ar_outcomes:
+            coeffs = ar_valid[i]
+            _, min_modulus, roots, escalated = ar_outcomes[i]
+            ar_result = _build_stationarity_result(
+                coeffs,
+                _build_characteristic_polynomial([-c for c in coeffs]),
+                _finite_roots(roots),
+                escalated
+            )
+            analysis['ar'] = _ar_analysis(ar_result, min_modulus - 1.0)
+        
+        if i in ma_outcomes:
+            coeffs = ma_valid[i]
+            _, min_modulus, roots, escalated = ma_outcomes[i]
+            ma_result = _build_invertibility_result(
+                coeffs,
+                _build_characteristic_polynomial(coeffs),
+                _finite_roots(roots),
+                escalated
+            )
+            analysis['ma'] = _ma_analysis(ma_result, min_modulus - 1.0)
+        
+        if 'ar' in analysis and 'ma' in analysis:
+            analysis['overall'] = _overall_analysis(analysis)
+        
+        analyses[i] = _convert_numpy_types(analysis)
+    
+    return analyses
+
+
+def _pack_models(
+    indices: List[int],
+    ar_valid: Dict[int, List[float]],
+    ma_valid: Dict[int, List[float]]
+) -> Dict[str, np.ndarray]:
+    """
+    将一组模型的系数打包为扁平数组，作为进程间传输的紧凑格式
+    
+    每部分只传输一个float64数组和一个长度数组（长度为0表示没有该部分），
+    序列化开销远小于逐个模型的列表和字典。
+    """
+    chunk = {'indices': np.asarray(indices, dtype=np.int64)}
+    for part, valid in (('ar', ar_valid), ('ma', ma_valid)):
+        lengths = np.array([len(valid.get(i, ())) for i in indices], dtype=np.int64)
+        values = [valid[i] for i in indices if i in valid]
+        chunk[f'{part}_lengths'] = lengths
+        chunk[f'{part}_values'] = np.concatenate(values).astype(float) if values else np.empty(0)
+    return chunk
+
+
+def _unpack_models(chunk: Dict[str, np.ndarray]) -> Tuple[Dict[int, List[float]], Dict[int, List[float]]]:
+    """_pack_models 的逆过程，返回 (AR系数, MA系数)"""
+    indices = chunk['indices'].tolist()
+    parts = []
+    for part in ('ar', 'ma'):
+        lengths = chunk[f'{part}_lengths']
+        values = np.split(chunk[f'{part}_values'], np.cumsum(lengths)[:-1])
+        parts.append({i: row.tolist() for i, length, row in zip(indices, lengths, values) if length > 0})
+    return parts[0], parts[1]
+
+
+def _analyze_packed_models(chunk: Dict[str, np.ndarray], bucket_width: int) -> List[Dict[str, Any]]:
+    """在工作进程中分析一组打包的模型，结果顺序与 chunk['indices'] 一致"""
+    indices = chunk['indices'].tolist()
+    ar_valid, ma_valid = _unpack_models(chunk)
+    analyses = _analyze_models(indices, ar_valid, ma_valid, bucket_width)
+    return [analyses[i] for i in indices]
@@ -0,0 +1,320 @@
+"""
+Apache Arrow / Parquet 列式读写
+
+将Arrow表中的系数列表列直接转换为 (N, p) 的NumPy系数矩阵进行批量检验，
+并将 BatchDiagnostics 的结果写回为Arrow表或Parquet文件。需要安装pyarrow。
+
+定长列表列（fixed_size_list<double>）且没有空值时，系数矩阵是Arrow缓冲区的零拷贝视图；
+变长列表列按列表长度分组，每组作为同阶系数矩阵批量检验，不按最大阶数补零。
+"""
+
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+from .batch import BatchDiagnostics, _KINDS, _validate_kind
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+ARROW_AVAILABLE = pa is not None
+
+# 读取Parquet时默认的模型名称列
+_NAME_COLUMN = 'name'
+
+
+def _require_arrow() -> None:
+    """检查是否安装了pyarrow"""
+    if not ARROW_AVAILABLE:
+        raise ImportError("读写Arrow/Parquet需要先安装pyarrow: pip install pyarrow")
+
+
+def _single_array(column):
+    """取出ChunkedArray中的数据，单块时直接取出，多块时需要合并（会复制）"""
+    if isinstance(column, pa.ChunkedArray):
+        return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    return column
+
+
+def _check_list_type(column, name: str) -> bool:
+    """
+    检查列表列的类型
+    
+    Returns:
+        bool: 是否为定长列表列
+    
+    Raises:
+        TypeError: 如果列不是列表类型
+    """
+    list_type = column.type
+    if pa.types.is_fixed_size_list(list_type):
+        return True
+    if pa.types.is_list(list_type) or pa.types.is_large_list(list_type):
+        return False
+    raise TypeError(f"{name}系数列必须是列表类型，实际为 {list_type}")
+
+
+def _row_errors(column, lengths: np.ndarray, finite: np.ndarray, name: str) -> Dict[int, str]:
+    """收集空值、空列表和包含非有限数值的行的错误信息"""
+    errors: Dict[int, str] = {}
+    if column.null_count:
+        for row in np.flatnonzero(~column.is_valid().to_numpy(zero_copy_only=False)):
+            errors[int(row)] = f"{name}系数缺失"
+    for row in np.flatnonzero(lengths == 0):
+        errors.setdefault(int(row), f"{name}系数不能为空")
+    for row in np.flatnonzero(~finite):
+        errors.setdefault(int(row), f"{name}系数必须都是有限数值")
+    return errors
+
+
+def list_column_groups(column, name: str = 'AR') -> Tuple[Dict[int, Tuple[np.ndarray, np.ndarray]], Dict[int, str]]:
+    """
+    将Arrow系数列表列按列表长度分组为同阶系数矩阵
+    
+    定长列表列只有一组，没有无效行时是Arrow缓冲区的零拷贝视图；变长列表列的每组
+    按偏移量从扁平子数组中取出，内存占用与系数总数相当，不随最大阶数增长。
+    
+    Args:
+        column: list、large_list 或 fixed_size_list 类型的 pa.Array 或 pa.ChunkedArray
+        name: 模型类型名称，用于错误信息
+    
+    Returns:
+        Tuple: ({阶数: ((n,) 行号, (n, 阶数) 系数矩阵)}, {行号: 错误信息})，
+        出错的行（空值、空列表或非有限数值）不属于任何一组
+    
+    Raises:
+        ImportError: 如果未安装pyarrow
+        TypeError: 如果列不是列表类型
+    """
+    _require_arrow()
+    column = _single_array(column)
+    n_models = len(column)
+    
+    if _check_list_type(column, name):
+        matrix, lengths = _fixed_size_matrix(column)
+        groups = {matrix.shape[1]: (np.arange(n_models, dtype=np.int64), matrix)} if n_models else {}
+    else:
+        offsets, lengths = _list_offsets(column)
+        values = np.asarray(column.values.to_numpy(zero_copy_only=False), dtype=float)
+        groups = {}
+        for order in np.unique(lengths[lengths > 0]).tolist():
+            rows = np.flatnonzero(lengths == order)
+            groups[order] = (rows, values[offsets[rows][:, np.newaxis] + np.arange(order)])
+    
+    finite = np.ones(n_models, dtype=bool)
+    for rows, matrix in groups.values():
+        finite[rows] = np.all(np.isfinite(matrix), axis=1)
+    errors = _row_errors(column, lengths, finite, name)
+    
+    if errors:
+        invalid = np.fromiter(errors.keys(), dtype=np.int64, count=len(errors))
+        for order, (rows, matrix) in list(groups.items()):
+            keep = ~np.isin(rows, invalid)
+            if keep.any():
+                groups[order] = (rows[keep], matrix[keep])
+            else:
+                del groups[order]
+    
+    return groups, errors
+
+
+def _fixed_size_matrix(column) -> Tuple[np.ndarray, np.ndarray]:
+    """定长列表列：子数组按行重排为矩阵，float64且无空值时零拷贝"""
+    order = column.type.list_size
+    values = column.values.slice(column.offset * order, len(column) * order)
+    flat = values.to_numpy(zero_copy_only=False)
+    matrix = np.asarray(flat, dtype=float).reshape(len(column), order)
+    
+    lengths = np.full(len(column), order, dtype=np.int64)
+    if column.null_count:
+        lengths[~column.is_valid().to_numpy(zero_copy_only=False)] = 0
+    return matrix, lengths
+
+
+def _list_offsets(column) -> Tuple[np.ndarray, np.ndarray]:
+    """变长列表列每行在扁平子数组中的起点和长度，空值行的长度为零"""
+    offsets = column.offsets.to_numpy(zero_copy_only=False).astype(np.int64)
+    lengths = np.diff(offsets)
+    if column.null_count:
+        # 空值行的偏移区间不保证为空
+        lengths[~column.is_valid().to_numpy(zero_copy_only=False)] = 0
+    return offsets[:-1], lengths
+
+
+def from_arrow(
+    data,
+    kind: str = 'ar',
+    column: Optional[str] = None,
+    name_column: Optional[str] = _NAME_COLUMN
+) -> BatchDiagnostics:
+    """
+    对Arrow数据中的系数列表列做批量检验
+    
+    Args:
+        data: pa.Table、pa.RecordBatch，或直接给出系数列（pa.Array/pa.ChunkedArray）
+        kind: 模型类型，'ar' 或 'ma'
+        column: 系数列名，默认与 kind 相同
+        name_column: 模型名称列，列不存在或为None时不读取名称
+    
+    Returns:
+        BatchDiagnostics: 检验结果，顺序与输入行一致
+    
+    Raises:
+        ImportError: 如果未安装pyarrow
+        ValueError: 如果模型类型未知或系数列不存在
+        TypeError: 如果系数列不是列表类型
+    """
+    _require_arrow()
+    name, _ = _KINDS[_validate_kind(kind)]
+    column = kind if column is None else column
+    
+    model_names = None
+    if isinstance(data, (pa.Table, pa.RecordBatch)):
+        if column not in data.schema.names:
+            raise ValueError(f"缺少系数列: {column}")
+        if name_column is not None and name_column in data.schema.names:
+            model_names = np.asarray(data.column(name_column).to_pylist(), dtype=object)
+        data = data.column(column)
+    
+    groups, errors = list_column_groups(data, name)
+    
+    if not errors and len(groups) == 1:
+        (_, matrix), = groups.values()
+        return BatchDiagnostics.from_matrix(matrix, kind, model_names=model_names)
+    
+    # 与 BatchDiagnostics.from_models 相同，逐组批量检验后按原始顺序合并
+    parts = [BatchDiagnostics.from_matrix(matrix, kind, indices=rows) for rows, matrix in groups.values()]
+    if errors:
+        parts.append(BatchDiagnostics._from_errors(kind, errors))
+    
+    combined = BatchDiagnostics.concatenate(parts, kind)
+    combined = combined.take(np.argsort(combined.indices, kind='stable'))
+    combined.model_names = model_names
+    return combined
+
+
+def to_arrow(diagnostics: BatchDiagnostics):
+    """
+    将批量检验结果转换为Arrow表
+    
+    列包括 model_index、model_name、判定结果（is_stationary/is_invertible）、
+    边际（stability_margin/invertibility_margin）、字典编码的 risk_level、
+    系数 coefficients、特征根的实部 roots_real 和虚部 roots_imag，以及 error。
+    数值列和偏移量尽量直接引用NumPy缓冲区而不复制。
+    
+    Args:
+        diagnostics: 批量检验结果
+    
+    Returns:
+        pa.Table: 每个模型一行
+    
+    Raises:
+        ImportError: 如果未安装pyarrow
+    """
+    _require_arrow()
+    flag_key, margin_key = (
+        ('is_stationary', 'stability_margin') if diagnostics.kind == 'ar'
+        else ('is_invertible', 'invertibility_margin')
+    )
+    
+    risk_level = pa.DictionaryArray.from_arrays(
+        pa.array(np.where(diagnostics.has_error, 0, diagnostics.risk_codes).astype(np.int8),
+                 mask=diagnostics.has_error),
+        pa.array(BatchDiagnostics.RISK_LEVELS)
+    )
+    
+    def ragged(values: np.ndarray, offsets: np.ndarray):
+        return pa.LargeListArray.from_arrays(pa.array(offsets), pa.array(np.ascontiguousarray(values)))
+    
+    return pa.table({
+        'model_index': pa.array(diagnostics.indices),
+        'model_name': pa.array(diagnostics._names().tolist(), type=pa.string()),
+        flag_key: pa.array(diagnostics.flags),
+        margin_key: pa.array(diagnostics.margins),
+        'risk_level': risk_level,
+        'coefficients': ragged(diagnostics.coefficients, diagnostics.coefficient_offsets),
+        'roots_real': ragged(diagnostics.roots.real, diagnostics.root_offsets),
+        'roots_imag': ragged(diagnostics.roots.imag, diagnostics.root_offsets),
+        'error': pa.array(diagnostics.errors.tolist(), type=pa.string()),
+    })
+
+
+def read_parquet(
+    path: str,
+    kind: str = 'ar',
+    column: Optional[str] = None,
+    name_column: Optional[str] = _NAME_COLUMN
+) -> BatchDiagnostics:
+    """
+    读取Parquet文件中的系数列表列并做批量检验
+    
+    只读取系数列和名称列，参数含义与 from_arrow 相同。
+    
+    Returns:
+        BatchDiagnostics: 检验结果
+    
+    Raises:
+        ImportError: 如果未安装pyarrow
+    """
+    _require_arrow()
+    _validate_kind(kind)
+    column = kind if column is None else column
+    
+    schema_names = pq.read_schema(path).names
+    columns = [column]
+    if name_column is not None and name_column in schema_names:
+        columns.append(name_column)
+    
+    return from_arrow(pq.read_table(path, columns=columns), kind, column, name_column)
+
+
+def write_parquet(diagnostics: BatchDiagnostics, path: str, **kwargs) -> None:
+    """
+    将批量检验结果写入Parquet文件
+    
+    Args:
+        diagnostics: 批量检验结果
+        path: 输出文件路径
+        **kwargs: 传给 pyarrow.parquet.write_table 的参数，如 compression
+    
+    Raises:
+        ImportError: 如果未安装pyarrow
+    """
+    _require_arrow()
+    pq.write_table(to_arrow(diagnostics), path, **kwargs)
+
+
+def iter_parquet_models(path: str, batch_size: int = 1024) -> Iterator[Tuple[Optional[str], Dict[str, List[float]]]]:
+    """
+    按记录批次逐行读取Parquet文件中的模型
+    
+    只读取 ar、ma 和 name 列中存在的列，内存占用与批次大小有关，与文件大小无关。
+    
+    Args:
+        path: Parquet文件路径
+        batch_size: 每个记录批次的行数
+    
+    Returns:
+        Iterator: (模型名称或None, 模型字典)
+    
+    Raises:
+        ImportError: 如果未安装pyarrow
+        ValueError: 如果文件中没有ar和ma列
+    """
+    _require_arrow()
+    parquet_file = pq.ParquetFile(path)
+    available = parquet_file.schema_arrow.names
+    coefficient_columns = [key for key in _KINDS if key in available]
+    if not coefficient_columns:
+        raise ValueError(f"Parquet文件中缺少系数列，需要包含 {' 或 '.join(_KINDS)} 列")
+    
+    columns = coefficient_columns + ([_NAME_COLUMN] if _NAME_COLUMN in available else [])
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        values = {key: batch.column(key).to_pylist() for key in columns}
+        for row in range(batch.num_rows):
+            model = {key: values[key][row] for key in coefficient_columns if values[key][row] is not None}
+            name = values[_NAME_COLUMN][row] if _NAME_COLUMN in values else None
+            yield (None if name is None else str(name)), model
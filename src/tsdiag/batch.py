@@ -0,0 +1,437 @@
+"""
+批量检验结果的列式容器
+
+以NumPy数组按列保存大批量模型的检验结果，避免为每个模型
+创建 StationarityResult/InvertibilityResult 和 RootInfo 对象。
+"""
+
+import numpy as np
+from typing import List, Union, Dict, Any, Optional, Sequence
+from .core import (
+    stationarity_check_batch,
+    invertibility_check_batch,
+    StationarityResult,
+    InvertibilityResult,
+    _build_stationarity_result,
+    _build_invertibility_result,
+    _build_characteristic_polynomial,
+    _finite_roots,
+    _validate_batch,
+    _validate_coefficient_matrix,
+    _group_indices_by_order,
+    _risk_codes,
+    _RISK_LEVELS,
+)
+
+
+_KINDS = {
+    'ar': ('AR', stationarity_check_batch),
+    'ma': ('MA', invertibility_check_batch),
+}
+
+_SORT_KEYS = ('margin', 'risk', 'index')
+
+
+def _validate_kind(kind: str) -> str:
+    """验证模型类型"""
+    if kind not in _KINDS:
+        raise ValueError(f"未知的模型类型: {kind}，可选值为 {', '.join(_KINDS)}")
+    return kind
+
+
+def _offsets_from_lengths(lengths: np.ndarray) -> np.ndarray:
+    """由每行长度计算偏移数组，长度为 N+1"""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _take_ragged(values: np.ndarray, offsets: np.ndarray, rows: np.ndarray):
+    """按行号从扁平数组中取出若干行，返回 (新扁平数组, 新偏移数组)"""
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    new_offsets = _offsets_from_lengths(lengths)
+    gather = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return values[gather], new_offsets
+
+
+class BatchDiagnostics:
+    """
+    批量检验结果的列式（struct-of-arrays）容器
+    
+    每个字段都是长度为N的NumPy数组，特征根和系数以扁平数组加偏移量的
+    方式存储。过滤、排序和切片都是向量化操作，只有按下标取单行时才会
+    构建 StationarityResult 或 InvertibilityResult 对象。
+    
+    Attributes:
+        kind: 模型类型，'ar' 或 'ma'
+        indices: (N,) 模型在原始输入中的下标
+        flags: (N,) 是否平稳（AR）或可逆（MA）
+        margins: (N,) 最小根模长与1的差值，出错的模型为NaN
+        risk_codes: (N,) 风险等级在 RISK_LEVELS 中的下标，出错的模型为-1
+        roots: 所有模型的特征根拼接成的扁平复数数组
+        root_offsets: (N+1,) 第i个模型的根为 roots[root_offsets[i]:root_offsets[i+1]]
+        coefficients: 所有模型的系数拼接成的扁平数组
+        coefficient_offsets: (N+1,) 系数的偏移数组
+        errors: (N,) 错误信息，没有错误时为None
+        model_names: (N,) 模型名称，未提供时为None并按 "Model_{下标+1}" 生成
+        escalated: (N,) 求根时是否经过扩展精度修正
+    """
+    
+    RISK_LEVELS = _RISK_LEVELS
+    
+    def __init__(
+        self,
+        kind: str,
+        indices: np.ndarray,
+        flags: np.ndarray,
+        margins: np.ndarray,
+        risk_codes: np.ndarray,
+        roots: np.ndarray,
+        root_offsets: np.ndarray,
+        coefficients: np.ndarray,
+        coefficient_offsets: np.ndarray,
+        errors: np.ndarray,
+        model_names: Optional[np.ndarray] = None,
+        escalated: Optional[np.ndarray] = None
+    ):
+        self.kind = _validate_kind(kind)
+        self.indices = indices
+        self.flags = flags
+        self.margins = margins
+        self.risk_codes = risk_codes
+        self.roots = roots
+        self.root_offsets = root_offsets
+        self.coefficients = coefficients
+        self.coefficient_offsets = coefficient_offsets
+        self.errors = errors
+        self.model_names = model_names
+        self.escalated = np.zeros(len(flags), dtype=bool) if escalated is None else escalated
+    
+    @classmethod
+    def from_matrix(
+        cls,
+        coefficients: Union[List[List[float]], np.ndarray],
+        kind: str = 'ar',
+        model_names: Optional[Sequence[str]] = None,
+        orders: Optional[np.ndarray] = None,
+        indices: Optional[np.ndarray] = None
+    ) -> 'BatchDiagnostics':
+        """
+        由同阶系数矩阵构建批量检验结果
+        
+        Args:
+            coefficients: 形状为 (N, p) 的系数矩阵
+            kind: 模型类型，'ar' 或 'ma'
+            model_names: 模型名称（可选）
+            orders: (N,) 每个模型的真实阶数，系数矩阵在高次项补零时使用
+            indices: (N,) 模型在原始输入中的下标，默认为 0..N-1
+        
+        Returns:
+            BatchDiagnostics: 检验结果
+        """
+        name, batch_check = _KINDS[_validate_kind(kind)]
+        matrix = _validate_coefficient_matrix(coefficients, name)
+        n_models, order = matrix.shape
+        
+        batch = batch_check(matrix)
+        
+        # 按模长排序后只保留真实阶数个有限根，去掉补零和零最高次项带来的无穷远根
+        roots = np.take_along_axis(batch.roots, np.argsort(np.abs(batch.roots), axis=1, kind='stable'), axis=1)
+        if orders is None:
+            orders = np.full(n_models, order, dtype=np.int64)
+        keep = np.isfinite(roots) & (np.arange(order) < np.asarray(orders)[:, np.newaxis])
+        
+        coefficient_mask = np.arange(order) < np.asarray(orders)[:, np.newaxis]
+        margins = batch.min_moduli - 1.0
+        
+        return cls(
+            kind=kind,
+            indices=np.arange(n_models, dtype=np.int64) if indices is None else np.asarray(indices, dtype=np.int64),
+            flags=batch.flags,
+            margins=margins,
+            risk_codes=_risk_codes(margins),
+            roots=roots[keep],
+            root_offsets=_offsets_from_lengths(keep.sum(axis=1)),
+            coefficients=matrix[coefficient_mask],
+            coefficient_offsets=_offsets_from_lengths(coefficient_mask.sum(axis=1)),
+            errors=np.full(n_models, None, dtype=object),
+            model_names=None if model_names is None else np.asarray(model_names, dtype=object),
+            escalated=batch.escalated
+        )
+    
+    @classmethod
+    def from_models(
+        cls,
+        models: List[Union[List[float], np.ndarray]],
+        kind: str = 'ar',
+        model_names: Optional[Sequence[str]] = None,
+        bucket_width: int = 1
+    ) -> 'BatchDiagnostics':
+        """
+        由阶数可能不同的模型列表构建批量检验结果
+        
+        模型按阶数分桶后逐桶批量检验，再按原始顺序合并；无效模型记录错误信息。
+        
+        Args:
+            models: 模型系数列表
+            kind: 模型类型，'ar' 或 'ma'
+            model_names: 模型名称列表（可选）
+            bucket_width: 分桶宽度，1 表示严格按阶数分组
+        
+        Returns:
+            BatchDiagnostics: 检验结果
+        """
+        name, _ = _KINDS[_validate_kind(kind)]
+        
+        if model_names is not None and len(model_names) != len(models):
+            raise ValueError("模型名称数量必须与模型数量相同")
+        
+        valid, errors = _validate_batch(models, name)
+        parts = []
+        
+        for bucket_order, bucket in _group_indices_by_order(valid, bucket_width).items():
+            matrix = np.zeros((len(bucket), bucket_order), dtype=float)
+            orders = np.empty(len(bucket), dtype=np.int64)
+            for row, index in enumerate(bucket):
+                orders[row] = len(valid[index])
+                matrix[row, :orders[row]] = valid[index]
+            parts.append(cls.from_matrix(matrix, kind, orders=orders, indices=np.asarray(bucket)))
+        
+        if errors:
+            parts.append(cls._from_errors(kind, errors))
+        
+        combined = cls.concatenate(parts, kind)
+        combined = combined.take(np.argsort(combined.indices, kind='stable'))
+        
+        if model_names is not None:
+            combined.model_names = np.asarray(model_names, dtype=object)
+        
+        return combined
+    
+    @classmethod
+    def _from_errors(cls, kind: str, errors: Dict[int, str]) -> 'BatchDiagnostics':
+        """构建只包含出错模型的结果"""
+        n_models = len(errors)
+        return cls(
+            kind=kind,
+            indices=np.fromiter(errors.keys(), dtype=np.int64, count=n_models),
+            flags=np.zeros(n_models, dtype=bool),
+            margins=np.full(n_models, np.nan),
+            risk_codes=np.full(n_models, -1, dtype=np.int8),
+            roots=np.empty(0, dtype=complex),
+            root_offsets=np.zeros(n_models + 1, dtype=np.int64),
+            coefficients=np.empty(0, dtype=float),
+            coefficient_offsets=np.zeros(n_models + 1, dtype=np.int64),
+            errors=np.array(list(errors.values()), dtype=object)
+        )
+    
+    @classmethod
+    def concatenate(cls, parts: Sequence['BatchDiagnostics'], kind: str = 'ar') -> 'BatchDiagnostics':
+        """
+        按顺序拼接多个批量检验结果
+        
+        Args:
+            parts: 待拼接的结果，类型必须相同
+            kind: parts 为空时使用的模型类型
+        
+        Returns:
+            BatchDiagnostics: 拼接后的结果
+        """
+        if not parts:
+            return cls._from_errors(kind, {})
+        
+        kinds = {part.kind for part in parts}
+        if len(kinds) != 1:
+            raise ValueError("只能拼接相同模型类型的批量结果")
+        
+        def _join_offsets(attr: str) -> np.ndarray:
+            lengths = np.concatenate([np.diff(getattr(part, attr)) for part in parts])
+            return _offsets_from_lengths(lengths)
+        
+        if all(part.model_names is None for part in parts):
+            model_names = None
+        else:
+            model_names = np.concatenate([part._names() for part in parts])
+        
+        return cls(
+            kind=kinds.pop(),
+            indices=np.concatenate([part.indices for part in parts]),
+            flags=np.concatenate([part.flags for part in parts]),
+            margins=np.concatenate([part.margins for part in parts]),
+            risk_codes=np.concatenate([part.risk_codes for part in parts]),
+            roots=np.concatenate([part.roots for part in parts]),
+            root_offsets=_join_offsets('root_offsets'),
+            coefficients=np.concatenate([part.coefficients for part in parts]),
+            coefficient_offsets=_join_offsets('coefficient_offsets'),
+            errors=np.concatenate([part.errors for part in parts]),
+            model_names=model_names,
+            escalated=np.concatenate([part.escalated for part in parts])
+        )
+    
+    def __len__(self) -> int:
+        return len(self.flags)
+    
+    def __repr__(self) -> str:
+        return (f"BatchDiagnostics(kind={self.kind!r}, models={len(self)}, "
+                f"passed={int(self.flags.sum())}, errors={int(self.has_error.sum())})")
+    
+    def __getitem__(self, key):
+        """整数下标返回单个检验结果对象，切片、布尔掩码或下标数组返回新的容器"""
+        if isinstance(key, (int, np.integer)):
+            return self.result(int(key))
+        
+        rows = np.arange(len(self))[key]
+        return self.take(rows)
+    
+    @property
+    def has_error(self) -> np.ndarray:
+        """(N,) 模型是否出错"""
+        return self.risk_codes < 0
+    
+    @property
+    def risk_levels(self) -> np.ndarray:
+        """(N,) 风险等级字符串，出错的模型为None"""
+        levels = np.array(self.RISK_LEVELS + (None,), dtype=object)
+        return levels[self.risk_codes]
+    
+    @property
+    def num_roots(self) -> np.ndarray:
+        """(N,) 每个模型的根个数"""
+        return np.diff(self.root_offsets)
+    
+    def _names(self) -> np.ndarray:
+        """返回模型名称数组，未提供时按原始下标生成"""
+        if self.model_names is not None:
+            return self.model_names
+        return np.array([f"Model_{i+1}" for i in self.indices], dtype=object)
+    
+    def take(self, rows: Union[Sequence[int], np.ndarray]) -> 'BatchDiagnostics':
+        """
+        按行号取出若干模型的结果
+        
+        Args:
+            rows: 行号数组
+        
+        Returns:
+            BatchDiagnostics: 新的容器
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        roots, root_offsets = _take_ragged(self.roots, self.root_offsets, rows)
+        coefficients, coefficient_offsets = _take_ragged(self.coefficients, self.coefficient_offsets, rows)
+        
+        return BatchDiagnostics(
+            kind=self.kind,
+            indices=self.indices[rows],
+            flags=self.flags[rows],
+            margins=self.margins[rows],
+            risk_codes=self.risk_codes[rows],
+            roots=roots,
+            root_offsets=root_offsets,
+            coefficients=coefficients,
+            coefficient_offsets=coefficient_offsets,
+            errors=self.errors[rows],
+            model_names=None if self.model_names is None else self.model_names[rows],
+            escalated=self.escalated[rows]
+        )
+    
+    def filter(self, mask: np.ndarray) -> 'BatchDiagnostics':
+        """
+        按布尔掩码过滤结果
+        
+        Examples:
+            >>> risky = diagnostics.filter(diagnostics.margins < 0.1)
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self.flags.shape:
+            raise ValueError("过滤掩码的长度必须与模型数量相同")
+        return self.take(np.flatnonzero(mask))
+    
+    def sort(self, by: str = 'margin', descending: bool = False) -> 'BatchDiagnostics':
+        """
+        按指定字段排序，出错的模型总是排在最后
+        
+        Args:
+            by: 排序字段，'margin'（边际）、'risk'（风险等级）或 'index'（原始下标）
+            descending: 是否降序
+        
+        Returns:
+            BatchDiagnostics: 排序后的新容器
+        """
+        if by == 'margin':
+            keys = self.margins.astype(float)
+        elif by == 'risk':
+            keys = self.risk_codes.astype(float)
+        elif by == 'index':
+            keys = self.indices.astype(float)
+        else:
+            raise ValueError(f"未知的排序字段: {by}，可选值为 {', '.join(_SORT_KEYS)}")
+        
+        if descending:
+            keys = -keys
+        keys = np.where(self.has_error, np.inf, keys)
+        
+        return self.take(np.argsort(keys, kind='stable'))
+    
+    def result(self, row: int) -> Optional[Union[StationarityResult, InvertibilityResult]]:
+        """
+        构建单个模型的检验结果对象
+        
+        Args:
+            row: 行号，支持负数下标
+        
+        Returns:
+            StationarityResult 或 InvertibilityResult，出错的模型返回None
+        """
+        row = range(len(self))[row]
+        if self.errors[row] is not None:
+            return None
+        
+        coeffs = self.coefficients[self.coefficient_offsets[row]:self.coefficient_offsets[row + 1]].tolist()
+        roots = _finite_roots(self.roots[self.root_offsets[row]:self.root_offsets[row + 1]])
+        
+        escalated = bool(self.escalated[row])
+        if self.kind == 'ar':
+            return _build_stationarity_result(
+                coeffs, _build_characteristic_polynomial([-c for c in coeffs]), roots, escalated
+            )
+        return _build_invertibility_result(coeffs, _build_characteristic_polynomial(coeffs), roots, escalated)
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        转换为与 batch_stationarity_check / batch_invertibility_check 相同格式的字典列表
+        
+        会为每个模型构建结果对象，只适合在过滤或切片之后的小批量上使用。
+        """
+        flag_key, margin_key = (
+            ('is_stationary', 'stability_margin') if self.kind == 'ar'
+            else ('is_invertible', 'invertibility_margin')
+        )
+        names = self._names()
+        records = []
+        
+        for row in range(len(self)):
+            if self.errors[row] is not None:
+                records.append({
+                    'model_name': names[row],
+                    'model_index': int(self.indices[row]),
+                    'coefficients': None,
+                    flag_key: False,
+                    'error': self.errors[row],
+                    'result': None
+                })
+                continue
+            
+            result = self.result(row)
+            records.append({
+                'model_name': names[row],
+                'model_index': int(self.indices[row]),
+                'coefficients': getattr(result, f"{self.kind}_coefficients"),
+                flag_key: bool(self.flags[row]),
+                'num_roots': len(result.roots),
+                margin_key: float(self.margins[row]),
+                'risk_level': self.RISK_LEVELS[self.risk_codes[row]],
+                'result': result
+            })
+        
+        return records
@@ -0,0 +1,473 @@
+"""
+检验结果缓存模块
+
+在进程内以LRU策略缓存特征多项式的根，重复检验相同系数时无需重新求根。
+可选的SQLite磁盘缓存可以在进程重启和多个工作进程之间共享结果。
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import List, Union, Dict, Any, Optional, Tuple, Callable
+
+
+# 每个缓存条目除根数组和键之外的估计开销（字节）
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+def _canonical_key(
+    poly_tail: Union[List[float], np.ndarray],
+    tolerance: Optional[float] = None
+) -> Tuple:
+    """
+    构建特征多项式 1 + c₁z + ... + cₚzᵖ 的规范化缓存键
+    
+    键由 [c₁, ..., cₚ] 构成，AR系数取反后与MA系数使用同一个键空间，
+    因此系数互为相反数的AR和MA模型共用一个缓存条目。最高次项的零系数
+    不影响有限根，会被去掉。给定 tolerance 时系数先量化到其整数倍，
+    键以 ('q', tolerance) 开头，避免与不同步长或未量化的键混淆。
+    """
+    coeffs = np.asarray(poly_tail, dtype=float)
+    
+    if tolerance:
+        coeffs = np.round(coeffs / tolerance).astype(np.int64)
+    else:
+        coeffs = coeffs + 0.0  # 统一 -0.0 与 0.0
+    
+    nonzero = np.flatnonzero(coeffs)
+    length = nonzero[-1] + 1 if nonzero.size else 0
+    key = tuple(coeffs[:length].tolist())
+    
+    return ('q', tolerance) + key if tolerance else key
+
+
+class DiagnosticsCache:
+    """
+    特征根的LRU缓存
+    
+    缓存以规范化的特征多项式系数为键，保存只读的根数组。可以按条目数、
+    按估计占用的字节数或同时按两者限制容量，超出时淘汰最久未使用的条目。
+    所有操作都是线程安全的。
+    
+    指定 store 时作为二级缓存：内存未命中时先查询磁盘，新计算的结果
+    同时写入内存和磁盘。
+    
+    Attributes:
+        max_entries: 最大条目数，None表示不限制
+        max_bytes: 最大估计字节数，None表示不限制
+        tolerance: 系数量化步长，None表示按精确值匹配
+        store: 磁盘缓存（可选）
+        hits: 命中次数
+        misses: 未命中次数
+        store_hits: 内存未命中但磁盘命中的次数
+        evictions: 淘汰次数
+    """
+    
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        tolerance: Optional[float] = None,
+        store: Optional['DiskDiagnosticsCache'] = None
+    ):
+        if max_entries is None and max_bytes is None:
+            raise ValueError("必须至少指定条目数或字节数上限之一")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("缓存条目数上限必须是正整数")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("缓存字节数上限必须是正整数")
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError("量化步长必须大于0")
+        
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.tolerance = tolerance
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.evictions = 0
+        
+        self._entries: "OrderedDict[Tuple, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def make_key(self, poly_tail: Union[List[float], np.ndarray]) -> Tuple:
+        """构建特征多项式系数 [c₁, ..., cₚ] 的缓存键"""
+        return _canonical_key(poly_tail, self.tolerance)
+    
+    def get(self, key: Tuple) -> Optional[np.ndarray]:
+        """查找缓存的根数组，未命中时返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Tuple, roots: np.ndarray) -> np.ndarray:
+        """
+        保存根数组并按容量上限淘汰旧条目
+        
+        Returns:
+            np.ndarray: 缓存中保存的只读根数组
+        """
+        roots = np.array(roots, dtype=complex)
+        roots.flags.writeable = False
+        size = roots.nbytes + 8 * len(key) + _ENTRY_OVERHEAD_BYTES
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            
+            self._entries[key] = (roots, size)
+            self._bytes += size
+            self._evict()
+        
+        return roots
+    
+    def get_or_compute(
+        self,
+        poly_tail: Union[List[float], np.ndarray],
+        compute: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """
+        返回缓存的根，未命中时调用 compute 计算并写入缓存
+        
+        Args:
+            poly_tail: 特征多项式系数 [c₁, ..., cₚ]
+            compute: 计算根的函数
+        
+        Returns:
+            np.ndarray: 只读的根数组
+        """
+        key = self.make_key(poly_tail)
+        roots = self.get(key)
+        if roots is not None:
+            return roots
+        
+        if self.store is not None:
+            roots = self.store.get(key)
+            if roots is not None:
+                with self._lock:
+                    self.store_hits += 1
+                return self.put(key, roots)
+        
+        roots = self.put(key, compute())
+        if self.store is not None:
+            self.store.put(key, roots)
+        return roots
+    
+    def warm_up(self, count: int) -> int:
+        """
+        从磁盘缓存预加载命中次数最多的条目
+        
+        Args:
+            count: 预加载的最大条目数
+        
+        Returns:
+            int: 实际加载的条目数
+        """
+        if self.store is None:
+            return 0
+        
+        loaded = 0
+        # 先加载最热的条目会使其最先被淘汰，因此按热度从低到高写入
+        for key, roots in reversed(self.store.hottest(count)):
+            self.put(key, roots)
+            loaded += 1
+        return loaded
+    
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目直到满足容量上限，调用方需持有锁"""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """清空缓存并重置统计"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.store_hits = 0
+            self.evictions = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+        
+        Returns:
+            Dict: 包含 hits、misses、store_hits、evictions、hit_rate、entries 和 bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'store_hits': self.store_hits,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+
+class DiskDiagnosticsCache:
+    """
+    基于SQLite的持久化特征根缓存
+    
+    使用WAL模式，多个工作进程可以同时读写同一个缓存文件。键的SHA-1
+    散列作为主键建立索引，根以 complex128 的原始字节保存。支持按存活
+    时间（TTL）和条目数淘汰，淘汰时优先删除最久未访问的条目。
+    
+    命中时不立即写库：访问时间和命中次数先在内存中累积，在写入、淘汰、
+    查询最热条目、关闭时，或距上次写回超过 HIT_FLUSH_INTERVAL 秒时批量写回，
+    读多写少时多个进程的读取不会因逐次提交而串行化。
+    
+    Attributes:
+        path: 缓存文件路径
+        ttl: 条目存活时间（秒），None表示不过期
+        max_entries: 最大条目数，None表示不限制
+    """
+    
+    # 每写入多少个条目执行一次淘汰
+    EVICT_INTERVAL = 100
+    
+    # 只有读取时，累积的命中信息最多间隔多少秒写回一次
+    HIT_FLUSH_INTERVAL = 5.0
+    
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        if ttl is not None and ttl <= 0:
+            raise ValueError("缓存存活时间必须大于0")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("缓存条目数上限必须是正整数")
+        
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+        # {键的散列: (最近访问时间, 命中次数)}，尚未写回数据库
+        self._pending_hits: Dict[str, Tuple[float, int]] = {}
+        self._last_flush = time.monotonic()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS roots ("
+            " key_hash TEXT PRIMARY KEY,"
+            " key TEXT NOT NULL,"
+            " roots BLOB NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS roots_accessed ON roots (accessed)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS roots_hits ON roots (hits)")
+        self._connection.commit()
+        self.evict()
+    
+    @staticmethod
+    def _encode_key(key: Tuple) -> Tuple[str, str]:
+        """返回 (键的散列, 键的JSON文本)"""
+        text = json.dumps(list(key), separators=(',', ':'))
+        return hashlib.sha1(text.encode('utf-8')).hexdigest(), text
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM roots").fetchone()[0]
+    
+    def get(self, key: Tuple) -> Optional[np.ndarray]:
+        """查找缓存的根数组，未命中或已过期时返回None"""
+        key_hash, text = self._encode_key(key)
+        now = time.time()
+        
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT key, roots, created FROM roots WHERE key_hash = ?", (key_hash,)
+            ).fetchone()
+            if row is None or row[0] != text:
+                return None
+            if self.ttl is not None and now - row[2] > self.ttl:
+                return None
+            
+            _, hits = self._pending_hits.get(key_hash, (now, 0))
+            self._pending_hits[key_hash] = (now, hits + 1)
+            if time.monotonic() - self._last_flush >= self.HIT_FLUSH_INTERVAL:
+                self._flush_hits()
+                self._connection.commit()
+        
+        return np.frombuffer(row[1], dtype=complex)
+    
+    def _flush_hits(self) -> None:
+        """把累积的命中信息写入当前事务，调用方需持有锁并负责提交"""
+        self._last_flush = time.monotonic()
+        if not self._pending_hits:
+            return
+        
+        self._connection.executemany(
+            "UPDATE roots SET accessed = MAX(accessed, ?), hits = hits + ? WHERE key_hash = ?",
+            [(accessed, hits, key_hash) for key_hash, (accessed, hits) in self._pending_hits.items()]
+        )
+        self._pending_hits.clear()
+    
+    def put(self, key: Tuple, roots: np.ndarray) -> None:
+        """写入根数组"""
+        key_hash, text = self._encode_key(key)
+        now = time.time()
+        blob = np.ascontiguousarray(roots, dtype=complex).tobytes()
+        
+        with self._lock:
+            self._flush_hits()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO roots (key_hash, key, roots, created, accessed, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key_hash, text, blob, now, now)
+            )
+            self._connection.commit()
+            self._puts_since_evict += 1
+            should_evict = self._puts_since_evict >= self.EVICT_INTERVAL
+        
+        if should_evict:
+            self.evict()
+    
+    def evict(self) -> int:
+        """
+        删除过期条目，并在超出条目数上限时删除最久未访问的条目
+        
+        Returns:
+            int: 删除的条目数
+        """
+        removed = 0
+        with self._lock:
+            self._flush_hits()
+            self._puts_since_evict = 0
+            if self.ttl is not None:
+                cursor = self._connection.execute(
+                    "DELETE FROM roots WHERE created < ?", (time.time() - self.ttl,)
+                )
+                removed += cursor.rowcount
+            if self.max_entries is not None:
+                cursor = self._connection.execute(
+                    "DELETE FROM roots WHERE key_hash IN ("
+                    " SELECT key_hash FROM roots ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                removed += cursor.rowcount
+            self._connection.commit()
+        return removed
+    
+    def hottest(self, count: int) -> List[Tuple[Tuple, np.ndarray]]:
+        """
+        按命中次数从高到低返回未过期的条目
+        
+        Args:
+            count: 返回的最大条目数
+        
+        Returns:
+            List: [(键, 根数组), ...]
+        """
+        oldest = time.time() - self.ttl if self.ttl is not None else float('-inf')
+        with self._lock:
+            self._flush_hits()
+            self._connection.commit()
+            rows = self._connection.execute(
+                "SELECT key, roots FROM roots WHERE created >= ? "
+                "ORDER BY hits DESC, accessed DESC LIMIT ?",
+                (oldest, count)
+            ).fetchall()
+        
+        return [(tuple(json.loads(text)), np.frombuffer(blob, dtype=complex)) for text, blob in rows]
+    
+    def clear(self) -> None:
+        """删除所有条目"""
+        with self._lock:
+            self._pending_hits.clear()
+            self._connection.execute("DELETE FROM roots")
+            self._connection.commit()
+    
+    def close(self) -> None:
+        """写回累积的命中信息并关闭数据库连接"""
+        with self._lock:
+            self._flush_hits()
+            self._connection.commit()
+            self._connection.close()
+
+
+_cache: Optional[DiagnosticsCache] = None
+
+
+def enable_cache(
+    max_entries: Optional[int] = 1024,
+    max_bytes: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    path: Optional[str] = None,
+    ttl: Optional[float] = None,
+    max_disk_entries: Optional[int] = None,
+    warm_up: int = 0
+) -> DiagnosticsCache:
+    """
+    启用进程内缓存
+    
+    启用后 stationarity_check、invertibility_check 以及基于它们的
+    analyze_model_stability 都会先查询缓存。
+    
+    Args:
+        max_entries: 最大条目数，None表示不限制
+        max_bytes: 最大估计字节数，None表示不限制
+        tolerance: 系数量化步长，None表示按精确值匹配
+        path: SQLite磁盘缓存文件路径（可选），指定后作为二级缓存
+        ttl: 磁盘缓存条目的存活时间（秒）
+        max_disk_entries: 磁盘缓存的最大条目数
+        warm_up: 启用时从磁盘缓存预加载的最热条目数
+    
+    Returns:
+        DiagnosticsCache: 新启用的缓存
+    """
+    global _cache
+    disable_cache()
+    
+    store = None
+    if path is not None:
+        store = DiskDiagnosticsCache(path, ttl=ttl, max_entries=max_disk_entries)
+    
+    _cache = DiagnosticsCache(max_entries=max_entries, max_bytes=max_bytes, tolerance=tolerance, store=store)
+    if warm_up > 0:
+        _cache.warm_up(warm_up)
+    return _cache
+
+
+def disable_cache() -> None:
+    """停用进程内缓存，并关闭磁盘缓存连接"""
+    global _cache
+    if _cache is not None and _cache.store is not None:
+        _cache.store.close()
+    _cache = None
+
+
+def get_cache() -> Optional[DiagnosticsCache]:
+    """获取当前启用的缓存，未启用时返回None"""
+    return _cache
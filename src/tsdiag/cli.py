@@ -6,9 +6,9 @@
 
 import click
 import sys
-from typing import List
-from .stationarity import check_ar_stationarity, analyze_ar_stability_margin, suggest_ar_modifications
-from .invertibility import check_ma_invertibility, analyze_ma_invertibility_margin, suggest_ma_modifications
+import time
+from typing import Dict, Any, Iterator, Tuple
+from .formats import INPUT_FORMATS, OUTPUT_FORMATS, ResultWriter, check_npy, detect_format, exit_code, read_models
 
 
 @click.group()
@@ -54,6 +54,13 @@ def stationarity(coefficients: str, verbose: bool, analysis: bool, suggest: bool
         tsdiag stationarity -c "0.5,-0.3"
         tsdiag stationarity -c "0.8,0.15" --analysis --suggest
     """
+    # 分析模块依赖NumPy，在执行命令时才导入，--help 等不需要计算的命令启动更快
+    from .stationarity import (
+        check_ar_stationarity,
+        _margin_from_result as _ar_margin_from_result,
+        _suggestions_from_result as _ar_suggestions_from_result,
+    )
+    
     try:
         # 执行平稳性检验
         result = check_ar_stationarity(coefficients, verbose=verbose)
@@ -64,7 +71,7 @@ def stationarity(coefficients: str, verbose: bool, analysis: bool, suggest: bool
             click.echo("稳定性边际分析")
             click.echo("=" * 50)
             
-            stability_analysis = analyze_ar_stability_margin(result.ar_coefficients)
+            stability_analysis = _ar_margin_from_result(result)
             
             click.echo(f"稳定性边际: {stability_analysis['stability_margin']:.6f}")
             click.echo(f"风险等级: {stability_analysis['risk_level']}")
@@ -78,7 +85,7 @@ def stationarity(coefficients: str, verbose: bool, analysis: bool, suggest: bool
             click.echo("修改建议")
             click.echo("=" * 50)
             
-            suggestions = suggest_ar_modifications(result.ar_coefficients)
+            suggestions = _ar_suggestions_from_result(result)
             
             for suggestion in suggestions['suggestions']:
                 click.echo(f"• {suggestion}")
@@ -126,6 +133,12 @@ def invertibility(coefficients: str, verbose: bool, analysis: bool, suggest: boo
         tsdiag invertibility -c "0.5,-0.3"
         tsdiag invertibility -c "0.8,0.15" --analysis --suggest
     """
+    from .invertibility import (
+        check_ma_invertibility,
+        _margin_from_result as _ma_margin_from_result,
+        _suggestions_from_result as _ma_suggestions_from_result,
+    )
+    
     try:
         # 执行可逆性检验
         result = check_ma_invertibility(coefficients, verbose=verbose)
@@ -136,7 +149,7 @@ def invertibility(coefficients: str, verbose: bool, analysis: bool, suggest: boo
             click.echo("可逆性边际分析")
             click.echo("=" * 50)
             
-            invertibility_analysis = analyze_ma_invertibility_margin(result.ma_coefficients)
+            invertibility_analysis = _ma_margin_from_result(result)
             
             click.echo(f"可逆性边际: {invertibility_analysis['invertibility_margin']:.6f}")
             click.echo(f"风险等级: {invertibility_analysis['risk_level']}")
@@ -150,7 +163,7 @@ def invertibility(coefficients: str, verbose: bool, analysis: bool, suggest: boo
             click.echo("修改建议")
             click.echo("=" * 50)
             
-            suggestions = suggest_ma_modifications(result.ma_coefficients)
+            suggestions = _ma_suggestions_from_result(result)
             
             for suggestion in suggestions['suggestions']:
                 click.echo(f"• {suggestion}")
@@ -195,6 +208,9 @@ def check(ar_coefficients: str, ma_coefficients: str, verbose: bool):
         click.echo("错误: 必须提供AR系数或MA系数（或两者都提供）", err=True)
         sys.exit(2)
     
+    from .stationarity import check_ar_stationarity
+    from .invertibility import check_ma_invertibility
+    
     all_passed = True
     
     try:
@@ -238,6 +254,298 @@ def check(ar_coefficients: str, ma_coefficients: str, verbose: bool):
         sys.exit(2)
 
 
+@main.command()
+@click.argument('input_path', type=click.Path(dir_okay=False, allow_dash=True), default='-')
+@click.option(
+    '--format', '-f', 'input_format',
+    type=click.Choice(list(INPUT_FORMATS)),
+    default=None,
+    help='输入格式，默认根据扩展名推断，标准输入按jsonl处理'
+)
+@click.option(
+    '--kind', '-k',
+    type=click.Choice(['ar', 'ma']),
+    default='ar',
+    show_default=True,
+    help='只有系数时（无表头CSV、系数数组、npy）的模型类型'
+)
+@click.option(
+    '--output', '-o',
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    default='-',
+    help='结果输出文件，默认为标准输出'
+)
+@click.option(
+    '--output-format',
+    type=click.Choice(list(OUTPUT_FORMATS) + ['npy']),
+    default='jsonl',
+    show_default=True,
+    help='结果输出格式，npy只用于npy输入，按窗口将判定结果写入内存映射的结构化数组；jsonl/csv输出逐行分析'
+)
+@click.option(
+    '--jobs', '-j',
+    type=int,
+    default=1,
+    show_default=True,
+    help='并行数，-1表示使用全部CPU核心'
+)
+@click.option(
+    '--chunk-size',
+    type=int,
+    default=1024,
+    show_default=True,
+    help='每块读取和分析的模型数'
+)
+@click.option(
+    '--bucket-width',
+    type=int,
+    default=1,
+    show_default=True,
+    help='按阶数分桶的宽度'
+)
+@click.option(
+    '--backend',
+    type=click.Choice(['processes', 'threads']),
+    default='processes',
+    show_default=True,
+    help='--jobs大于1时的并行方式'
+)
+@click.option(
+    '--quiet', '-q',
+    is_flag=True,
+    help='不在标准错误输出汇总信息'
+)
+def batch(
+    input_path: str,
+    input_format: str,
+    kind: str,
+    output: str,
+    output_format: str,
+    jobs: int,
+    chunk_size: int,
+    bucket_width: int,
+    backend: str,
+    quiet: bool
+):
+    """
+    批量分析模型
+    
+    从文件或标准输入流式读取模型，按块分析后按输入顺序写出结果，
+    内存占用与模型总数无关。支持的输入格式：
+    
+    \b
+    - jsonl: 每行形如 {"ar": [0.5, -0.3], "ma": [0.4], "name": "m1"}，
+      或只有系数的数组 [0.5, -0.3]（类型由 --kind 指定）
+    - csv: 带 ar/ma/name 表头时按列读取（单元格内系数以空格或分号分隔），
+      否则每行是一个模型的系数（类型由 --kind 指定）
+    - npy: 形状为 (N, p) 的系数矩阵（类型由 --kind 指定），以内存映射方式打开
+    
+    npy输入配合 --output-format npy 时不构造逐模型的结果，而是按 --chunk-size
+    行的窗口做同阶批量检验，将 (flag, min_modulus, error) 写入与输入等长的npy文件，
+    包含NaN或无穷大的行记为错误。只有npy输出走窗口批量检验，npy输入配合jsonl或csv
+    输出时仍逐行转换为模型并逐个分析。
+    
+    退出码：全部通过为0，存在非平稳或不可逆的模型为1，存在错误为2。
+    
+    示例:
+        tsdiag batch models.jsonl --jobs 8
+        tsdiag batch coeffs.npy --kind ma -o results.csv --output-format csv
+        tsdiag batch coeffs.npy -o flags.npy --output-format npy --chunk-size 100000
+        cat models.jsonl | tsdiag batch -j -1 --chunk-size 1000
+    """
+    started = time.perf_counter()
+    
+    try:
+        if output_format == 'npy':
+            counts = _check_npy_matrix(input_path, input_format, kind, output, chunk_size)
+        else:
+            counts = _analyze_records(
+                input_path, input_format, kind, output, output_format,
+                jobs, chunk_size, bucket_width, backend
+            )
+    except Exception as e:
+        click.echo(f"错误: {e}", err=True)
+        sys.exit(2)
+    
+    if not quiet:
+        click.echo(
+            f"总计 {counts['total']} 个模型：通过 {counts['passed']}，未通过 {counts['failed']}，"
+            f"错误 {counts['errors']}，用时 {time.perf_counter() - started:.2f} 秒",
+            err=True
+        )
+    
+    sys.exit(exit_code(counts))
+
+
+def _check_npy_matrix(input_path: str, input_format: str, kind: str, output: str, window: int) -> Dict[str, int]:
+    """npy输入、npy输出：按窗口做同阶批量检验并写入内存映射文件"""
+    if output == '-':
+        raise ValueError("npy输出必须通过 --output 指定文件")
+    if input_path == '-' or (input_format or detect_format(input_path)) != 'npy':
+        raise ValueError("npy输出只支持npy格式的输入文件")
+    
+    return check_npy(input_path, output, kind, window)
+
+
+def _analyze_records(
+    input_path: str,
+    input_format: str,
+    kind: str,
+    output: str,
+    output_format: str,
+    jobs: int,
+    chunk_size: int,
+    bucket_width: int,
+    backend: str
+) -> Dict[str, int]:
+    """逐条读取模型，按块分析后写出每个模型的结果"""
+    from .api import _iter_named_model_analysis
+    
+    records = read_models(input_path, input_format, kind)
+    parse_errors: Dict[int, str] = {}
+    
+    def named_models() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for index, record in enumerate(records):
+            if record.error is not None:
+                parse_errors[index] = record.error
+            yield (record.name if record.name is not None else f"Model_{index + 1}"), record.model
+    
+    results = _iter_named_model_analysis(
+        named_models(),
+        chunk_size=chunk_size,
+        bucket_width=bucket_width,
+        n_jobs=jobs,
+        backend=backend
+    )
+    
+    with click.open_file(output, 'w', encoding='utf-8') as stream, ResultWriter(stream, output_format) as writer:
+        for result in results:
+            error = parse_errors.pop(result['model_index'], None)
+            if error is not None:
+                result = {'model_name': result['model_name'], 'model_index': result['model_index'], 'error': error}
+            writer.write(result)
+    
+    return writer.counts
+
+
+@main.command()
+@click.option(
+    '--kind', '-k',
+    type=click.Choice(['ar', 'ma', 'arma']),
+    default='ar',
+    show_default=True,
+    help='模型类型'
+)
+@click.option(
+    '--max-batch',
+    type=int,
+    default=256,
+    show_default=True,
+    help='每个微批的最大行数'
+)
+def stream(kind: str, max_batch: int):
+    """
+    按行流式检验
+    
+    从标准输入逐行读取模型，每行向标准输出写出一行紧凑的JSON结果并立即刷新，
+    输出行与输入行一一对应。已经到达的多行合并为一个微批做向量化检验，
+    输入暂时没有更多数据时立即处理，不等待凑满批次。
+    
+    \b
+    - ar/ma: 每行形如 "0.5,-0.3"、"0.5 -0.3" 或 "[0.5, -0.3]"
+    - arma: 每行形如 "0.5,-0.3|0.4"（任一侧可以为空）或 {"ar": [...], "ma": [...]}
+    
+    退出码：全部通过为0，存在未通过的模型为1，存在无法解析的行为2。
+    
+    示例:
+        printf '0.5,-0.3\\n1.2\\n' | tsdiag stream --kind ar
+        cut -f2 models.tsv | tsdiag stream --kind arma
+    """
+    import json
+    from .stream import check_lines, iter_line_batches
+    
+    counts = {'total': 0, 'passed': 0, 'failed': 0, 'errors': 0}
+    flag_keys = ('is_stationary', 'is_invertible', 'model_valid')
+    
+    try:
+        batches = iter_line_batches(sys.stdin, max_batch)
+        for lines in batches:
+            for result in check_lines(lines, kind, first_line=counts['total'] + 1):
+                counts['total'] += 1
+                if 'error' in result:
+                    counts['errors'] += 1
+                elif all(result.get(key, True) for key in flag_keys):
+                    counts['passed'] += 1
+                else:
+                    counts['failed'] += 1
+                
+                # click.echo 每次写出后都会刷新
+                click.echo(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+    except BrokenPipeError:
+        # 下游提前关闭（如 head），不再输出
+        sys.stderr.close()
+        sys.exit(0)
+    except ValueError as e:
+        click.echo(f"错误: {e}", err=True)
+        sys.exit(2)
+    
+    sys.exit(exit_code(counts))
+
+
+@main.command()
+@click.option(
+    '--socket', 'socket_path',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Unix域套接字路径，默认为 $TSDIAG_SOCKET、$XDG_RUNTIME_DIR/tsdiag.sock 或临时目录下私有的 tsdiag-<uid>/tsdiag.sock'
+)
+@click.option(
+    '--cache-size',
+    type=int,
+    default=4096,
+    show_default=True,
+    help='常驻进程内检验结果缓存的条目数，0表示不启用'
+)
+@click.option('--status', is_flag=True, help='只检查守护进程是否在运行')
+@click.option('--stop', 'stop_daemon', is_flag=True, help='停止正在运行的守护进程')
+def daemon(socket_path: str, cache_size: int, status: bool, stop_daemon: bool):
+    """
+    以常驻守护进程运行
+    
+    守护进程预先导入NumPy和分析模块并保留缓存。运行期间，stationarity、
+    invertibility 和 check 子命令会自动转发给它执行，省去每次启动解释器和
+    导入模块的开销。设置环境变量 TSDIAG_NO_DAEMON=1 可禁止转发。
+    
+    示例:
+        tsdiag daemon &
+        tsdiag stationarity -c "0.5,-0.3"   # 由守护进程执行
+        tsdiag daemon --stop
+    """
+    from .daemon import DaemonServer, default_socket_path, ping, stop
+    
+    socket_path = socket_path or default_socket_path()
+    
+    if status or stop_daemon:
+        pid = stop(socket_path) if stop_daemon else ping(socket_path)
+        if pid is None:
+            click.echo(f"守护进程未运行: {socket_path}")
+            sys.exit(1)
+        click.echo(f"守护进程{'已停止' if stop_daemon else '正在运行'}: {socket_path} (PID {pid})")
+        sys.exit(0)
+    
+    try:
+        server = DaemonServer(socket_path, cache_size=cache_size)
+    except (OSError, RuntimeError, ValueError) as e:
+        click.echo(f"错误: {e}", err=True)
+        sys.exit(2)
+    
+    click.echo(f"守护进程已启动: {socket_path}", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
 @main.command()
 def examples():
     """
@@ -272,7 +580,22 @@ def examples():
    - 可逆: tsdiag invertibility -c "0.5"
    - 不可逆: tsdiag invertibility -c "1.1"
 
-7. 获取帮助:
+7. 批量分析（JSON Lines/CSV/npy输入，流式分块，可多进程并行）:
+   tsdiag batch models.jsonl --jobs 8
+   tsdiag batch coeffs.npy --kind ma -o results.csv --output-format csv
+   tsdiag batch coeffs.npy -o flags.npy --output-format npy
+   cat models.jsonl | tsdiag batch -j -1 --chunk-size 1000
+
+8. 按行流式检验（每行一个模型，逐行输出JSON）:
+   printf '0.5,-0.3\\n1.2\\n' | tsdiag stream --kind ar
+   printf '0.5|0.4\\n' | tsdiag stream --kind arma
+
+9. 常驻守护进程（后续的检验命令自动转发，毫秒级响应）:
+   tsdiag daemon &
+   tsdiag stationarity -c "0.5,-0.3"
+   tsdiag daemon --stop
+
+10. 获取帮助:
    tsdiag --help
    tsdiag stationarity --help
    tsdiag invertibility --help
@@ -4,37 +4,262 @@
 包含AR模型平稳性检验和MA模型可逆性检验的核心数学计算功能。
 """
 
+import os
+import threading
 import numpy as np
-from typing import List, Tuple, Union, NamedTuple
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import List, Tuple, Union, NamedTuple, Dict, Optional, Callable, Iterable, Iterator, Any
+from . import cache as _cache
+from . import _kernels
+
+try:
+    import mpmath as _mpmath
+except ImportError:
+    _mpmath = None
+
+
+# 判断根是否在单位圆外时使用的数值容差
+_UNIT_CIRCLE_TOL = 1e-10
+
+# 批量检验支持的判定方法
+_DECISION_METHODS = ('roots', 'schur')
+
+# 批量检验的执行方式：'serial' 在当前线程中逐桶计算，'threads' 将各桶的行块分发到线程池。
+# np.linalg.eigvals 在LAPACK调用期间释放GIL，多线程可以并行求根
+_BATCH_BACKENDS = ('serial', 'threads')
+
+# 风险等级及其对应的边际阈值
+_RISK_LEVELS = ('low', 'medium', 'high')
+_MEDIUM_RISK_MARGIN = 0.1
+
+# 单模型求根时的求解器设置，阶数达到 aberth_min_order 时改用Aberth–Ehrlich迭代
+_root_solver_options = {
+    'aberth_min_order': 200,
+    'tol': 1e-12,
+    'max_iter': 100,
+}
+
+# Aberth–Ehrlich迭代中两两求和按行分块，限制临时矩阵的大小
+_ABERTH_CHUNK_SIZE = 256
+
+# 系数预筛选：O(p)充分/必要条件能判定的模型不再求根
+_PREFILTER_STAGES = ('accepted', 'rejected', 'solved')
+_PREFILTER_ACCEPTED = 1
+_PREFILTER_REJECTED = 0
+_PREFILTER_UNDECIDED = -1
+
+# Schur–Cohn递推中反射系数的绝对值落在 [1-带宽, 1+带宽) 内时改用求根判定
+_SCHUR_AMBIGUOUS_BAND = 1e-6
+
+_prefilter_options = {'enabled': True}
+_prefilter_counts = dict.fromkeys(_PREFILTER_STAGES, 0)
+_prefilter_lock = threading.Lock()
+
+# 根模长与1的距离不超过 band 时，float64的结果不足以可靠判定，改用扩展精度修正
+_precision_options = {
+    'enabled': True,
+    'band': 1e-4,
+    'max_iter': 20,
+}
+
+# 批量判定内核的实现：'numba' 使用JIT编译的循环，'numpy' 使用向量化实现，
+# 'auto' 在安装了numba时使用前者
+_KERNEL_BACKENDS = ('auto', 'numpy', 'numba')
+_kernel_options = {'backend': 'auto'}
+
+# 使用mpmath时的十进制有效位数
+_MPMATH_DPS = 40
+
+# 扩展精度修正前对初值的相对扰动
+_PERTURBATION = 1e-7
+
+# 同阶批量检验按行窗口处理，限制伴随矩阵等临时数组的大小：每个窗口的 (N, p, p)
+# 伴随矩阵最多包含这么多个元素，p 阶模型的窗口行数为 max(1, 预算 // p²)。
+# 内存映射的系数矩阵每次只有一个窗口被读入内存
+_MATRIX_WINDOW_ELEMENTS = 1 << 22
+
+# 批量检验结果写入输出数组时使用的结构化类型
+BATCH_RESULT_DTYPE = np.dtype([('flag', np.bool_), ('min_modulus', np.float64)])
 
 
-@dataclass
 class RootInfo:
-    """根的信息"""
-    value: complex
-    magnitude: float
-    is_outside_unit_circle: bool
+    """
+    根的信息
+    
+    使用 ``__slots__`` 存储，``magnitude`` 和 ``is_outside_unit_circle``
+    在未显式给出时于首次访问时计算。
+    """
+    __slots__ = ('_value', '_magnitude', '_is_outside')
+    
+    def __init__(
+        self,
+        value: complex,
+        magnitude: Optional[float] = None,
+        is_outside_unit_circle: Optional[bool] = None
+    ):
+        self._value = value
+        self._magnitude = magnitude
+        self._is_outside = is_outside_unit_circle
+    
+    @property
+    def value(self) -> complex:
+        return complex(self._value)
+    
+    @property
+    def magnitude(self) -> float:
+        if self._magnitude is None:
+            self._magnitude = float(abs(self._value))
+        return self._magnitude
+    
+    @property
+    def is_outside_unit_circle(self) -> bool:
+        if self._is_outside is None:
+            self._is_outside = self.magnitude > 1.0 + _UNIT_CIRCLE_TOL  # 使用小的容差避免数值误差
+        return self._is_outside
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RootInfo):
+            return NotImplemented
+        return (self.value, self.magnitude, self.is_outside_unit_circle) == \
+            (other.value, other.magnitude, other.is_outside_unit_circle)
+    
+    def __repr__(self) -> str:
+        return (f"RootInfo(value={self.value!r}, magnitude={self.magnitude!r}, "
+                f"is_outside_unit_circle={self.is_outside_unit_circle!r})")
     
     def __str__(self) -> str:
-        real_part = f"{self.value.real:.6f}"
-        imag_part = f"{self.value.imag:+.6f}i" if self.value.imag != 0 else ""
+        value = self.value
+        real_part = f"{value.real:.6f}"
+        imag_part = f"{value.imag:+.6f}i" if value.imag != 0 else ""
         return f"{real_part}{imag_part} (|z|={self.magnitude:.6f})"
 
 
-@dataclass
-class StationarityResult:
-    """平稳性检验结果"""
-    is_stationary: bool
-    roots: List[RootInfo]
-    ar_coefficients: List[float]
-    characteristic_polynomial: List[float]
-    message: str
+class _RootsResult:
+    """
+    检验结果的公共部分
+    
+    根以NumPy复数数组保存，``roots`` 列表和 ``message`` 在首次访问时构建。
+    由预筛选判定的模型传入求根函数，根在首次访问时才计算，求根函数返回 (根, 是否经过修正)。
+    ``precision_escalated`` 记录求根时是否实际对单位圆附近不确定带内的根做了扩展精度修正；
+    根延迟计算时，它也在根求出后才确定。
+    """
+    __slots__ = ('characteristic_polynomial', '_escalated', '_root_values', '_roots', '_solve_roots', '_message')
+    
+    # 由子类定义
+    _FLAG = ''
+    _COEFFICIENTS = ''
+    _PASSED_MESSAGE = ''
+    _FAILED_MESSAGE = ''
+    _TITLE = ''
+    _PASSED_LABEL = ''
+    _FAILED_LABEL = ''
+    _COEFFICIENTS_LABEL = ''
+    
+    def _init_roots(
+        self,
+        roots: Union[List[RootInfo], np.ndarray, Callable[[], Tuple[np.ndarray, bool]]],
+        characteristic_polynomial: List[float],
+        message: Optional[str],
+        precision_escalated: Optional[bool] = None
+    ) -> None:
+        # 未给出时，延迟求根的结果在根求出后判断，其余结果视为未修正
+        if precision_escalated is None and not callable(roots):
+            precision_escalated = False
+        self._escalated = precision_escalated
+        self._solve_roots = None
+        if isinstance(roots, np.ndarray):
+            self._root_values = roots
+            self._roots = None
+        elif callable(roots):
+            self._root_values = None
+            self._roots = None
+            self._solve_roots = roots
+        else:
+            self._root_values = None
+            self._roots = list(roots)
+        self.characteristic_polynomial = characteristic_polynomial
+        self._message = message
+    
+    @property
+    def roots(self) -> List[RootInfo]:
+        if self._roots is None:
+            self._roots = [RootInfo(root) for root in self.root_values]
+        return self._roots
+    
+    @roots.setter
+    def roots(self, roots: List[RootInfo]) -> None:
+        if self._escalated is None:
+            self._escalated = False
+        self._root_values = None
+        self._solve_roots = None
+        self._roots = list(roots)
+    
+    @property
+    def root_values(self) -> np.ndarray:
+        """特征根的复数数组"""
+        if self._root_values is None:
+            if self._roots is not None:
+                return np.array([root.value for root in self._roots], dtype=complex)
+            # 多个线程同时首次访问时，先完成的线程会清空求根函数
+            solve_roots = self._solve_roots
+            if solve_roots is None:
+                return self._root_values
+            values, escalated = solve_roots()
+            if self._escalated is None:
+                self._escalated = escalated
+            self._root_values = values
+            self._solve_roots = None
+            return values
+        return self._root_values
+    
+    @property
+    def precision_escalated(self) -> bool:
+        if self._escalated is None:
+            self.root_values
+        return bool(self._escalated)
+    
+    @precision_escalated.setter
+    def precision_escalated(self, precision_escalated: bool) -> None:
+        self._escalated = precision_escalated
+    
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            if getattr(self, self._FLAG):
+                self._message = self._PASSED_MESSAGE
+            else:
+                if self._roots is None:
+                    inside_count = int(np.count_nonzero(np.abs(self.root_values) <= 1.0 + _UNIT_CIRCLE_TOL))
+                else:
+                    inside_count = sum(1 for root in self._roots if not root.is_outside_unit_circle)
+                self._message = self._FAILED_MESSAGE.format(inside_count)
+        return self._message
+    
+    @message.setter
+    def message(self, message: str) -> None:
+        self._message = message
+    
+    def _fields(self) -> Tuple:
+        return (getattr(self, self._FLAG), self.roots, getattr(self, self._COEFFICIENTS),
+                self.characteristic_polynomial, self.message)
+    
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __repr__(self) -> str:
+        names = (self._FLAG, 'roots', self._COEFFICIENTS, 'characteristic_polynomial', 'message')
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(names, self._fields()))
+        return f"{type(self).__name__}({fields})"
     
     def __str__(self) -> str:
-        result = f"平稳性检验结果: {'平稳' if self.is_stationary else '非平稳'}\n"
+        label = self._PASSED_LABEL if getattr(self, self._FLAG) else self._FAILED_LABEL
+        result = f"{self._TITLE}: {label}\n"
         result += f"消息: {self.message}\n"
-        result += f"AR系数: {self.ar_coefficients}\n"
+        result += f"{self._COEFFICIENTS_LABEL}: {getattr(self, self._COEFFICIENTS)}\n"
         result += "特征多项式的根:\n"
         for i, root in enumerate(self.roots, 1):
             status = "✓" if root.is_outside_unit_circle else "✗"
@@ -42,24 +267,122 @@ class StationarityResult:
         return result
 
 
-@dataclass
-class InvertibilityResult:
+class StationarityResult(_RootsResult):
+    """平稳性检验结果"""
+    __slots__ = ('is_stationary', 'ar_coefficients')
+    
+    _FLAG = 'is_stationary'
+    _COEFFICIENTS = 'ar_coefficients'
+    _PASSED_MESSAGE = "模型满足平稳性条件：所有特征根都在单位圆外"
+    _FAILED_MESSAGE = "模型不满足平稳性条件：有{}个根在单位圆内或单位圆上"
+    _TITLE = "平稳性检验结果"
+    _PASSED_LABEL = "平稳"
+    _FAILED_LABEL = "非平稳"
+    _COEFFICIENTS_LABEL = "AR系数"
+    
+    def __init__(
+        self,
+        is_stationary: bool,
+        roots: Union[List[RootInfo], np.ndarray, Callable[[], Tuple[np.ndarray, bool]]],
+        ar_coefficients: List[float],
+        characteristic_polynomial: List[float],
+        message: Optional[str] = None,
+        precision_escalated: Optional[bool] = None
+    ):
+        self.is_stationary = is_stationary
+        self.ar_coefficients = ar_coefficients
+        self._init_roots(roots, characteristic_polynomial, message, precision_escalated)
+
+
+class InvertibilityResult(_RootsResult):
     """可逆性检验结果"""
-    is_invertible: bool
-    roots: List[RootInfo]
-    ma_coefficients: List[float]
-    characteristic_polynomial: List[float]
-    message: str
+    __slots__ = ('is_invertible', 'ma_coefficients')
     
-    def __str__(self) -> str:
-        result = f"可逆性检验结果: {'可逆' if self.is_invertible else '不可逆'}\n"
-        result += f"消息: {self.message}\n"
-        result += f"MA系数: {self.ma_coefficients}\n"
-        result += "特征多项式的根:\n"
-        for i, root in enumerate(self.roots, 1):
-            status = "✓" if root.is_outside_unit_circle else "✗"
-            result += f"  根{i}: {root} {status}\n"
-        return result
+    _FLAG = 'is_invertible'
+    _COEFFICIENTS = 'ma_coefficients'
+    _PASSED_MESSAGE = "模型满足可逆性条件：所有特征根都在单位圆外"
+    _FAILED_MESSAGE = "模型不满足可逆性条件：有{}个根在单位圆内或单位圆上"
+    _TITLE = "可逆性检验结果"
+    _PASSED_LABEL = "可逆"
+    _FAILED_LABEL = "不可逆"
+    _COEFFICIENTS_LABEL = "MA系数"
+    
+    def __init__(
+        self,
+        is_invertible: bool,
+        roots: Union[List[RootInfo], np.ndarray, Callable[[], Tuple[np.ndarray, bool]]],
+        ma_coefficients: List[float],
+        characteristic_polynomial: List[float],
+        message: Optional[str] = None,
+        precision_escalated: Optional[bool] = None
+    ):
+        self.is_invertible = is_invertible
+        self.ma_coefficients = ma_coefficients
+        self._init_roots(roots, characteristic_polynomial, message, precision_escalated)
+
+
+class AberthResult(NamedTuple):
+    """Aberth–Ehrlich求根结果"""
+    roots: np.ndarray
+    converged: bool
+    iterations: int
+
+
+class BatchCheckResult:
+    """
+    批量检验的数组结果，每个字段的第一维对应一个模型
+    
+    使用 ``method='schur'`` 时不求根，``min_moduli``、``roots`` 和 ``escalated`` 为None。
+    ``escalated`` 标记哪些模型有根落在不确定带内并经过扩展精度修正。
+    
+    ``method='roots'`` 时由预筛选判定的模型传入求根函数，``min_moduli``、``roots``
+    和 ``escalated`` 在首次访问其中任一字段时才计算；只读取 ``flags`` 时不求根。
+    """
+    __slots__ = ('flags', '_min_moduli', '_roots', '_escalated', '_solve')
+    
+    def __init__(
+        self,
+        flags: np.ndarray,
+        min_moduli: Optional[np.ndarray],
+        roots: Optional[np.ndarray],
+        escalated: Optional[np.ndarray] = None,
+        solve: Optional[Callable[[], Tuple[np.ndarray, np.ndarray, np.ndarray]]] = None
+    ):
+        self.flags = flags
+        self._min_moduli = min_moduli
+        self._roots = roots
+        self._escalated = escalated
+        self._solve = solve
+    
+    def _resolve(self) -> None:
+        # 多个线程同时首次访问时，先完成的线程会清空求根函数
+        solve = self._solve
+        if solve is None:
+            return
+        self._min_moduli, self._roots, self._escalated = solve()
+        self._solve = None
+    
+    @property
+    def min_moduli(self) -> Optional[np.ndarray]:
+        self._resolve()
+        return self._min_moduli
+    
+    @property
+    def roots(self) -> Optional[np.ndarray]:
+        self._resolve()
+        return self._roots
+    
+    @property
+    def escalated(self) -> Optional[np.ndarray]:
+        self._resolve()
+        return self._escalated
+    
+    def __iter__(self):
+        return iter((self.flags, self.min_moduli, self.roots, self.escalated))
+    
+    def __repr__(self) -> str:
+        return (f"BatchCheckResult(flags={self.flags!r}, min_moduli={self.min_moduli!r}, "
+                f"roots={self.roots!r}, escalated={self.escalated!r})")
 
 
 def _validate_coefficients(coefficients: Union[List[float], np.ndarray], name: str) -> List[float]:
@@ -110,19 +433,832 @@ def _compute_polynomial_roots(polynomial_coeffs: List[float]) -> List[RootInfo]:
     coeffs_for_numpy = polynomial_coeffs[::-1]
     
     # 计算根
-    roots = np.roots(coeffs_for_numpy)
+    roots, _ = _refine_near_unit_circle(polynomial_coeffs, np.roots(coeffs_for_numpy).astype(complex))
+    
+    return _roots_to_root_infos(roots)
+
+
+def _characteristic_roots(polynomial_coeffs: List[float]) -> Tuple[np.ndarray, bool]:
+    """
+    计算特征多项式的根，启用缓存时优先从缓存读取
+    
+    缓存只保存float64求得的根，扩展精度修正在取出后进行，
+    因此返回的修正标记总是反映本次是否实际执行了修正。
+    
+    Returns:
+        Tuple: (根数组, 是否经过扩展精度修正)
+    """
+    cache = _cache.get_cache()
+    if cache is None:
+        roots = _solve_polynomial_roots(polynomial_coeffs)
+    else:
+        roots = cache.get_or_compute(polynomial_coeffs[1:], partial(_solve_polynomial_roots, polynomial_coeffs))
+    
+    return _refine_near_unit_circle(polynomial_coeffs, roots)
+
+
+def _finite_characteristic_roots(polynomial_coeffs: List[float]) -> Tuple[np.ndarray, bool]:
+    """计算特征多项式的有限根，用于预筛选结果的延迟求根"""
+    roots, escalated = _characteristic_roots(polynomial_coeffs)
+    return _finite_roots(roots), escalated
+
+
+def _solve_polynomial_roots(polynomial_coeffs: List[float]) -> np.ndarray:
+    """按阶数选择求根方法：低阶使用 np.roots，高阶使用Aberth–Ehrlich迭代"""
+    min_order = _root_solver_options['aberth_min_order']
+    
+    if min_order is not None and len(polynomial_coeffs) - 1 >= min_order:
+        result = aberth_roots(
+            polynomial_coeffs,
+            tol=_root_solver_options['tol'],
+            max_iter=_root_solver_options['max_iter']
+        )
+        if result.converged:
+            return result.roots
+    
+    # numpy.roots需要从最高次项到常数项的系数
+    return np.roots(polynomial_coeffs[::-1]).astype(complex)
+
+
+def _use_jit_kernels() -> bool:
+    """判断批量判定是否使用numba编译的循环内核"""
+    backend = _kernel_options['backend']
+    return backend == 'numba' or (backend == 'auto' and _kernels.NUMBA_AVAILABLE)
+
+
+def _newton_corrections(coeffs: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """
+    计算所有近似根处的Newton修正量 p(z)/p'(z)
+    
+    coeffs 从常数项到最高次项排列。|z| > 1 时改用互反多项式 q(w) = wⁿp(1/w)
+    在 w = 1/z 处求值，p/p' = z / (n - w·q'(w)/q(w))，避免高阶时 zⁿ 溢出。
+    """
+    if _use_jit_kernels():
+        return _kernels.newton_corrections(np.ascontiguousarray(coeffs, dtype=float), np.ascontiguousarray(z, dtype=complex))
+    
+    degree = len(coeffs) - 1
+    outside = np.abs(z) > 1.0
+    x = np.where(outside, 1.0 / np.where(outside, z, 1.0), z)
+    
+    # Horner求值：|z| ≤ 1 时对 p 求值，|z| > 1 时对互反多项式 q 求值
+    forward = coeffs[::-1]
+    value = np.where(outside, coeffs[0], forward[0]).astype(complex)
+    derivative = np.zeros_like(value)
+    for k in range(1, degree + 1):
+        derivative = derivative * x + value
+        value = value * x + np.where(outside, coeffs[k], forward[k])
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inner = value / derivative
+        reversed_ratio = z / (degree - x * derivative / value)
+    
+    # 恰好落在根上时修正量为0（复数除以0会得到NaN）
+    return np.where(value == 0, 0.0, np.where(outside, reversed_ratio, inner))
+
+
+def _aberth_offsets(z: np.ndarray) -> np.ndarray:
+    """计算 Σ_{j≠k} 1/(z_k - z_j)，按行分块以限制内存占用"""
+    sums = np.empty_like(z)
+    for start in range(0, len(z), _ABERTH_CHUNK_SIZE):
+        block = z[start:start + _ABERTH_CHUNK_SIZE]
+        differences = block[:, np.newaxis] - z[np.newaxis, :]
+        # 对角线（自身）置为inf，其倒数为0
+        differences[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sums[start:start + len(block)] = (1.0 / differences).sum(axis=1)
+    return sums
+
+
+def _in_uncertainty_band(roots: np.ndarray) -> np.ndarray:
+    """判断根的模长是否落在单位圆附近的不确定带内"""
+    with np.errstate(invalid='ignore'):
+        return np.abs(np.abs(roots) - 1.0) <= _precision_options['band']
+
+
+def _refine_near_unit_circle(
+    polynomial_coeffs: Union[List[float], np.ndarray],
+    roots: np.ndarray
+) -> Tuple[np.ndarray, bool]:
+    """
+    对落在不确定带内的根进行扩展精度修正
+    
+    float64求根的误差在m重根附近约为 ε^(1/m)（二重根约1e-8，三重根约6e-6），
+    远大于判定容差。
+    安装了mpmath时对整个多项式做任意精度求根；否则以float64的根为初值，
+    在 np.clongdouble 下对带内的根做Aberth–Ehrlich迭代，其余根保持不变。
+    
+    Args:
+        polynomial_coeffs: 多项式系数，从常数项到最高次项
+        roots: float64求得的根，无穷远处的根（补零的高次项）保持不变
+        
+    Returns:
+        Tuple: (修正后的根, 是否实际执行了修正)。未落在不确定带内、根的个数与
+        多项式次数不符或扩展精度迭代失败时返回原数组和False
+    """
+    if not _precision_options['enabled']:
+        return roots, False
+    
+    roots = np.asarray(roots, dtype=complex)
+    finite = np.isfinite(roots)
+    near = _in_uncertainty_band(roots) & finite
+    if not np.any(near):
+        return roots, False
+    
+    coeffs = np.asarray(polynomial_coeffs, dtype=float)
+    nonzero = np.flatnonzero(coeffs)
+    coeffs = coeffs[:nonzero[-1] + 1]
+    if np.count_nonzero(finite) != len(coeffs) - 1:
+        return roots, False
+    
+    refined = roots.copy()
+    if _mpmath is not None:
+        try:
+            with _mpmath.workdps(_MPMATH_DPS):
+                values = _mpmath.polyroots(coeffs[::-1].tolist(), maxsteps=200, extraprec=2 * _MPMATH_DPS)
+            refined[finite] = np.array([complex(value) for value in values])
+            return refined, True
+        except _mpmath.libmp.NoConvergence:
+            pass
+    
+    values = _longdouble_aberth(coeffs, roots[finite], near[finite])
+    if values is None:
+        return roots, False
+    refined[finite] = values
+    return refined, True
+
+
+def _longdouble_aberth(coeffs: np.ndarray, roots: np.ndarray, active: np.ndarray) -> Optional[np.ndarray]:
+    """
+    在 np.clongdouble 精度下只更新 active 对应的根，其余根作为固定值参与Aberth修正
+    
+    修正量出现非有限值或达到最大迭代次数仍未收敛时返回None，调用方保留原来的根。
+    """
+    coeffs = coeffs.astype(np.longdouble)
+    z = roots.astype(np.clongdouble)
+    indices = np.flatnonzero(active)
+    tol = 4 * np.finfo(np.longdouble).eps
+    
+    # 实初值在实系数下始终保持为实数，无法收敛到近重根分裂出的共轭复根，
+    # 因此沿不同方向做 √ε 量级的扰动
+    angles = 0.4 + 2 * np.pi * np.arange(len(indices)) / len(indices)
+    z[indices] += _PERTURBATION * np.abs(z[indices]) * np.exp(1j * angles)
+    
+    for _ in range(_precision_options['max_iter']):
+        x = z[indices]
+        
+        # Horner同时计算 p(x) 和 p'(x)
+        value = np.full(len(x), coeffs[-1], dtype=np.clongdouble)
+        derivative = np.zeros(len(x), dtype=np.clongdouble)
+        for c in coeffs[-2::-1]:
+            derivative = derivative * x + value
+            value = value * x + c
+        
+        difference = x[:, np.newaxis] - z[np.newaxis, :]
+        difference[np.arange(len(indices)), indices] = 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            offsets = (1 / difference).sum(axis=1) - 1
+            ratio = value / derivative
+            correction = ratio / (1 - ratio * offsets)
+        
+        correction = np.where(value == 0, 0, correction)
+        if not np.all(np.isfinite(correction)):
+            return None
+        
+        z[indices] = x - correction
+        if np.all(np.abs(correction) <= tol * np.abs(z[indices])):
+            return z.astype(complex)
+    
+    return None
+
+
+def _roots_to_root_infos(roots: np.ndarray) -> List[RootInfo]:
+    """将根数组转换为根信息列表，无穷远处的根（最高次项系数为零）会被忽略"""
+    return [RootInfo(root) for root in _finite_roots(roots)]
+
+
+def _finite_roots(roots: np.ndarray) -> np.ndarray:
+    """去掉无穷远处的根（最高次项系数为零时出现）"""
+    roots = np.asarray(roots, dtype=complex)
+    return roots[np.isfinite(roots)]
+
+
+def _all_outside_unit_circle(roots: np.ndarray) -> bool:
+    """判断所有根是否都在单位圆外"""
+    return bool(np.all(np.abs(roots) > 1.0 + _UNIT_CIRCLE_TOL))
+
+
+def _prefilter(poly_tail: np.ndarray) -> np.ndarray:
+    """
+    用 O(p) 的系数条件批量预判多项式 1 + c₁z + ... + cₚzᵖ 的根是否都在单位圆外
+    
+    - 接受：Σ|cᵢ|(1+tol)ⁱ < 1。由Cauchy界，此时所有根的模长都大于 1+tol；
+      Fujiwara界小于1时该条件必然成立，因此不再单独计算
+    - 拒绝：最高次非零系数 |cₘ| ≥ 1（根模长之积 1/|cₘ| ≤ 1），或 P(1) < 0、
+      P(-1) < 0（P(0) = 1，[-1, 1] 内必有实根）
+    
+    求和的舍入误差可能改变接近边界的判定（如单位圆外附近的重根使 P(1) ≈ 0），
+    因此各条件都留出 _prefilter_guard 的余量，落在余量内的模型交给求根判定。
+    
+    Returns:
+        np.ndarray: (N,) int8数组，取值为 _PREFILTER_ACCEPTED、_PREFILTER_REJECTED
+        或 _PREFILTER_UNDECIDED
+    """
+    tail = np.asarray(poly_tail, dtype=float)
+    order = tail.shape[1]
+    powers = np.arange(1, order + 1)
+    
+    magnitudes = np.abs(tail)
+    guard = _prefilter_guard(order, magnitudes.sum(axis=1))
+    
+    accepted = magnitudes @ ((1.0 + _UNIT_CIRCLE_TOL) ** powers) < 1.0 - guard
+    
+    # 补零的高次项不影响最高次非零系数
+    last_nonzero = order - 1 - np.argmax(tail[:, ::-1] != 0, axis=1)
+    leading = tail[np.arange(tail.shape[0]), last_nonzero]
+    rejected = (
+        (np.abs(leading) >= 1.0)
+        | (1.0 + tail.sum(axis=1) < -guard)
+        | (1.0 + tail @ ((-1.0) ** powers) < -guard)
+    )
+    
+    return np.select(
+        [accepted, rejected],
+        [_PREFILTER_ACCEPTED, _PREFILTER_REJECTED],
+        default=_PREFILTER_UNDECIDED
+    ).astype(np.int8)
+
+
+def _prefilter_guard(order: int, magnitude_sum: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """预筛选条件中 p 项求和的舍入误差上界"""
+    return 4.0 * (order + 1) * np.finfo(float).eps * (1.0 + magnitude_sum)
+
+
+def _record_prefilter(decisions: np.ndarray) -> None:
+    """累计各阶段判定的模型个数"""
+    accepted = int(np.count_nonzero(decisions == _PREFILTER_ACCEPTED))
+    rejected = int(np.count_nonzero(decisions == _PREFILTER_REJECTED))
+    with _prefilter_lock:
+        _prefilter_counts['accepted'] += accepted
+        _prefilter_counts['rejected'] += rejected
+        _prefilter_counts['solved'] += len(decisions) - accepted - rejected
+
+
+def _prefilter_decision(poly_coeffs: List[float]) -> int:
+    """单个模型的预筛选，关闭预筛选时返回 _PREFILTER_UNDECIDED"""
+    if not _prefilter_options['enabled'] or len(poly_coeffs) < 2:
+        return _PREFILTER_UNDECIDED
+    
+    # 与 _prefilter 相同的条件；单个模型时纯Python计算比构建NumPy数组更快
+    tail = poly_coeffs[1:]
+    scale = 1.0 + _UNIT_CIRCLE_TOL
+    bound = 0.0
+    weight = 1.0
+    for c in tail:
+        weight *= scale
+        bound += abs(c) * weight
     
-    root_infos = []
-    for root in roots:
-        magnitude = abs(root)
-        is_outside = magnitude > 1.0 + 1e-10  # 使用小的容差避免数值误差
-        root_infos.append(RootInfo(
-            value=complex(root),
-            magnitude=magnitude,
-            is_outside_unit_circle=is_outside
-        ))
+    guard = _prefilter_guard(len(tail), sum(abs(c) for c in tail))
+    leading = next((c for c in reversed(tail) if c != 0), 0.0)
+    if bound < 1.0 - guard:
+        decision, stage = _PREFILTER_ACCEPTED, 'accepted'
+    elif abs(leading) >= 1.0 or 1.0 + sum(tail) < -guard or 1.0 + sum(tail[1::2]) - sum(tail[0::2]) < -guard:
+        decision, stage = _PREFILTER_REJECTED, 'rejected'
+    else:
+        decision, stage = _PREFILTER_UNDECIDED, 'solved'
+    
+    with _prefilter_lock:
+        _prefilter_counts[stage] += 1
+    return decision
+
+
+def _validate_coefficient_matrix(coefficients: Union[List[List[float]], np.ndarray], name: str) -> np.ndarray:
+    """验证批量系数输入，返回形状为 (N, p) 的浮点数组"""
+    try:
+        matrix = np.asarray(coefficients, dtype=float)
+    except (ValueError, TypeError):
+        raise ValueError(f"{name}系数矩阵必须是形状为(N, p)的数值数组")
+    
+    if matrix.ndim != 2:
+        raise ValueError(f"{name}系数矩阵必须是形状为(N, p)的数值数组")
+    
+    if matrix.shape[1] == 0:
+        raise ValueError(f"{name}系数不能为空")
+    
+    return matrix
+
+
+def _coefficient_source(coefficients: Union[List[List[float]], np.ndarray], name: str) -> np.ndarray:
+    """
+    验证同阶批量检验的系数输入
     
-    return root_infos
+    数值类型的NumPy数组（包括 np.memmap）原样返回，由调用方按窗口转换为浮点数，
+    避免一次性把整个内存映射文件复制到内存中；其他输入按 _validate_coefficient_matrix 转换。
+    """
+    if not isinstance(coefficients, np.ndarray) or coefficients.dtype.kind not in 'biuf':
+        return _validate_coefficient_matrix(coefficients, name)
+    
+    if coefficients.ndim != 2:
+        raise ValueError(f"{name}系数矩阵必须是形状为(N, p)的数值数组")
+    if coefficients.shape[1] == 0:
+        raise ValueError(f"{name}系数不能为空")
+    return coefficients
+
+
+def _validate_result_array(out: np.ndarray, n_models: int) -> None:
+    """验证批量检验的输出数组"""
+    if not isinstance(out, np.ndarray) or out.dtype.names is None \
+            or not {'flag', 'min_modulus'} <= set(out.dtype.names):
+        raise TypeError("out必须是包含flag和min_modulus字段的结构化数组，可用 open_result_memmap 创建")
+    if out.shape != (n_models,):
+        raise ValueError(f"out的长度必须与模型数量相同: 期望({n_models},)，实际{out.shape}")
+
+
+def _validate_finite_rows(poly_tail: np.ndarray, name: str, first_row: int = 0) -> None:
+    """检查窗口中的系数都是有限数值，否则指出第一个无效的行"""
+    finite = np.isfinite(poly_tail).all(axis=1)
+    if not finite.all():
+        row = first_row + int(np.argmin(finite))
+        raise ValueError(f"{name}系数必须都是有限数值（第{row}行）")
+
+
+def _default_window(order: int) -> int:
+    """按元素预算计算 order 阶模型每个窗口的默认行数"""
+    return max(1, _MATRIX_WINDOW_ELEMENTS // max(1, order * order))
+
+
+def _windowed_batch_decide(
+    matrix: np.ndarray,
+    name: str,
+    negate: bool,
+    method: str,
+    window: Optional[int],
+    out: Optional[np.ndarray]
+) -> BatchCheckResult:
+    """
+    按行窗口执行同阶批量检验
+    
+    Args:
+        matrix: (N, p) 系数矩阵，可以是内存映射数组
+        name: 模型类型名称，用于错误信息
+        negate: 是否对系数取负得到特征多项式（AR模型）
+        method: 判定方法
+        window: 每个窗口的行数，None表示使用默认窗口
+        out: 结构化输出数组（可选），给出时结果逐窗口写入其中且不保留特征根
+    """
+    _validate_method(method)
+    window = _default_window(matrix.shape[1]) if window is None else window
+    if window < 1:
+        raise ValueError("window必须是正整数")
+    
+    n_models = matrix.shape[0]
+    if out is not None:
+        _validate_result_array(out, n_models)
+    
+    parts: List[BatchCheckResult] = []
+    for start in range(0, n_models, window):
+        poly_tail = np.asarray(matrix[start:start + window], dtype=float)
+        _validate_finite_rows(poly_tail, name, start)
+        part = _batch_decide(-poly_tail if negate else poly_tail, method)
+        
+        if out is None:
+            parts.append(part)
+            continue
+        
+        stop = start + len(poly_tail)
+        out['flag'][start:stop] = part.flags
+        out['min_modulus'][start:stop] = np.nan if part.min_moduli is None else part.min_moduli
+    
+    if out is not None:
+        if isinstance(out, np.memmap):
+            out.flush()
+        return BatchCheckResult(
+            flags=out['flag'],
+            min_moduli=out['min_modulus'] if method == 'roots' else None,
+            roots=None
+        )
+    
+    if len(parts) == 1:
+        return parts[0]
+    if not parts:
+        return _batch_decide(np.empty((0, matrix.shape[1])), method)
+    
+    def join(field: str) -> Optional[np.ndarray]:
+        values = [getattr(part, field) for part in parts]
+        return None if values[0] is None else np.concatenate(values)
+    
+    # 各窗口延迟计算的根在首次读取拼接结果时才求出
+    return BatchCheckResult(
+        flags=join('flags'),
+        min_moduli=None,
+        roots=None,
+        solve=lambda: (join('min_moduli'), join('roots'), join('escalated'))
+    )
+
+
+def _companion_matrices(poly_tail: np.ndarray) -> np.ndarray:
+    """
+    批量构建伴随矩阵
+    
+    poly_tail 的每一行是特征多项式 1 + c₁z + ... + cₚzᵖ 中的 [c₁, ..., cₚ]。
+    返回的 (N, p, p) 矩阵的特征值 λ 是互反多项式 λᵖ + c₁λᵖ⁻¹ + ... + cₚ 的根，
+    与原多项式的根满足 z = 1/λ，因此无需除以最高次项系数，cₚ 为零时也能处理。
+    """
+    n_models, order = poly_tail.shape
+    companions = np.zeros((n_models, order, order), dtype=float)
+    companions[:, 0, :] = -poly_tail
+    
+    if order > 1:
+        sub_diagonal = np.arange(order - 1)
+        companions[:, sub_diagonal + 1, sub_diagonal] = 1.0
+    
+    return companions
+
+
+def _batch_check(poly_tail: np.ndarray) -> BatchCheckResult:
+    """对 (N, p) 多项式系数批量求根，并判断所有根是否都在单位圆外"""
+    # 一次批量特征值计算得到所有模型的互反根
+    eigenvalues = np.linalg.eigvals(_companion_matrices(poly_tail)).astype(complex)
+    
+    # 互反根为零对应无穷远处的根（最高次项系数为零）
+    is_zero = eigenvalues == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roots = 1.0 / np.where(is_zero, 1.0, eigenvalues)
+    roots[is_zero] = np.inf
+    # 实根统一为 +0j 虚部，与 np.roots 的结果保持一致
+    roots = np.where(roots.imag == 0, roots.real + 0j, roots)
+    
+    # 最小根模长等于谱半径的倒数
+    if _use_jit_kernels():
+        _, min_moduli = _kernels.classify_roots(roots, 1.0 + _UNIT_CIRCLE_TOL)
+    else:
+        spectral_radius = np.abs(eigenvalues).max(axis=1)
+        with np.errstate(divide='ignore'):
+            min_moduli = 1.0 / spectral_radius
+    
+    # 只对有根落在不确定带内的模型做扩展精度修正
+    escalated = np.zeros(len(roots), dtype=bool)
+    if _precision_options['enabled']:
+        for row in np.flatnonzero(np.any(_in_uncertainty_band(roots), axis=1)):
+            roots[row], escalated[row] = _refine_near_unit_circle(np.concatenate([[1.0], poly_tail[row]]), roots[row])
+            min_moduli[row] = np.abs(roots[row]).min()
+    
+    flags = min_moduli > 1.0 + _UNIT_CIRCLE_TOL
+    
+    return BatchCheckResult(flags=flags, min_moduli=min_moduli, roots=roots, escalated=escalated)
+
+
+def _schur_cohn_stable(poly_tail: np.ndarray) -> np.ndarray:
+    """
+    通过Schur–Cohn（Levinson逐步降阶）递推批量判断根是否都在单位圆外
+    
+    对多项式 A(z) = 1 + a₁z + ... + aₘzᵐ，反射系数 kₘ = aₘ，降阶公式为
+    aᵢ' = (aᵢ - kₘ·aₘ₋ᵢ) / (1 - kₘ²)。所有根在单位圆外当且仅当所有 |kᵢ| < 1。
+    每个模型的计算量为 O(p²)，且不需要求根。
+    
+    单位圆外附近的重根使反射系数以二次方的速度逼近1（模长为 1+ε 的二重根对应
+    |k| ≈ 1 - ε²/2），无法与求根方法的容差 _UNIT_CIRCLE_TOL 对应。反射系数落在
+    1 附近 _SCHUR_AMBIGUOUS_BAND 内的模型改用求根判定，保证两种方法的结论一致。
+    """
+    decisions = _schur_cohn_decisions(poly_tail)
+    
+    ambiguous = decisions == _PREFILTER_UNDECIDED
+    if np.any(ambiguous):
+        decisions[ambiguous] = _batch_check(np.asarray(poly_tail, dtype=float)[ambiguous]).flags
+    return decisions == _PREFILTER_ACCEPTED
+
+
+def _schur_cohn_decisions(poly_tail: np.ndarray) -> np.ndarray:
+    """
+    Schur–Cohn递推的三值判定
+    
+    Returns:
+        np.ndarray: (N,) int8数组，取值为 _PREFILTER_ACCEPTED、_PREFILTER_REJECTED，
+        或反射系数落在不确定带内时为 _PREFILTER_UNDECIDED
+    """
+    coeffs = np.array(poly_tail, dtype=float)
+    lower, upper = 1.0 - _SCHUR_AMBIGUOUS_BAND, 1.0 + _SCHUR_AMBIGUOUS_BAND
+    
+    if _use_jit_kernels():
+        return _kernels.schur_cohn_decide(coeffs, lower, upper)
+    
+    decisions = np.full(coeffs.shape[0], _PREFILTER_ACCEPTED, dtype=np.int8)
+    active = np.ones(coeffs.shape[0], dtype=bool)
+    
+    with np.errstate(over='ignore', invalid='ignore'):
+        for order in range(coeffs.shape[1], 0, -1):
+            reflection = coeffs[:, order - 1]
+            magnitude = np.abs(reflection)
+            
+            rejected = active & ~(magnitude < upper)
+            undecided = active & ~rejected & ~(magnitude < lower)
+            decisions[rejected] = _PREFILTER_REJECTED
+            decisions[undecided] = _PREFILTER_UNDECIDED
+            active &= ~(rejected | undecided)
+            
+            if order == 1 or not np.any(active):
+                break
+            
+            # 已经得出结论的模型不再关心其取值，避免除零
+            denominator = np.where(active, 1.0 - reflection * reflection, 1.0)
+            coeffs = (
+                coeffs[:, :order - 1] - reflection[:, np.newaxis] * coeffs[:, order - 2::-1]
+            ) / denominator[:, np.newaxis]
+    
+    return decisions
+
+
+def _validate_backend(backend: str) -> str:
+    """验证批量检验的执行方式"""
+    if backend not in _BATCH_BACKENDS:
+        raise ValueError(f"未知的执行方式: {backend}，可选值为 {', '.join(_BATCH_BACKENDS)}")
+    return backend
+
+
+def _resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """将 n_jobs 参数转换为实际的并行数，None和-1表示使用全部CPU核心"""
+    if n_jobs is None or n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError("n_jobs必须是正整数或-1")
+    return n_jobs
+
+
+def _validate_method(method: str) -> str:
+    """验证判定方法"""
+    if method not in _DECISION_METHODS:
+        raise ValueError(f"未知的判定方法: {method}，可选值为 {', '.join(_DECISION_METHODS)}")
+    return method
+
+
+def _batch_decide(poly_tail: np.ndarray, method: str) -> BatchCheckResult:
+    """
+    按指定方法批量判定，'roots' 给出全部根，'schur' 只给出判定结果
+    
+    'roots' 方法启用预筛选时，只有无法判定的模型立即求根；其余模型的根在首次读取
+    min_moduli、roots 或 escalated 时才计算，不计入 prefilter_stats 的 solved。
+    """
+    if _validate_method(method) == 'schur':
+        return BatchCheckResult(flags=_prefiltered_schur_cohn(poly_tail), min_moduli=None, roots=None)
+    
+    if not _prefilter_options['enabled']:
+        return _batch_check(poly_tail)
+    
+    decisions = _prefilter(poly_tail)
+    _record_prefilter(decisions)
+    
+    undecided = decisions == _PREFILTER_UNDECIDED
+    if np.all(undecided):
+        return _batch_check(poly_tail)
+    
+    flags = decisions == _PREFILTER_ACCEPTED
+    n_models, order = poly_tail.shape
+    min_moduli = np.empty(n_models, dtype=float)
+    roots = np.empty((n_models, order), dtype=complex)
+    escalated = np.zeros(n_models, dtype=bool)
+    
+    if np.any(undecided):
+        solved = _batch_check(poly_tail[undecided])
+        flags[undecided] = solved.flags
+        min_moduli[undecided] = solved.min_moduli
+        roots[undecided] = solved.roots
+        escalated[undecided] = solved.escalated
+    
+    decided = ~undecided
+    decided_tail = poly_tail[decided]
+    
+    def solve() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # 判定结论沿用预筛选，这里只补齐根和最小根模长
+        result = _batch_check(decided_tail)
+        min_moduli[decided] = result.min_moduli
+        roots[decided] = result.roots
+        escalated[decided] = result.escalated
+        return min_moduli, roots, escalated
+    
+    return BatchCheckResult(flags=flags, min_moduli=None, roots=None, escalated=None, solve=solve)
+
+
+def _prefiltered_schur_cohn(poly_tail: np.ndarray) -> np.ndarray:
+    """先做系数预筛选，只对无法判定的模型执行Schur–Cohn递推"""
+    if not _prefilter_options['enabled']:
+        return _schur_cohn_stable(poly_tail)
+    
+    decisions = _prefilter(poly_tail)
+    _record_prefilter(decisions)
+    
+    flags = decisions == _PREFILTER_ACCEPTED
+    undecided = decisions == _PREFILTER_UNDECIDED
+    if np.any(undecided):
+        flags[undecided] = _schur_cohn_stable(poly_tail[undecided])
+    return flags
+
+
+def _validate_batch(
+    models: Union[List[Union[List[float], np.ndarray]], Dict[int, Union[List[float], np.ndarray]]],
+    name: str
+) -> Tuple[Dict[int, List[float]], Dict[int, str]]:
+    """
+    逐个验证批量输入中的模型系数
+    
+    Args:
+        models: 模型系数列表，或 {原始索引: 模型系数} 字典
+        name: 模型类型名称，用于错误信息
+    
+    Returns:
+        Tuple: ({原始索引: 系数列表}, {原始索引: 错误信息})
+    """
+    valid: Dict[int, List[float]] = {}
+    errors: Dict[int, str] = {}
+    items = models.items() if isinstance(models, dict) else enumerate(models)
+    
+    for index, coefficients in items:
+        try:
+            coeffs = _validate_coefficients(coefficients, name)
+        except (TypeError, ValueError) as e:
+            errors[index] = str(e)
+            continue
+        
+        # 非有限值会让整批特征值计算失败，需要单独隔离
+        if not np.all(np.isfinite(coeffs)):
+            errors[index] = f"{name}系数必须都是有限数值"
+            continue
+        
+        valid[index] = coeffs
+    
+    return valid, errors
+
+
+def _iter_model_chunks(
+    models: Iterable[Any],
+    model_names: Optional[Iterable[str]],
+    chunk_size: int
+) -> Iterator[Tuple[int, List[Any], List[str]]]:
+    """
+    将任意可迭代的模型序列切分为定长块，内存占用只与 chunk_size 有关
+    
+    Yields:
+        Tuple: (块内第一个模型的全局索引, 模型列表, 名称列表)
+        
+    Raises:
+        ValueError: 如果名称数量与模型数量不同（在迭代过程中检测）
+    """
+    models = iter(models)
+    names = iter(model_names) if model_names is not None else None
+    offset = 0
+    
+    while True:
+        chunk = list(islice(models, chunk_size))
+        if not chunk:
+            break
+        
+        if names is None:
+            chunk_names = [f"Model_{offset + i + 1}" for i in range(len(chunk))]
+        else:
+            chunk_names = list(islice(names, len(chunk)))
+            if len(chunk_names) != len(chunk):
+                raise ValueError("模型名称数量必须与模型数量相同")
+        
+        yield offset, chunk, chunk_names
+        offset += len(chunk)
+    
+    if names is not None and next(names, None) is not None:
+        raise ValueError("模型名称数量必须与模型数量相同")
+
+
+def _iter_named_model_chunks(
+    named_models: Iterable[Tuple[str, Any]],
+    chunk_size: int
+) -> Iterator[Tuple[int, List[Any], List[str]]]:
+    """
+    与 _iter_model_chunks 相同，但名称随模型成对给出，不需要另外对齐名称序列
+    
+    Yields:
+        Tuple: (块内第一个模型的全局索引, 模型列表, 名称列表)
+    """
+    named_models = iter(named_models)
+    offset = 0
+    
+    while True:
+        pairs = list(islice(named_models, chunk_size))
+        if not pairs:
+            break
+        
+        yield offset, [model for _, model in pairs], [name for name, _ in pairs]
+        offset += len(pairs)
+
+
+def _validate_chunk_size(chunk_size: int) -> int:
+    """验证流式处理的块大小"""
+    if chunk_size < 1:
+        raise ValueError("chunk_size必须是正整数")
+    return chunk_size
+
+
+def _group_indices_by_order(
+    coefficients: Dict[int, List[float]],
+    bucket_width: int = 1
+) -> Dict[int, List[int]]:
+    """
+    按模型阶数对系数分组，返回 {桶阶数: [原始索引, ...]}
+    
+    bucket_width 大于1时，阶数向上取整到其倍数，使相近阶数的模型共用一个桶。
+    """
+    if bucket_width < 1:
+        raise ValueError("分桶宽度必须是正整数")
+    
+    groups: Dict[int, List[int]] = {}
+    for index, coeffs in coefficients.items():
+        bucket_order = -(-len(coeffs) // bucket_width) * bucket_width
+        groups.setdefault(bucket_order, []).append(index)
+    return groups
+
+
+def _bucketed_check(
+    coefficients: Dict[int, List[float]],
+    batch_check: Callable[..., BatchCheckResult],
+    bucket_width: int = 1,
+    method: str = 'roots',
+    backend: str = 'serial',
+    n_jobs: Optional[int] = None
+) -> Dict[int, Tuple[bool, Optional[float], Optional[np.ndarray], Optional[bool]]]:
+    """
+    按阶数分桶批量检验不同阶数混合的模型
+    
+    每个桶内阶数不足的模型在高次项补零后堆叠，经一次批量检验得到结果。
+    补零只会引入无穷远处的根（互反根为零），不影响判定和最小根模长，
+    求根时按模长保留模型真实阶数个根即可去掉这些补出的根。
+    
+    Args:
+        coefficients: {原始索引: 已验证的系数列表}
+        batch_check: stationarity_check_batch 或 invertibility_check_batch
+        bucket_width: 分桶宽度，1 表示严格按阶数分组
+        method: 判定方法，'roots' 或 'schur'
+        backend: 执行方式，'serial' 或 'threads'
+        n_jobs: 'threads' 时的线程数，默认使用全部CPU核心
+        
+    Returns:
+        Dict: {原始索引: (判定结果, 最小根模长, 特征根数组, 是否经过扩展精度修正)}，'schur'时后三项为None
+    """
+    _validate_backend(backend)
+    workers = _resolve_n_jobs(n_jobs) if backend == 'threads' else 1
+    
+    # 每个桶按线程数切分为行块，单个大桶也能并行
+    tasks: List[Tuple[List[int], np.ndarray]] = []
+    for bucket_order, indices in _group_indices_by_order(coefficients, bucket_width).items():
+        block = -(-len(indices) // workers)
+        for start in range(0, len(indices), block):
+            chunk = indices[start:start + block]
+            matrix = np.zeros((len(chunk), bucket_order), dtype=float)
+            for row, index in enumerate(chunk):
+                matrix[row, :len(coefficients[index])] = coefficients[index]
+            tasks.append((chunk, matrix))
+    
+    def check(task: Tuple[List[int], np.ndarray]) -> BatchCheckResult:
+        return batch_check(task[1], method=method)
+    
+    if workers > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            batches = list(executor.map(check, tasks))
+    else:
+        batches = [check(task) for task in tasks]
+    
+    outcomes: Dict[int, Tuple[bool, Optional[float], Optional[np.ndarray], Optional[bool]]] = {}
+    
+    for (indices, matrix), batch in zip(tasks, batches):
+        bucket_order = matrix.shape[1]
+        for row, index in enumerate(indices):
+            if batch.roots is None:
+                outcomes[index] = (bool(batch.flags[row]), None, None, None)
+                continue
+            
+            roots = batch.roots[row]
+            order = len(coefficients[index])
+            if order < bucket_order:
+                roots = roots[np.argsort(np.abs(roots), kind='stable')[:order]]
+            
+            outcomes[index] = (
+                bool(batch.flags[row]), float(batch.min_moduli[row]), roots, bool(batch.escalated[row])
+            )
+    
+    return outcomes
+
+
+def _risk_level(min_distance: float) -> str:
+    """根据最小根模长与1的差值确定风险等级"""
+    if min_distance <= 0:
+        return 'high'  # 根在单位圆内或单位圆上
+    elif min_distance < _MEDIUM_RISK_MARGIN:
+        return 'medium'  # 根接近单位圆
+    return 'low'  # 根远离单位圆
+
+
+def _risk_codes(min_distances: np.ndarray) -> np.ndarray:
+    """_risk_level 的向量化版本，返回 _RISK_LEVELS 中的下标，NaN 对应 -1"""
+    min_distances = np.asarray(min_distances, dtype=float)
+    return np.select(
+        [np.isnan(min_distances), min_distances <= 0, min_distances < _MEDIUM_RISK_MARGIN],
+        [-1, 2, 1],
+        default=0
+    ).astype(np.int8)
 
 
 def stationarity_check(ar_coefficients: Union[List[float], np.ndarray]) -> StationarityResult:
@@ -153,25 +1289,37 @@ def stationarity_check(ar_coefficients: Union[List[float], np.ndarray]) -> Stati
     negative_coeffs = [-c for c in coeffs]
     poly_coeffs = _build_characteristic_polynomial(negative_coeffs)
     
-    # 计算根
-    roots = _compute_polynomial_roots(poly_coeffs)
+    # 系数条件已能判定时不求根，根在首次访问时计算
+    decision = _prefilter_decision(poly_coeffs)
+    if decision != _PREFILTER_UNDECIDED:
+        return StationarityResult(
+            is_stationary=decision == _PREFILTER_ACCEPTED,
+            roots=partial(_finite_characteristic_roots, poly_coeffs),
+            ar_coefficients=coeffs,
+            characteristic_polynomial=poly_coeffs
+        )
     
-    # 判断平稳性：所有根都在单位圆外
-    is_stationary = all(root.is_outside_unit_circle for root in roots)
+    # 计算根
+    roots, escalated = _characteristic_roots(poly_coeffs)
     
-    # 生成消息
-    if is_stationary:
-        message = "模型满足平稳性条件：所有特征根都在单位圆外"
-    else:
-        inside_count = sum(1 for root in roots if not root.is_outside_unit_circle)
-        message = f"模型不满足平稳性条件：有{inside_count}个根在单位圆内或单位圆上"
+    return _build_stationarity_result(coeffs, poly_coeffs, roots, escalated)
+
+
+def _build_stationarity_result(
+    coeffs: List[float],
+    poly_coeffs: List[float],
+    roots: np.ndarray,
+    precision_escalated: bool = False
+) -> StationarityResult:
+    """根据已计算的根构建平稳性检验结果，根保持为数组，消息在首次访问时生成"""
+    roots = _finite_roots(roots)
     
     return StationarityResult(
-        is_stationary=is_stationary,
+        is_stationary=_all_outside_unit_circle(roots),
         roots=roots,
         ar_coefficients=coeffs,
         characteristic_polynomial=poly_coeffs,
-        message=message
+        precision_escalated=bool(precision_escalated)
     )
 
 
@@ -202,23 +1350,315 @@ def invertibility_check(ma_coefficients: Union[List[float], np.ndarray]) -> Inve
     # 对于MA模型，系数前面是正号
     poly_coeffs = _build_characteristic_polynomial(coeffs)
     
-    # 计算根
-    roots = _compute_polynomial_roots(poly_coeffs)
+    # 系数条件已能判定时不求根，根在首次访问时计算
+    decision = _prefilter_decision(poly_coeffs)
+    if decision != _PREFILTER_UNDECIDED:
+        return InvertibilityResult(
+            is_invertible=decision == _PREFILTER_ACCEPTED,
+            roots=partial(_finite_characteristic_roots, poly_coeffs),
+            ma_coefficients=coeffs,
+            characteristic_polynomial=poly_coeffs
+        )
     
-    # 判断可逆性：所有根都在单位圆外
-    is_invertible = all(root.is_outside_unit_circle for root in roots)
+    # 计算根
+    roots, escalated = _characteristic_roots(poly_coeffs)
     
-    # 生成消息
-    if is_invertible:
-        message = "模型满足可逆性条件：所有特征根都在单位圆外"
-    else:
-        inside_count = sum(1 for root in roots if not root.is_outside_unit_circle)
-        message = f"模型不满足可逆性条件：有{inside_count}个根在单位圆内或单位圆上"
+    return _build_invertibility_result(coeffs, poly_coeffs, roots, escalated)
+
+
+def _build_invertibility_result(
+    coeffs: List[float],
+    poly_coeffs: List[float],
+    roots: np.ndarray,
+    precision_escalated: bool = False
+) -> InvertibilityResult:
+    """根据已计算的根构建可逆性检验结果，根保持为数组，消息在首次访问时生成"""
+    roots = _finite_roots(roots)
     
     return InvertibilityResult(
-        is_invertible=is_invertible,
+        is_invertible=_all_outside_unit_circle(roots),
         roots=roots,
         ma_coefficients=coeffs,
         characteristic_polynomial=poly_coeffs,
-        message=message
+        precision_escalated=bool(precision_escalated)
     )
+
+
+def stationarity_check_batch(
+    ar_coefficients: Union[List[List[float]], np.ndarray],
+    method: str = 'roots',
+    window: Optional[int] = None,
+    out: Optional[np.ndarray] = None
+) -> BatchCheckResult:
+    """
+    同阶AR模型的批量平稳性检验
+    
+    将N个AR(p)模型的伴随矩阵堆叠成 (N, p, p) 数组，通过一次批量
+    ``np.linalg.eigvals`` 调用求出全部特征根，避免逐个模型的Python开销。
+    
+    系数矩阵按 window 行为一个窗口处理，可以直接传入 ``np.load(path, mmap_mode='r')``
+    得到的内存映射数组，每次只有一个窗口被读入内存。
+    
+    Args:
+        ar_coefficients: 形状为 (N, p) 的AR系数矩阵，每行为 [φ₁, φ₂, ..., φₚ]
+        method: 判定方法
+            - 'roots': 批量求特征值，返回根和最小根模长（默认）
+            - 'schur': Schur–Cohn递推，O(p²)且只返回判定结果
+        window: 每个窗口的行数，默认按伴随矩阵的元素预算取 max(1, 4194304 // p²)
+        out: 长度为N的结构化输出数组（可选），通常由 open_result_memmap 创建。
+            给出时结果逐窗口写入 out['flag'] 和 out['min_modulus']（'schur'时为NaN），
+            返回的 roots 为None，不在内存中保留全部特征根
+        
+    Returns:
+        BatchCheckResult: 包含以下数组的结果
+            - flags: (N,) 布尔数组，模型是否平稳
+            - min_moduli: (N,) 最小根模长（无有限根时为inf，'schur'时为None）
+            - roots: (N, p) 复数数组，特征方程的根（最高次项系数为零时含inf，'schur'时为None）
+            
+    Raises:
+        TypeError: 如果 out 不是包含所需字段的结构化数组
+        ValueError: 如果系数矩阵不是二维数值数组、阶数为零、包含非有限数值、判定方法未知或 out 的长度不符
+    """
+    matrix = _coefficient_source(ar_coefficients, "AR")
+    
+    # 特征多项式: 1 - φ₁z - φ₂z² - ... - φₚzᵖ
+    return _windowed_batch_decide(matrix, "AR", True, method, window, out)
+
+
+def invertibility_check_batch(
+    ma_coefficients: Union[List[List[float]], np.ndarray],
+    method: str = 'roots',
+    window: Optional[int] = None,
+    out: Optional[np.ndarray] = None
+) -> BatchCheckResult:
+    """
+    同阶MA模型的批量可逆性检验
+    
+    将N个MA(q)模型的伴随矩阵堆叠成 (N, q, q) 数组，通过一次批量
+    ``np.linalg.eigvals`` 调用求出全部特征根，避免逐个模型的Python开销。
+    
+    系数矩阵按 window 行为一个窗口处理，可以直接传入 ``np.load(path, mmap_mode='r')``
+    得到的内存映射数组，每次只有一个窗口被读入内存。
+    
+    Args:
+        ma_coefficients: 形状为 (N, q) 的MA系数矩阵，每行为 [θ₁, θ₂, ..., θₑ]
+        method: 判定方法
+            - 'roots': 批量求特征值，返回根和最小根模长（默认）
+            - 'schur': Schur–Cohn递推，O(p²)且只返回判定结果
+        window: 每个窗口的行数，默认按伴随矩阵的元素预算取 max(1, 4194304 // q²)
+        out: 长度为N的结构化输出数组（可选），通常由 open_result_memmap 创建。
+            给出时结果逐窗口写入 out['flag'] 和 out['min_modulus']（'schur'时为NaN），
+            返回的 roots 为None，不在内存中保留全部特征根
+        
+    Returns:
+        BatchCheckResult: 包含以下数组的结果
+            - flags: (N,) 布尔数组，模型是否可逆
+            - min_moduli: (N,) 最小根模长（无有限根时为inf，'schur'时为None）
+            - roots: (N, q) 复数数组，特征方程的根（最高次项系数为零时含inf，'schur'时为None）
+            
+    Raises:
+        TypeError: 如果 out 不是包含所需字段的结构化数组
+        ValueError: 如果系数矩阵不是二维数值数组、阶数为零、包含非有限数值、判定方法未知或 out 的长度不符
+    """
+    matrix = _coefficient_source(ma_coefficients, "MA")
+    
+    # 特征多项式: 1 + θ₁z + θ₂z² + ... + θₑzᵠ
+    return _windowed_batch_decide(matrix, "MA", False, method, window, out)
+
+
+def open_result_memmap(path: str, n_models: int) -> np.memmap:
+    """
+    创建用于保存批量检验结果的内存映射npy文件
+    
+    Args:
+        path: 输出文件路径
+        n_models: 模型数量
+        
+    Returns:
+        np.memmap: 形状为 (n_models,)、类型为 BATCH_RESULT_DTYPE 的可写数组，
+        可作为 stationarity_check_batch/invertibility_check_batch 的 out 参数
+        
+    Raises:
+        ValueError: 如果模型数量为负数
+    """
+    if n_models < 0:
+        raise ValueError("n_models不能为负数")
+    return np.lib.format.open_memmap(path, mode='w+', dtype=BATCH_RESULT_DTYPE, shape=(n_models,))
+
+
+def aberth_roots(
+    polynomial_coeffs: Union[List[float], np.ndarray],
+    initial_roots: Optional[np.ndarray] = None,
+    tol: float = 1e-12,
+    max_iter: int = 100
+) -> AberthResult:
+    """
+    使用Aberth–Ehrlich（同时Newton）迭代计算多项式的全部根
+    
+    每次迭代对所有根同时进行向量化更新，时间复杂度为 O(n²)，不需要构建
+    n×n 伴随矩阵，适合AR(2000)这类高阶特征多项式。
+    
+    Args:
+        polynomial_coeffs: 多项式系数，从常数项到最高次项
+        initial_roots: 初始近似根（可选），用于从上一次的结果热启动，
+            个数必须等于多项式的次数
+        tol: 收敛容差，所有根的相对修正量都小于该值时停止
+        max_iter: 最大迭代次数
+        
+    Returns:
+        AberthResult: 包含以下字段的结果
+            - roots: 多项式的根
+            - converged: 是否在最大迭代次数内收敛
+            - iterations: 实际迭代次数
+            
+    Raises:
+        ValueError: 如果多项式系数全为零或初始根个数与次数不符
+    """
+    coeffs = np.asarray(polynomial_coeffs, dtype=float)
+    
+    nonzero = np.flatnonzero(coeffs)
+    if nonzero.size == 0:
+        raise ValueError("多项式系数不能全为零")
+    
+    # 常数项开始的零系数对应零根，最高次项的零系数使次数降低
+    zero_roots = np.zeros(nonzero[0], dtype=complex)
+    coeffs = coeffs[nonzero[0]:nonzero[-1] + 1]
+    degree = len(coeffs) - 1
+    
+    if degree == 0:
+        return AberthResult(roots=zero_roots, converged=True, iterations=0)
+    
+    if initial_roots is not None:
+        z = np.array(initial_roots, dtype=complex)
+        if z.shape != (degree,):
+            raise ValueError(f"初始根的个数必须等于多项式的次数{degree}")
+    else:
+        # 初始点均匀分布在半径为根模长几何平均值的圆上，加偏移角避免对称
+        radius = abs(coeffs[0] / coeffs[-1]) ** (1.0 / degree)
+        angles = 2.0 * np.pi * np.arange(degree) / degree + 0.4
+        z = radius * np.exp(1j * angles)
+    
+    converged = False
+    iterations = 0
+    
+    for iterations in range(1, max_iter + 1):
+        ratio = _newton_corrections(coeffs, z)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correction = ratio / (1.0 - ratio * _aberth_offsets(z))
+        
+        # 已落在根上时Newton比值为0，修正量也为0
+        correction = np.where(ratio == 0, 0.0, correction)
+        if not np.all(np.isfinite(correction)):
+            break
+        
+        z = z - correction
+        
+        if np.all(np.abs(correction) <= tol * np.maximum(1.0, np.abs(z))):
+            converged = True
+            break
+    
+    return AberthResult(roots=np.concatenate([zero_roots, z]), converged=converged, iterations=iterations)
+
+
+def set_root_solver(
+    aberth_min_order: Optional[int] = 200,
+    tol: float = 1e-12,
+    max_iter: int = 100
+) -> None:
+    """
+    设置单模型检验使用的求根方法
+    
+    特征多项式的阶数达到 aberth_min_order 时，stationarity_check 和
+    invertibility_check 使用Aberth–Ehrlich迭代代替 np.roots；未收敛时
+    自动回退到 np.roots。
+    
+    Args:
+        aberth_min_order: 使用Aberth–Ehrlich迭代的最小阶数，None表示始终使用 np.roots
+        tol: Aberth–Ehrlich迭代的收敛容差
+        max_iter: Aberth–Ehrlich迭代的最大迭代次数
+    """
+    if aberth_min_order is not None and aberth_min_order < 1:
+        raise ValueError("最小阶数必须是正整数")
+    if tol <= 0:
+        raise ValueError("收敛容差必须大于0")
+    if max_iter < 1:
+        raise ValueError("最大迭代次数必须是正整数")
+    
+    _root_solver_options.update(aberth_min_order=aberth_min_order, tol=tol, max_iter=max_iter)
+
+
+def set_prefilter(enabled: bool = True) -> None:
+    """
+    启用或关闭系数预筛选
+    
+    启用时，stationarity_check、invertibility_check 和批量检验先用 O(p) 的系数条件
+    判定模型，只有无法判定的模型才求根或执行递推。被预筛选判定的模型，
+    其特征根和最小根模长在首次访问时才计算。
+    
+    Args:
+        enabled: 是否启用预筛选
+    """
+    _prefilter_options['enabled'] = bool(enabled)
+
+
+def prefilter_stats() -> Dict[str, int]:
+    """
+    获取各判定阶段的模型个数
+    
+    Returns:
+        Dict: 包含以下计数
+            - accepted: 由系数充分条件判定为平稳/可逆的模型数
+            - rejected: 由系数必要条件判定为非平稳/不可逆的模型数
+            - solved: 需要求根或Schur–Cohn递推才能判定的模型数（不含为读取根而延迟求根的模型）
+    """
+    with _prefilter_lock:
+        return dict(_prefilter_counts)
+
+
+def reset_prefilter_stats() -> None:
+    """清零各判定阶段的计数"""
+    with _prefilter_lock:
+        for stage in _PREFILTER_STAGES:
+            _prefilter_counts[stage] = 0
+
+
+def set_precision_escalation(enabled: bool = True, band: float = 1e-4, max_iter: int = 20) -> None:
+    """
+    设置近单位根模型的扩展精度修正
+    
+    float64求得的根中，模长与1的距离不超过 band 的根会在扩展精度下重新求解
+    （安装mpmath时使用任意精度，否则使用 np.longdouble），其余模型不受影响。
+    
+    Args:
+        enabled: 是否启用扩展精度修正
+        band: 不确定带的半宽度
+        max_iter: np.longdouble 修正的最大迭代次数
+    """
+    if band <= 0:
+        raise ValueError("不确定带宽度必须大于0")
+    if max_iter < 1:
+        raise ValueError("最大迭代次数必须是正整数")
+    
+    _precision_options.update(enabled=bool(enabled), band=band, max_iter=max_iter)
+
+
+def set_kernel_backend(backend: str = 'auto') -> None:
+    """
+    设置批量判定内核（Schur–Cohn递推、Horner求值和根的分类）的实现
+    
+    Args:
+        backend: 内核实现
+            - 'auto': 安装了numba时使用JIT编译的循环，否则使用NumPy（默认）
+            - 'numpy': 始终使用NumPy向量化实现
+            - 'numba': 使用numba编译的循环
+            
+    Raises:
+        ValueError: 如果内核实现未知
+        ImportError: 如果选择 'numba' 但未安装numba
+    """
+    if backend not in _KERNEL_BACKENDS:
+        raise ValueError(f"未知的内核实现: {backend}，可选值为 {', '.join(_KERNEL_BACKENDS)}")
+    if backend == 'numba' and not _kernels.NUMBA_AVAILABLE:
+        raise ImportError("使用numba内核需要先安装numba: pip install numba")
+    
+    _kernel_options['backend'] = backend
@@ -0,0 +1,356 @@
+"""
+常驻守护进程
+
+`tsdiag daemon` 在Unix域套接字上常驻，预先导入NumPy和分析模块并保留进程内缓存。
+命令行入口 launch 在守护进程运行时把 stationarity/invertibility/check 子命令
+转发给它执行，只需启动一个不导入NumPy和click的轻量解释器。
+
+协议为每个连接一行JSON请求、一行JSON响应：
+    {"argv": ["stationarity", "-c", "0.5"]} -> {"exit_code": 0, "stdout": "...", "stderr": "..."}
+    {"command": "ping"} -> {"status": "ok", "pid": 1234}
+    {"command": "stop"} -> {"status": "stopping", "pid": 1234}
+
+客户端只与当前用户的守护进程通信：连接后核对对端进程（或套接字文件）的属主，
+不属于当前用户时视为守护进程未运行。
+
+本模块顶层只导入标准库，保证转发路径的启动开销最小。
+"""
+
+import io
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# 转发给守护进程执行的子命令：只读取命令行参数，不读写文件或标准输入
+FORWARDED_COMMANDS = ('stationarity', 'invertibility', 'check')
+
+# 设置该环境变量（非空）时不转发，始终在当前进程中执行
+NO_DAEMON_ENV = 'TSDIAG_NO_DAEMON'
+
+# 指定套接字路径的环境变量
+SOCKET_ENV = 'TSDIAG_SOCKET'
+
+# 客户端等待守护进程响应的超时（秒）
+_CLIENT_TIMEOUT = 30.0
+
+# 服务端读取一个请求的总时限（秒）。连接按顺序处理，
+# 不发送请求的客户端最多只让后续连接等待这么久
+_READ_TIMEOUT = 1.0
+
+# 单个请求的最大字节数
+_MAX_REQUEST_BYTES = 1 << 20
+
+
+def _current_uid() -> int:
+    """当前用户的uid，不支持uid的平台上为0"""
+    return os.getuid() if hasattr(os, 'getuid') else 0
+
+
+def _fallback_directory() -> str:
+    """未设置 XDG_RUNTIME_DIR 时存放套接字的私有目录"""
+    return os.path.join(tempfile.gettempdir(), f'tsdiag-{_current_uid()}')
+
+
+def default_socket_path() -> str:
+    """
+    获取默认的套接字路径
+    
+    依次使用环境变量 TSDIAG_SOCKET、$XDG_RUNTIME_DIR/tsdiag.sock，
+    最后回退到临时目录下当前用户私有（权限0700）的 tsdiag-<uid>/tsdiag.sock，
+    该目录由守护进程启动时创建。
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'tsdiag.sock')
+    
+    return os.path.join(_fallback_directory(), 'tsdiag.sock')
+
+
+def _ensure_private_directory(directory: str) -> None:
+    """
+    创建或检查只有当前用户可以访问的目录
+    
+    Raises:
+        RuntimeError: 如果目录不是当前用户所有的真实目录，或其他用户可以访问
+    """
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != _current_uid() or info.st_mode & 0o077:
+        raise RuntimeError(f"套接字目录必须是当前用户私有（权限0700）的目录: {directory}")
+
+
+def _owned_by_current_user(client: socket.socket, socket_path: str) -> bool:
+    """
+    对端守护进程是否属于当前用户
+    
+    支持 SO_PEERCRED 的平台核对对端进程的uid，否则核对套接字文件的属主。
+    """
+    if not hasattr(os, 'getuid'):
+        return True
+    if hasattr(socket, 'SO_PEERCRED'):
+        credentials = client.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        return struct.unpack('3i', credentials)[1] == os.getuid()
+    return os.stat(socket_path).st_uid == os.getuid()
+
+
+def _request(message: Dict[str, Any], socket_path: str, timeout: float) -> Optional[Dict[str, Any]]:
+    """发送一个请求并读取响应，守护进程不可用或不属于当前用户时返回None"""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            if not _owned_by_current_user(client, socket_path):
+                return None
+            client.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+            client.shutdown(socket.SHUT_WR)
+            
+            chunks = []
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    
+    try:
+        return json.loads(b''.join(chunks).decode('utf-8'))
+    except ValueError:
+        return None
+
+
+def forward(argv: Sequence[str], socket_path: Optional[str] = None, timeout: float = _CLIENT_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    把一次命令行调用转发给守护进程
+    
+    Args:
+        argv: 子命令及其参数，如 ['stationarity', '-c', '0.5']
+        socket_path: 套接字路径，默认为 default_socket_path()
+        timeout: 等待响应的超时（秒）
+    
+    Returns:
+        Dict: 包含 exit_code、stdout 和 stderr 的响应；守护进程未运行或通信失败时为None，
+        调用方应回退为在当前进程中执行
+    """
+    response = _request({'argv': list(argv)}, socket_path or default_socket_path(), timeout)
+    if response is None or 'exit_code' not in response:
+        return None
+    return response
+
+
+def ping(socket_path: Optional[str] = None, timeout: float = 1.0) -> Optional[int]:
+    """
+    检查守护进程是否在运行
+    
+    Returns:
+        Optional[int]: 守护进程的PID，未运行时为None
+    """
+    response = _request({'command': 'ping'}, socket_path or default_socket_path(), timeout)
+    return None if response is None else response.get('pid')
+
+
+def stop(socket_path: Optional[str] = None, timeout: float = 1.0) -> Optional[int]:
+    """
+    停止守护进程
+    
+    Returns:
+        Optional[int]: 被停止的守护进程的PID，未运行时为None
+    """
+    response = _request({'command': 'stop'}, socket_path or default_socket_path(), timeout)
+    return None if response is None else response.get('pid')
+
+
+def launch(argv: Optional[List[str]] = None) -> None:
+    """
+    命令行入口
+    
+    守护进程在运行且子命令可以转发时，由守护进程执行并原样输出结果和退出码；
+    否则导入 tsdiag.cli 在当前进程中执行。
+    """
+    args = sys.argv[1:] if argv is None else list(argv)
+    
+    if args and args[0] in FORWARDED_COMMANDS and not os.environ.get(NO_DAEMON_ENV):
+        response = forward(args)
+        if response is not None:
+            sys.stdout.write(response['stdout'])
+            sys.stdout.flush()
+            sys.stderr.write(response['stderr'])
+            sys.exit(response['exit_code'])
+    
+    from .cli import main
+    main(args=args, prog_name='tsdiag')
+
+
+def _run_command(argv: List[str]) -> Dict[str, Any]:
+    """在守护进程中执行一次命令行调用，捕获输出和退出码"""
+    from .cli import main
+    
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            main.main(args=argv, prog_name='tsdiag')
+            exit_code = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                exit_code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+    
+    return {'exit_code': exit_code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+class DaemonServer:
+    """
+    守护进程服务端
+    
+    按顺序逐个处理连接：检验本身只需要毫秒级时间，顺序处理也避免了
+    重定向标准输出时的线程竞争。读取请求有 _READ_TIMEOUT 的总时限，
+    连接后不发送请求的客户端不会长时间阻塞其他连接；处理请求时的任何异常
+    都只作为该请求的错误响应返回，守护进程继续服务。
+    
+    Examples:
+        >>> server = DaemonServer('/tmp/tsdiag.sock')
+        >>> server.serve_forever()  # 直到收到stop请求
+    """
+    
+    def __init__(self, socket_path: Optional[str] = None, cache_size: int = 4096):
+        """
+        绑定套接字，预先导入分析模块并启用缓存
+        
+        Args:
+            socket_path: 套接字路径，默认为 default_socket_path()
+            cache_size: 进程内检验结果缓存的条目数，0表示不启用
+        
+        Raises:
+            OSError: 如果当前平台不支持Unix域套接字
+            RuntimeError: 如果已有守护进程在该路径上运行，或默认的私有套接字目录
+                被其他用户占用或权限过宽
+            ValueError: 如果缓存条目数为负数
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError("当前平台不支持Unix域套接字")
+        if cache_size < 0:
+            raise ValueError("cache_size不能为负数")
+        
+        self.socket_path = socket_path or default_socket_path()
+        self._stopped = False
+        
+        if os.path.dirname(self.socket_path) == _fallback_directory():
+            _ensure_private_directory(_fallback_directory())
+        
+        if os.path.exists(self.socket_path):
+            if ping(self.socket_path) is not None:
+                raise RuntimeError(f"守护进程已在运行: {self.socket_path}")
+            # 上一次异常退出留下的套接字文件
+            os.unlink(self.socket_path)
+        
+        # 预热：导入命令行和分析模块，后续请求不再有导入开销
+        from . import cli, stationarity, invertibility  # noqa: F401
+        if cache_size:
+            from .cache import enable_cache
+            enable_cache(max_entries=cache_size)
+        
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self._socket.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        self._socket.listen(64)
+    
+    def serve_forever(self) -> None:
+        """处理请求直到收到stop请求，退出时删除套接字文件"""
+        try:
+            while not self._stopped:
+                connection, _ = self._socket.accept()
+                with connection:
+                    self._handle(connection)
+        finally:
+            self.close()
+    
+    def close(self) -> None:
+        """关闭并删除套接字"""
+        self._socket.close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+    
+    def _handle(self, connection: socket.socket) -> None:
+        """读取一个请求并写回响应"""
+        try:
+            response = self._dispatch(json.loads(self._read_request(connection).decode('utf-8')))
+        except (OSError, ValueError) as e:
+            response = {'exit_code': 2, 'stdout': '', 'stderr': f"错误: 无效的请求: {e}\n"}
+        except Exception as e:
+            response = {'exit_code': 2, 'stdout': '', 'stderr': f"错误: 处理请求失败: {e}\n"}
+        
+        try:
+            connection.settimeout(_READ_TIMEOUT)
+            connection.sendall(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _read_request(connection: socket.socket) -> bytes:
+        """
+        在 _READ_TIMEOUT 的总时限内读取一行请求
+        
+        Raises:
+            OSError: 如果超时或连接出错
+        """
+        deadline = time.monotonic() + _READ_TIMEOUT
+        chunks, size = [], 0
+        while size <= _MAX_REQUEST_BYTES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("读取请求超时")
+            connection.settimeout(remaining)
+            chunk = connection.recv(65536)
+            chunks.append(chunk)
+            if not chunk or chunk.endswith(b'\n'):
+                break
+            size += len(chunk)
+        return b''.join(chunks)
+    
+    def _dispatch(self, request: Any) -> Dict[str, Any]:
+        """
+        执行请求
+        
+        Raises:
+            ValueError: 如果请求不是JSON对象或子命令不能转发
+        """
+        if not isinstance(request, dict):
+            raise ValueError("请求必须是JSON对象")
+        
+        command = request.get('command')
+        if command == 'ping':
+            return {'status': 'ok', 'pid': os.getpid()}
+        if command == 'stop':
+            self._stopped = True
+            return {'status': 'stopping', 'pid': os.getpid()}
+        
+        argv = request.get('argv')
+        if not isinstance(argv, list) or not argv or argv[0] not in FORWARDED_COMMANDS:
+            raise ValueError(f"只能转发以下子命令: {', '.join(FORWARDED_COMMANDS)}")
+        return _run_command([str(arg) for arg in argv])
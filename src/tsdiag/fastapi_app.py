@@ -4,22 +4,55 @@
 提供REST API接口来进行时间序列模型分析。
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any, Union
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, validator
+from typing import List, Optional, Dict, Any, Union, AsyncIterator, Tuple
 import numpy as np
 from datetime import datetime
 
+from .cache import enable_cache, disable_cache, get_cache
 from .api import (
     TSModelDiagnostic,
     quick_ar_check,
     quick_ma_check,
     quick_arma_check,
     analyze_model_stability,
-    batch_model_analysis
+    batch_model_analysis,
+    _PARALLEL_BACKENDS
 )
+from .stream import check_models
+from .wire import (
+    JSON_MEDIA_TYPE,
+    NPY_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    MSGPACK_AVAILABLE,
+    media_type,
+    negotiate,
+    decode_npy,
+    decode_msgpack,
+    check_matrices,
+    records_to_results,
+    matrices_to_models,
+    encode_npy,
+    encode_msgpack
+)
+
+
+# /api/v2/batch/analyze 每块的默认和最大模型数
+_STREAM_CHUNK_SIZE = 1024
+_MAX_STREAM_CHUNK_SIZE = 65536
+
+_SUMMARY_KEYS = ("total_models", "valid_models", "error_models", "ar_stationary_count", "ma_invertible_count")
 
 
 # Pydantic 数据模型
@@ -154,13 +187,105 @@ class BatchAnalysisResponse(BaseModel):
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
 
 
+def _env_number(name: str, default=None, cast=int):
+    """读取数值型环境变量，未设置时返回默认值"""
+    value = os.environ.get(name)
+    return cast(value) if value not in (None, "") else default
+
+
+def _cache_options() -> Optional[Dict[str, Any]]:
+    """按环境变量读取 enable_cache 的参数，未启用缓存时返回None"""
+    if os.environ.get("CACHE_ENABLED", "false").lower() != "true":
+        return None
+    return {
+        "max_entries": _env_number("CACHE_MAX_ENTRIES", 10000),
+        "path": os.environ.get("CACHE_PATH") or None,
+        "ttl": _env_number("CACHE_TTL_SECONDS", None, float),
+        "max_disk_entries": _env_number("CACHE_MAX_DISK_ENTRIES", None),
+        "warm_up": _env_number("CACHE_WARMUP_ENTRIES", 0),
+    }
+
+
+def _init_batch_worker(cache_options: Optional[Dict[str, Any]]) -> None:
+    """批量分析子进程的初始化函数：spawn启动的子进程不继承父进程的缓存，按相同配置重新启用"""
+    if cache_options is not None:
+        enable_cache(**cache_options)
+
+
+def _create_executors(cache_options: Optional[Dict[str, Any]] = None):
+    """
+    按环境变量创建执行器
+    
+    单个模型的检验在线程池中执行；批量分析使用独立的执行器（默认为进程池），
+    大批量计算不会占用单模型请求的线程，也不会因GIL拖慢事件循环。
+    进程池的子进程启动时按 cache_options 启用缓存，磁盘缓存在各进程之间共享。
+    
+    - EXECUTOR_WORKERS: 单模型检验的线程数，默认与 ThreadPoolExecutor 相同
+    - BATCH_EXECUTOR: 批量分析的执行方式，'processes'（默认）或 'threads'
+    - BATCH_EXECUTOR_WORKERS: 批量分析的进程数或线程数，默认为CPU核心数
+    
+    Args:
+        cache_options: enable_cache 的参数，None表示子进程不启用缓存
+    
+    Returns:
+        Tuple: (单模型执行器, 批量分析执行器)
+        
+    Raises:
+        ValueError: 如果执行方式未知或工作者数量不是正整数
+    """
+    workers = _env_number("EXECUTOR_WORKERS", None)
+    batch_workers = _env_number("BATCH_EXECUTOR_WORKERS", os.cpu_count() or 1)
+    batch_backend = os.environ.get("BATCH_EXECUTOR") or "processes"
+    
+    if batch_backend not in _PARALLEL_BACKENDS:
+        raise ValueError(f"未知的批量执行方式: {batch_backend}，可选值为 {', '.join(_PARALLEL_BACKENDS)}")
+    for name, value in (("EXECUTOR_WORKERS", workers), ("BATCH_EXECUTOR_WORKERS", batch_workers)):
+        if value is not None and value < 1:
+            raise ValueError(f"{name}必须是正整数")
+    
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tsdiag")
+    if batch_backend == "threads":
+        batch_executor = ThreadPoolExecutor(max_workers=batch_workers, thread_name_prefix="tsdiag-batch")
+    else:
+        # 服务进程中已有事件循环和线程，使用spawn启动子进程而不是fork
+        batch_executor = ProcessPoolExecutor(
+            max_workers=batch_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_batch_worker,
+            initargs=(cache_options,)
+        )
+    return executor, batch_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：按环境变量启用结果缓存并创建执行器，关闭时释放"""
+    cache_options = _cache_options()
+    
+    if cache_options is not None:
+        enable_cache(**cache_options)
+    
+    app.state.executor, app.state.batch_executor = _create_executors(cache_options)
+    
+    try:
+        yield
+    finally:
+        app.state.executor.shutdown(wait=True)
+        app.state.batch_executor.shutdown(wait=True)
+        app.state.executor = app.state.batch_executor = None
+        
+        if cache_options is not None:
+            disable_cache()
+
+
 # 创建FastAPI应用
 app = FastAPI(
     title="时间序列模型分析与诊断API",
     description="提供AR模型平稳性检验和MA模型可逆性检验的REST API服务",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # 添加CORS中间件
@@ -182,6 +307,23 @@ def convert_root_info(root_info):
     )
 
 
+async def _run_in_executor(func, *args, batch: bool = False, **kwargs):
+    """
+    在执行器中运行同步的计算，不阻塞事件循环
+    
+    Args:
+        func: 同步函数；批量执行器为进程池时必须可以被pickle
+        batch: 是否使用批量分析执行器
+        
+    Returns:
+        func 的返回值
+    """
+    # 未经过生命周期启动（如直接调用）时使用事件循环的默认执行器
+    executor: Optional[Executor] = getattr(app.state, "batch_executor" if batch else "executor", None)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """根路径，返回API文档链接"""
@@ -217,6 +359,17 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+@app.get("/api/v1/cache/stats")
+async def cache_stats():
+    """结果缓存统计信息"""
+    cache = get_cache()
+    return {
+        "enabled": cache is not None,
+        "stats": cache.stats() if cache is not None else None,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @app.post("/api/v1/ar/check", response_model=StationarityResponse)
 async def check_ar_stationarity(request: ARModelRequest):
     """
@@ -227,7 +380,7 @@ async def check_ar_stationarity(request: ARModelRequest):
     """
     try:
         diagnostic = TSModelDiagnostic()
-        result = diagnostic.check_ar_model(request.coefficients, verbose=request.verbose)
+        result = await _run_in_executor(diagnostic.check_ar_model, request.coefficients, verbose=request.verbose)
         
         return StationarityResponse(
             is_stationary=result.is_stationary,
@@ -249,7 +402,7 @@ async def check_ma_invertibility(request: MAModelRequest):
     """
     try:
         diagnostic = TSModelDiagnostic()
-        result = diagnostic.check_ma_model(request.coefficients, verbose=request.verbose)
+        result = await _run_in_executor(diagnostic.check_ma_model, request.coefficients, verbose=request.verbose)
         
         return InvertibilityResponse(
             is_invertible=result.is_invertible,
@@ -272,7 +425,8 @@ async def check_arma_model(request: ARMAModelRequest):
     """
     try:
         diagnostic = TSModelDiagnostic()
-        ar_result, ma_result = diagnostic.check_arma_model(
+        ar_result, ma_result = await _run_in_executor(
+            diagnostic.check_arma_model,
             request.ar_coefficients, 
             request.ma_coefficients, 
             verbose=request.verbose
@@ -305,7 +459,7 @@ async def quick_ar_stationarity(request: ARModelRequest):
     - **coefficients**: AR系数列表
     """
     try:
-        result = quick_ar_check(request.coefficients)
+        result = await _run_in_executor(quick_ar_check, request.coefficients)
         return QuickCheckResponse(result=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"检验失败: {str(e)}")
@@ -319,7 +473,7 @@ async def quick_ma_invertibility(request: MAModelRequest):
     - **coefficients**: MA系数列表
     """
     try:
-        result = quick_ma_check(request.coefficients)
+        result = await _run_in_executor(quick_ma_check, request.coefficients)
         return QuickCheckResponse(result=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"检验失败: {str(e)}")
@@ -334,7 +488,8 @@ async def quick_arma_check_endpoint(request: ARMAModelRequest):
     - **ma_coefficients**: MA系数列表
     """
     try:
-        ar_stationary, ma_invertible = quick_arma_check(
+        ar_stationary, ma_invertible = await _run_in_executor(
+            quick_arma_check,
             request.ar_coefficients, 
             request.ma_coefficients
         )
@@ -356,7 +511,8 @@ async def analyze_stability(request: ARMAModelRequest):
     - **ma_coefficients**: MA系数列表
     """
     try:
-        analysis = analyze_model_stability(
+        analysis = await _run_in_executor(
+            analyze_model_stability,
             ar_coefficients=request.ar_coefficients,
             ma_coefficients=request.ma_coefficients
         )
@@ -365,52 +521,328 @@ async def analyze_stability(request: ARMAModelRequest):
         raise HTTPException(status_code=400, detail=f"分析失败: {str(e)}")
 
 
-@app.post("/api/v1/batch/analyze", response_model=BatchAnalysisResponse)
-async def batch_analyze(request: BatchAnalysisRequest):
+# 批量分析的模型：JSON请求为模型字典列表，二进制请求为 {'ar'/'ma': (N, p) 系数矩阵}
+BatchModels = Union[List[Dict[str, Optional[List[float]]]], Dict[str, np.ndarray]]
+
+_NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_BINARY_RESPONSES = {
+    200: {"content": {NPY_MEDIA_TYPE: {}, MSGPACK_MEDIA_TYPE: {}}, "description": "按 Accept 请求头选择响应格式"}
+}
+
+_BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            JSON_MEDIA_TYPE: {"schema": {"type": "object", "description": "BatchAnalysisRequest: models 和可选的 model_names"}},
+            NPY_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary", "description": "(N, p) 系数矩阵，类型由查询参数kind指定"}},
+            MSGPACK_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary", "description": "包含ar/ma系数矩阵和可选model_names的映射"}},
+        }
+    }
+}
+
+
+def _model_count(models: BatchModels) -> int:
+    """批量请求中的模型数"""
+    if isinstance(models, dict):
+        return len(next(iter(models.values())))
+    return len(models)
+
+
+def _negotiate(request: Request, offers: Tuple[str, ...]) -> str:
+    """按 Accept 请求头选择响应格式，未安装msgpack时不提供MessagePack"""
+    if not MSGPACK_AVAILABLE:
+        offers = tuple(offer for offer in offers if offer != MSGPACK_MEDIA_TYPE)
+    
+    accepted = negotiate(request.headers.get("accept"), offers)
+    if accepted is None:
+        raise HTTPException(status_code=406, detail=f"不支持请求的响应格式，可选格式为 {', '.join(offers)}")
+    return accepted
+
+
+async def _read_batch_request(request: Request, kind: str) -> Tuple[BatchModels, Optional[List[str]]]:
+    """
+    按 Content-Type 解析批量请求体
+    
+    二进制请求直接解码为NumPy系数矩阵，不经过pydantic逐元素校验。
+    解码和JSON校验在执行器中进行，大请求体不会阻塞事件循环。
+    
+    Args:
+        request: HTTP请求
+        kind: application/x-npy 请求中系数矩阵的模型类型
+        
+    Returns:
+        Tuple: (模型, 模型名称或None)
+        
+    Raises:
+        HTTPException: 请求体无法解析时为400，格式不支持时为415
+        RequestValidationError: JSON请求体校验失败
+    """
+    content_type = media_type(request.headers.get("content-type"))
+    body = await request.body()
+    return await _run_in_executor(_parse_batch_body, content_type, body, kind)
+
+
+def _parse_batch_body(content_type: str, body: bytes, kind: str) -> Tuple[BatchModels, Optional[List[str]]]:
+    """解码并校验批量请求体，在执行器中运行，异常见 _read_batch_request"""
+    try:
+        if content_type == NPY_MEDIA_TYPE:
+            return {kind: decode_npy(body)}, None
+        if content_type == MSGPACK_MEDIA_TYPE:
+            return decode_msgpack(body)
+    except ImportError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"请求体解析失败: {str(e)}")
+    
+    if content_type != JSON_MEDIA_TYPE and not content_type.endswith("+json"):
+        raise HTTPException(
+            status_code=415,
+            detail=f"不支持的请求格式: {content_type}，可选格式为 {JSON_MEDIA_TYPE}、{NPY_MEDIA_TYPE}、{MSGPACK_MEDIA_TYPE}"
+        )
+    
+    try:
+        batch_request = BatchAnalysisRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False), body=body)
+    
+    models = [{'ar': model.ar, 'ma': model.ma} for model in batch_request.models]
+    return models, batch_request.model_names
+
+
+def _encode_batch(models: BatchModels, model_names: Optional[List[str]], accepted: str) -> bytes:
+    """检验并编码为二进制响应，在批量分析执行器中运行"""
+    if isinstance(models, dict):
+        results = check_matrices(models, model_names)
+    else:
+        results = records_to_results(check_models(models))
+    
+    if accepted == NPY_MEDIA_TYPE:
+        return encode_npy(results)
+    return encode_msgpack(results, model_names)
+
+
+def _encode_batch_response(results: List[Dict[str, Any]], summary: Dict[str, Any]) -> bytes:
+    """校验并序列化 BatchAnalysisResponse，在执行器中运行"""
+    return BatchAnalysisResponse(results=results, summary=summary).model_dump_json().encode("utf-8")
+
+
+def _batch_analysis(models: BatchModels, model_names: Optional[List[str]]):
+    """批量分析并计算摘要，在批量分析执行器中运行"""
+    if isinstance(models, dict):
+        models = matrices_to_models(models)
+    else:
+        models = [{key: value for key, value in model.items() if value is not None} for model in models]
+    
+    results = batch_model_analysis(models, model_names)
+    
+    # 计算摘要信息
+    summary = {
+        "total_models": len(results),
+        "valid_models": 0,
+        "error_models": 0,
+        "ar_stationary_count": 0,
+        "ma_invertible_count": 0
+    }
+    
+    for result in results:
+        if 'error' in result:
+            summary["error_models"] += 1
+        else:
+            if 'overall' in result and result['overall'].get('model_valid', False):
+                summary["valid_models"] += 1
+            if 'ar' in result and result['ar'].get('is_stationary', False):
+                summary["ar_stationary_count"] += 1
+            if 'ma' in result and result['ma'].get('is_invertible', False):
+                summary["ma_invertible_count"] += 1
+    
+    return results, summary
+
+
+@app.post(
+    "/api/v1/batch/analyze",
+    response_model=BatchAnalysisResponse,
+    responses=_BINARY_RESPONSES,
+    openapi_extra=_BATCH_REQUEST_BODY
+)
+async def batch_analyze(
+    request: Request,
+    kind: str = Query("ar", pattern="^(ar|ma)$", description="application/x-npy 请求中系数矩阵的模型类型")
+):
     """
     批量模型分析
     
     - **models**: 模型列表，每个模型包含ar和/或ma系数
     - **model_names**: 模型名称列表（可选）
+    
+    请求体也可以是 application/x-npy 系数矩阵或 application/msgpack，
+    Accept 为这两种格式时返回 RESULT_DTYPE 结构化数组（见 tsdiag.wire）。
     """
+    accepted = _negotiate(request, (JSON_MEDIA_TYPE, NPY_MEDIA_TYPE, MSGPACK_MEDIA_TYPE))
+    models, model_names = await _read_batch_request(request, kind)
+    
     try:
-        # 转换请求格式
-        models = []
-        for model in request.models:
-            model_dict = {}
-            if model.ar is not None:
-                model_dict['ar'] = model.ar
-            if model.ma is not None:
-                model_dict['ma'] = model.ma
-            models.append(model_dict)
-        
-        results = batch_model_analysis(models, request.model_names)
-        
-        # 计算摘要信息
-        summary = {
-            "total_models": len(results),
-            "valid_models": 0,
-            "error_models": 0,
-            "ar_stationary_count": 0,
-            "ma_invertible_count": 0
-        }
+        if accepted != JSON_MEDIA_TYPE:
+            content = await _run_in_executor(_encode_batch, models, model_names, accepted, batch=True)
+            return Response(content=content, media_type=accepted)
         
-        for result in results:
-            if 'error' in result:
-                summary["error_models"] += 1
-            else:
-                if 'overall' in result and result['overall'].get('model_valid', False):
-                    summary["valid_models"] += 1
-                if 'ar' in result and result['ar'].get('is_stationary', False):
-                    summary["ar_stationary_count"] += 1
-                if 'ma' in result and result['ma'].get('is_invertible', False):
-                    summary["ma_invertible_count"] += 1
+        results, summary = await _run_in_executor(
+            _batch_analysis, models, model_names, batch=True
+        )
         
-        return BatchAnalysisResponse(results=results, summary=summary)
+        # 大批量结果的序列化同样不在事件循环中进行
+        content = await _run_in_executor(_encode_batch_response, results, summary)
+        return Response(content=content, media_type=JSON_MEDIA_TYPE)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"批量分析失败: {str(e)}")
 
 
+def _check_chunk(
+    models: BatchModels,
+    model_names: Optional[List[str]],
+    start: int
+) -> Tuple[str, Dict[str, int]]:
+    """
+    向量化检验一块模型，在批量分析执行器中运行
+    
+    Args:
+        models: 本块的模型
+        model_names: 本块的模型名称，None表示使用默认名称
+        start: 本块第一个模型在请求中的位置
+        
+    Returns:
+        Tuple: (本块的NDJSON文本, 本块的摘要计数)
+    """
+    if isinstance(models, dict):
+        models = matrices_to_models(models)
+    
+    counts = dict.fromkeys(_SUMMARY_KEYS, 0)
+    counts["total_models"] = len(models)
+    lines = []
+    
+    for offset, outcome in enumerate(check_models(models)):
+        index = start + offset
+        name = model_names[offset] if model_names is not None else f"Model_{index + 1}"
+        if 'error' in outcome:
+            counts["error_models"] += 1
+        else:
+            counts["valid_models"] += outcome['model_valid']
+            counts["ar_stationary_count"] += outcome.get('is_stationary', False)
+            counts["ma_invertible_count"] += outcome.get('is_invertible', False)
+        record = dict({"index": index, "model_name": name}, **outcome)
+        lines.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+    
+    return '\n'.join(lines) + '\n', counts
+
+
+def _failed_chunk(
+    model_names: Optional[List[str]],
+    start: int,
+    count: int,
+    error: Exception
+) -> Tuple[str, Dict[str, int]]:
+    """一块模型计算失败时，为其中每个模型生成错误记录，格式与 _check_chunk 相同"""
+    counts = dict.fromkeys(_SUMMARY_KEYS, 0)
+    counts["total_models"] = counts["error_models"] = count
+    lines = []
+    
+    for offset in range(count):
+        index = start + offset
+        name = model_names[offset] if model_names is not None else f"Model_{index + 1}"
+        record = {"index": index, "model_name": name, "error": f"批量分析失败: {error}"}
+        lines.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+    
+    return '\n'.join(lines) + '\n', counts
+
+
+async def _stream_batch(
+    models: BatchModels,
+    model_names: Optional[List[str]],
+    chunk_size: int
+) -> AsyncIterator[str]:
+    """
+    逐块计算并产出NDJSON，计算下一块的同时发送当前块，最后产出摘要记录
+    
+    某一块计算失败时，该块的每个模型输出一条错误记录并计入 error_models，
+    其余块照常计算，响应总是以摘要记录结束。
+    """
+    summary = dict.fromkeys(_SUMMARY_KEYS, 0)
+    total = _model_count(models)
+    
+    def chunk_names(start: int) -> Optional[List[str]]:
+        return model_names[start:start + chunk_size] if model_names is not None else None
+    
+    def submit(start: int):
+        stop = start + chunk_size
+        if isinstance(models, dict):
+            chunk = {key: matrix[start:stop] for key, matrix in models.items()}
+        else:
+            chunk = models[start:stop]
+        return asyncio.ensure_future(
+            _run_in_executor(_check_chunk, chunk, chunk_names(start), start, batch=True)
+        )
+    
+    starts = range(0, total, chunk_size)
+    pending = submit(starts[0]) if starts else None
+    try:
+        for position, start in enumerate(starts):
+            try:
+                text, counts = await pending
+            except Exception as e:
+                text, counts = _failed_chunk(chunk_names(start), start, min(chunk_size, total - start), e)
+            pending = submit(starts[position + 1]) if position + 1 < len(starts) else None
+            for key, value in counts.items():
+                summary[key] += value
+            yield text
+    finally:
+        # 客户端提前断开时取消尚未开始的计算
+        if pending is not None:
+            pending.cancel()
+    
+    record = {"summary": summary, "timestamp": datetime.now().isoformat()}
+    yield json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+@app.post("/api/v2/batch/analyze", responses=_BINARY_RESPONSES, openapi_extra=_BATCH_REQUEST_BODY)
+async def batch_analyze_stream(
+    request: Request,
+    chunk_size: int = Query(_STREAM_CHUNK_SIZE, ge=1, le=_MAX_STREAM_CHUNK_SIZE, description="每块的模型数"),
+    kind: str = Query("ar", pattern="^(ar|ma)$", description="application/x-npy 请求中系数矩阵的模型类型")
+):
+    """
+    批量模型分析（NDJSON流式响应）
+    
+    模型按块做向量化检验，每块算完立即发送，服务端内存与块大小有关而与批量大小无关。
+    响应为 application/x-ndjson，每行一个JSON对象：
+    
+    - 每个模型一行，包含 index、model_name、is_stationary/stability_margin、
+      is_invertible/invertibility_margin、model_valid 和 risk_level，出错时为 error
+    - 最后一行为 {"summary": {...}, "timestamp": ...}，摘要字段与 /api/v1/batch/analyze 相同，
+      valid_models 统计所有部分都通过检验的模型
+    
+    - **models**: 模型列表，每个模型包含ar和/或ma系数
+    - **model_names**: 模型名称列表（可选）
+    - **chunk_size**: 每块的模型数（查询参数）
+    
+    请求体也可以是 application/x-npy 系数矩阵或 application/msgpack；
+    Accept 为这两种格式时整体返回 RESULT_DTYPE 结构化数组而不是NDJSON。
+    """
+    accepted = _negotiate(request, (_NDJSON_MEDIA_TYPE, JSON_MEDIA_TYPE, NPY_MEDIA_TYPE, MSGPACK_MEDIA_TYPE))
+    models, model_names = await _read_batch_request(request, kind)
+    
+    if accepted in (NPY_MEDIA_TYPE, MSGPACK_MEDIA_TYPE):
+        try:
+            content = await _run_in_executor(_encode_batch, models, model_names, accepted, batch=True)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"批量分析失败: {str(e)}")
+        return Response(content=content, media_type=accepted)
+    
+    return StreamingResponse(
+        _stream_batch(models, model_names, chunk_size),
+        media_type=_NDJSON_MEDIA_TYPE
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
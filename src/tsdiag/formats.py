@@ -0,0 +1,394 @@
+"""
+批量模型的文件读写
+
+支持以流式方式读取 JSON Lines、CSV、.npy 和 Parquet（需要pyarrow）格式的模型系数，
+并将分析结果写出为 JSON Lines 或 CSV。
+
+命令行在启动时导入本模块，NumPy和求根代码只在实际读取或检验数据时才导入。
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+from contextlib import nullcontext
+from typing import List, Dict, Any, Optional, Iterator, NamedTuple, TextIO, Union
+
+
+# 支持的输入和输出格式，npy输出只用于npy输入的同阶批量检验
+INPUT_FORMATS = ('jsonl', 'csv', 'npy', 'parquet')
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+# npy输出的结构化类型，error 标记包含非有限数值而未参与检验的行
+NPY_RESULT_DTYPE = [('flag', '?'), ('min_modulus', '<f8'), ('error', '?')]
+
+# 按文件扩展名推断输入格式
+_EXTENSIONS = {
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.json': 'jsonl',
+    '.csv': 'csv',
+    '.npy': 'npy',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+# 只有系数时可指定的模型类型，同时也是模型字典的键
+_KINDS = ('ar', 'ma')
+
+# CSV单元格内系数的分隔符
+_CELL_SEPARATOR = re.compile(r'[\s,;]+')
+
+# CSV输出的列
+CSV_COLUMNS = [
+    'model_index', 'model_name',
+    'is_stationary', 'stability_margin', 'ar_risk_level',
+    'is_invertible', 'invertibility_margin', 'ma_risk_level',
+    'model_valid', 'error',
+]
+
+
+class ModelRecord(NamedTuple):
+    """从文件中读取的一个模型，解析失败时 model 为空字典且 error 为错误信息"""
+    name: Optional[str]
+    model: Dict[str, Any]
+    error: Optional[str] = None
+
+
+def detect_format(path: str) -> str:
+    """
+    根据文件扩展名推断输入格式
+    
+    Args:
+        path: 文件路径，'-' 表示标准输入（按JSON Lines处理）
+    
+    Returns:
+        str: 'jsonl'、'csv'、'npy' 或 'parquet'
+    
+    Raises:
+        ValueError: 如果无法根据扩展名推断格式
+    """
+    if path == '-':
+        return 'jsonl'
+    
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"无法根据扩展名推断输入格式: {path}，请指定格式（{', '.join(INPUT_FORMATS)}）")
+    return _EXTENSIONS[extension]
+
+
+def read_models(
+    source: Union[str, TextIO],
+    input_format: Optional[str] = None,
+    kind: str = 'ar'
+) -> Iterator[ModelRecord]:
+    """
+    以流式方式读取模型
+    
+    - jsonl: 每行一个对象，形如 {"ar": [...], "ma": [...], "name": "m1"}
+    - csv: 表头包含 ar/ma 列时按列读取（单元格内系数以空格、逗号或分号分隔，
+      可选 name 列）；否则每行是一个模型的系数，模型类型由 kind 指定
+    - npy: 形状为 (N, p) 的系数矩阵，以内存映射方式打开并逐行读取，模型类型由 kind 指定
+    - parquet: 按记录批次读取 ar/ma 列表列和可选的 name 列
+    
+    Args:
+        source: 文件路径或已打开的文本流，'-' 表示标准输入
+        input_format: 输入格式，None表示根据扩展名推断
+        kind: 只有系数没有列名时的模型类型，'ar' 或 'ma'
+    
+    Returns:
+        Iterator[ModelRecord]: 按文件顺序产出的模型
+    
+    Raises:
+        ValueError: 如果格式或模型类型未知
+        ImportError: 如果读取Parquet但未安装pyarrow
+    """
+    if kind not in _KINDS:
+        raise ValueError(f"未知的模型类型: {kind}，可选值为 {', '.join(_KINDS)}")
+    
+    if input_format is None:
+        input_format = detect_format(source) if isinstance(source, str) else 'jsonl'
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"未知的输入格式: {input_format}，可选值为 {', '.join(INPUT_FORMATS)}")
+    
+    if input_format == 'npy':
+        if not isinstance(source, str) or source == '-':
+            raise ValueError("npy格式只支持从文件读取")
+        return _read_npy(source, kind)
+    if input_format == 'parquet':
+        if not isinstance(source, str) or source == '-':
+            raise ValueError("parquet格式只支持从文件读取")
+        return _read_parquet(source)
+    
+    reader = _read_jsonl if input_format == 'jsonl' else _read_csv
+    return reader(source, kind)
+
+
+def _open_text(source: Union[str, TextIO]):
+    """打开文本输入；传入的流由调用方负责关闭"""
+    if not isinstance(source, str):
+        return nullcontext(source)
+    if source == '-':
+        return nullcontext(sys.stdin)
+    return open(source, 'r', encoding='utf-8', newline='')
+
+
+def _read_jsonl(source: Union[str, TextIO], kind: str) -> Iterator[ModelRecord]:
+    """逐行读取JSON Lines，无法解析的行产出带错误信息的记录"""
+    with _open_text(source) as stream:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield ModelRecord(None, {}, f"第{line_number}行不是有效的JSON: {e}")
+                continue
+            
+            if isinstance(record, list):
+                # 只有系数的行按 kind 解释
+                yield ModelRecord(None, {kind: record})
+            elif isinstance(record, dict):
+                name = record.get('name')
+                yield ModelRecord(None if name is None else str(name), record)
+            else:
+                yield ModelRecord(None, {}, f"第{line_number}行必须是JSON对象或系数数组")
+
+
+def _parse_cell(cell: str) -> List[float]:
+    """解析CSV单元格中的系数"""
+    return [float(value) for value in _CELL_SEPARATOR.split(cell.strip()) if value]
+
+
+def _read_csv(source: Union[str, TextIO], kind: str) -> Iterator[ModelRecord]:
+    """逐行读取CSV，支持带 ar/ma 列名的表头和只有系数的行两种布局"""
+    with _open_text(source) as stream:
+        rows = csv.reader(stream)
+        header = None
+        
+        for line_number, row in enumerate(rows, 1):
+            if not row or all(not cell.strip() for cell in row):
+                continue
+            
+            cells = [cell.strip() for cell in row]
+            
+            if line_number == 1 and header is None:
+                lowered = [cell.lower() for cell in cells]
+                if 'ar' in lowered or 'ma' in lowered:
+                    header = lowered
+                    continue
+            
+            try:
+                if header is None:
+                    record = ModelRecord(None, {kind: [float(cell) for cell in cells if cell]})
+                else:
+                    values = dict(zip(header, cells))
+                    model = {key: _parse_cell(values[key]) for key in ('ar', 'ma') if values.get(key)}
+                    record = ModelRecord(values.get('name') or None, model)
+            except ValueError as e:
+                record = ModelRecord(None, {}, f"第{line_number}行包含非数值系数: {e}")
+            
+            yield record
+
+
+def _read_npy(path: str, kind: str) -> Iterator[ModelRecord]:
+    """
+    以内存映射方式逐行读取 (N, p) 系数矩阵
+    
+    每行转换为一个模型，供jsonl/csv输出逐个分析；只有 check_npy 按窗口做同阶批量检验。
+    """
+    import numpy as np
+    
+    matrix = np.load(path, mmap_mode='r')
+    if matrix.ndim != 2:
+        raise ValueError(f"npy文件必须是二维系数矩阵，实际形状为 {matrix.shape}")
+    
+    for row in matrix:
+        yield ModelRecord(None, {kind: row.tolist()})
+
+
+def check_npy(
+    input_path: str,
+    output_path: str,
+    kind: str = 'ar',
+    window: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    对npy系数矩阵做同阶批量检验，结果写入内存映射的npy文件
+    
+    输入以内存映射方式打开并按窗口检验，输出文件的第i个元素对应输入的第i行，
+    类型为 NPY_RESULT_DTYPE（flag, min_modulus, error）。包含NaN或无穷大的行不参与检验，
+    记为错误（error 为True、flag 为False、min_modulus 为NaN）。整个过程不把输入或输出
+    完整读入内存，出错时删除未写完的输出文件。
+    
+    Args:
+        input_path: 形状为 (N, p) 的系数矩阵文件
+        output_path: 输出文件路径
+        kind: 模型类型，'ar' 或 'ma'
+        window: 每个窗口的行数，None表示使用默认窗口
+    
+    Returns:
+        Dict: 与 ResultWriter.counts 相同的统计
+    
+    Raises:
+        ValueError: 如果模型类型未知、窗口不是正整数或输入不是二维数值矩阵
+    """
+    if kind not in _KINDS:
+        raise ValueError(f"未知的模型类型: {kind}，可选值为 {', '.join(_KINDS)}")
+    
+    import numpy as np
+    from .core import stationarity_check_batch, invertibility_check_batch, _default_window
+    
+    matrix = np.load(input_path, mmap_mode='r')
+    if matrix.ndim != 2:
+        raise ValueError(f"npy文件必须是二维系数矩阵，实际形状为 {matrix.shape}")
+    if matrix.dtype.kind not in 'biuf':
+        raise ValueError(f"npy文件必须是实数系数矩阵，实际类型为 {matrix.dtype}")
+    
+    window = _default_window(matrix.shape[1]) if window is None else window
+    if window < 1:
+        raise ValueError("window必须是正整数")
+    
+    batch_check = stationarity_check_batch if kind == 'ar' else invertibility_check_batch
+    out = np.lib.format.open_memmap(output_path, mode='w+', dtype=NPY_RESULT_DTYPE, shape=(matrix.shape[0],))
+    try:
+        for start in range(0, len(out), window):
+            block = np.asarray(matrix[start:start + window], dtype=float)
+            invalid = ~np.isfinite(block).all(axis=1)
+            part = out[start:start + len(block)]
+            
+            # 与 wire.check_matrices 相同，无效行先置零参与检验，再覆盖为错误结果
+            batch_check(np.where(invalid[:, None], 0.0, block), window=len(block), out=part)
+            part['flag'][invalid] = False
+            part['min_modulus'][invalid] = np.nan
+            part['error'] = invalid
+        out.flush()
+    except BaseException:
+        del out
+        os.remove(output_path)
+        raise
+    
+    errors = int(np.count_nonzero(out['error']))
+    passed = int(np.count_nonzero(out['flag']))
+    return {'total': len(out), 'passed': passed, 'failed': len(out) - passed - errors, 'errors': errors}
+
+
+def exit_code(counts: Dict[str, int]) -> int:
+    """汇总退出码：存在错误为2，存在未通过的模型为1，否则为0"""
+    if counts['errors']:
+        return 2
+    return 1 if counts['failed'] else 0
+
+
+def _read_parquet(path: str) -> Iterator[ModelRecord]:
+    """按记录批次读取Parquet中的模型"""
+    # 只在需要时导入pyarrow，避免拖慢其他格式的启动
+    from .arrow import iter_parquet_models
+    
+    for name, model in iter_parquet_models(path):
+        yield ModelRecord(name, model)
+
+
+def _result_status(result: Dict[str, Any]) -> Optional[bool]:
+    """模型是否通过全部检验，出错时为None"""
+    if 'error' in result:
+        return None
+    if 'ar' in result and not result['ar']['is_stationary']:
+        return False
+    if 'ma' in result and not result['ma']['is_invertible']:
+        return False
+    return True
+
+
+def flatten_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将 batch_model_analysis 的单个结果展平为 CSV_COLUMNS 中的列
+    
+    Args:
+        result: 单个模型的分析结果
+    
+    Returns:
+        Dict: 列名到取值的映射，缺少的部分为空字符串
+    """
+    row = dict.fromkeys(CSV_COLUMNS, '')
+    row['model_index'] = result.get('model_index', '')
+    row['model_name'] = result.get('model_name', '')
+    row['error'] = result.get('error', '')
+    
+    if 'ar' in result:
+        row['is_stationary'] = result['ar']['is_stationary']
+        row['stability_margin'] = result['ar']['stability_margin']
+        row['ar_risk_level'] = result['ar']['risk_level']
+    if 'ma' in result:
+        row['is_invertible'] = result['ma']['is_invertible']
+        row['invertibility_margin'] = result['ma']['invertibility_margin']
+        row['ma_risk_level'] = result['ma']['risk_level']
+    if 'overall' in result:
+        row['model_valid'] = result['overall']['model_valid']
+    
+    return row
+
+
+class ResultWriter:
+    """
+    逐个写出分析结果，并统计通过、未通过和出错的模型数
+    
+    Examples:
+        >>> with ResultWriter(sys.stdout, 'csv') as writer:
+        ...     for result in iter_model_analysis(models):
+        ...         writer.write(result)
+    """
+    
+    def __init__(self, stream: TextIO, output_format: str = 'jsonl'):
+        """
+        Args:
+            stream: 输出文本流
+            output_format: 输出格式，'jsonl' 或 'csv'
+        
+        Raises:
+            ValueError: 如果输出格式未知
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"未知的输出格式: {output_format}，可选值为 {', '.join(OUTPUT_FORMATS)}")
+        
+        self.stream = stream
+        self.output_format = output_format
+        self.counts = {'total': 0, 'passed': 0, 'failed': 0, 'errors': 0}
+        self._csv_writer = None
+        
+        if output_format == 'csv':
+            self._csv_writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS, lineterminator='\n')
+            self._csv_writer.writeheader()
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        """写出一个结果"""
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(flatten_result(result))
+        else:
+            self.stream.write(json.dumps(result, ensure_ascii=False) + '\n')
+        
+        status = _result_status(result)
+        self.counts['total'] += 1
+        if status is None:
+            self.counts['errors'] += 1
+        elif status:
+            self.counts['passed'] += 1
+        else:
+            self.counts['failed'] += 1
+    
+    @property
+    def exit_code(self) -> int:
+        """汇总退出码，见 exit_code"""
+        return exit_code(self.counts)
+    
+    def flush(self) -> None:
+        self.stream.flush()
+    
+    def __enter__(self) -> 'ResultWriter':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
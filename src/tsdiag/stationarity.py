@@ -5,8 +5,22 @@ AR模型平稳性检验模块
 """
 
 import numpy as np
-from typing import List, Union, Dict, Any
-from .core import stationarity_check as _core_stationarity_check, StationarityResult
+from typing import List, Union, Dict, Any, Optional, Iterable, Iterator
+from .core import (
+    stationarity_check as _core_stationarity_check,
+    stationarity_check_batch,
+    StationarityResult,
+    _build_stationarity_result,
+    _build_characteristic_polynomial,
+    _finite_roots,
+    _validate_batch,
+    _validate_method,
+    _validate_backend,
+    _bucketed_check,
+    _iter_model_chunks,
+    _validate_chunk_size,
+    _risk_level,
+)
 
 
 def check_ar_stationarity(
@@ -78,7 +92,11 @@ def analyze_ar_stability_margin(ar_coefficients: Union[List[float], np.ndarray])
             - risk_level: 风险等级 ('low', 'medium', 'high')
     """
     result = _core_stationarity_check(ar_coefficients)
-    
+    return _margin_from_result(result)
+
+
+def _margin_from_result(result: StationarityResult) -> Dict[str, Any]:
+    """根据已有的检验结果计算边际分析，不重新求根"""
     if not result.roots:
         return {
             'min_distance_to_unit_circle': float('inf'),
@@ -94,12 +112,7 @@ def analyze_ar_stability_margin(ar_coefficients: Union[List[float], np.ndarray])
     closest_root = result.roots[closest_root_idx]
     
     # 确定风险等级
-    if min_distance <= 0:
-        risk_level = 'high'  # 根在单位圆内或单位圆上
-    elif min_distance < 0.1:
-        risk_level = 'medium'  # 根接近单位圆
-    else:
-        risk_level = 'low'  # 根远离单位圆
+    risk_level = _risk_level(min_distance)
     
     return {
         'min_distance_to_unit_circle': min_distance,
@@ -121,7 +134,11 @@ def suggest_ar_modifications(ar_coefficients: Union[List[float], np.ndarray]) ->
         Dict: 包含修改建议的字典
     """
     result = _core_stationarity_check(ar_coefficients)
-    
+    return _suggestions_from_result(result)
+
+
+def _suggestions_from_result(result: StationarityResult) -> Dict[str, Any]:
+    """根据已有的检验结果生成修改建议，不重新求根"""
     suggestions = {
         'is_modification_needed': not result.is_stationary,
         'original_coefficients': result.ar_coefficients,
@@ -156,7 +173,10 @@ def suggest_ar_modifications(ar_coefficients: Union[List[float], np.ndarray]) ->
 
 def batch_stationarity_check(
     ar_models: List[Union[List[float], np.ndarray]],
-    model_names: List[str] = None
+    model_names: List[str] = None,
+    method: str = 'roots',
+    backend: str = 'serial',
+    n_jobs: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     批量进行AR模型平稳性检验
@@ -164,6 +184,12 @@ def batch_stationarity_check(
     Args:
         ar_models: AR模型系数列表
         model_names: 模型名称列表（可选）
+        method: 判定方法，'roots' 求根并给出边际分析（默认），
+            'schur' 使用Schur–Cohn递推只给出判定结果，num_roots、stability_margin、
+            risk_level 和 result 为None
+        backend: 执行方式，'serial' 在当前线程中计算（默认），'threads' 将同阶
+            模型的行块分发到线程池，利用LAPACK调用期间释放GIL并行求根
+        n_jobs: 'threads' 时的线程数，默认使用全部CPU核心
         
     Returns:
         List[Dict]: 每个模型的检验结果
@@ -174,31 +200,99 @@ def batch_stationarity_check(
     if len(model_names) != len(ar_models):
         raise ValueError("模型名称数量必须与模型数量相同")
     
-    results = []
+    _validate_method(method)
+    _validate_backend(backend)
+    valid, errors = _validate_batch(ar_models, "AR")
+    results: List[Dict[str, Any]] = [None] * len(ar_models)
     
-    for i, (coeffs, name) in enumerate(zip(ar_models, model_names)):
-        try:
-            result = _core_stationarity_check(coeffs)
-            stability_analysis = analyze_ar_stability_margin(coeffs)
-            
-            results.append({
-                'model_name': name,
-                'model_index': i,
-                'coefficients': result.ar_coefficients,
-                'is_stationary': result.is_stationary,
-                'num_roots': len(result.roots),
-                'stability_margin': stability_analysis['stability_margin'],
-                'risk_level': stability_analysis['risk_level'],
-                'result': result
-            })
-        except Exception as e:
-            results.append({
-                'model_name': name,
+    for i, error in errors.items():
+        results[i] = {
+            'model_name': model_names[i],
+            'model_index': i,
+            'coefficients': None,
+            'is_stationary': False,
+            'error': error,
+            'result': None
+        }
+    
+    # 同阶模型堆叠后通过一次批量检验求根
+    outcomes = _bucketed_check(valid, stationarity_check_batch, method=method, backend=backend, n_jobs=n_jobs)
+    
+    for i, (flag, min_modulus, roots, escalated) in outcomes.items():
+        if roots is None:
+            # Schur–Cohn递推不求根，只有判定结果；保留与求根时相同的键，取值为None
+            results[i] = {
+                'model_name': model_names[i],
                 'model_index': i,
-                'coefficients': None,
-                'is_stationary': False,
-                'error': str(e),
+                'coefficients': valid[i],
+                'is_stationary': flag,
+                'num_roots': None,
+                'stability_margin': None,
+                'risk_level': None,
                 'result': None
-            })
+            }
+            continue
+        
+        coeffs = valid[i]
+        result = _build_stationarity_result(
+            coeffs,
+            _build_characteristic_polynomial([-c for c in coeffs]),
+            _finite_roots(roots),
+            escalated
+        )
+        margin = min_modulus - 1.0
+        
+        results[i] = {
+            'model_name': model_names[i],
+            'model_index': i,
+            'coefficients': result.ar_coefficients,
+            'is_stationary': result.is_stationary,
+            'num_roots': len(result.roots),
+            'stability_margin': margin,
+            'risk_level': _risk_level(margin),
+            'result': result
+        }
     
     return results
+
+
+def iter_stationarity_check(
+    ar_models: Iterable[Union[List[float], np.ndarray]],
+    model_names: Optional[Iterable[str]] = None,
+    chunk_size: int = 1024,
+    method: str = 'roots',
+    backend: str = 'serial',
+    n_jobs: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    流式批量AR模型平稳性检验
+    
+    按 chunk_size 从任意可迭代对象中读取模型，每块调用一次 batch_stationarity_check
+    进行分桶的向量化检验，并按输入顺序逐个产出结果。内存占用只与块大小有关，
+    与模型总数无关。chunk_size 为1时不做批量计算。
+    
+    Args:
+        ar_models: AR模型系数的可迭代对象，可以是生成器
+        model_names: 模型名称的可迭代对象（可选），数量必须与模型数量相同
+        chunk_size: 每块的模型数
+        method: 判定方法，'roots' 或 'schur'
+        backend: 执行方式，'serial' 或 'threads'
+        n_jobs: 'threads' 时的线程数
+        
+    Returns:
+        Iterator[Dict]: 与 batch_stationarity_check 格式相同的检验结果，model_index 为全局索引
+        
+    Raises:
+        ValueError: 如果参数无效；名称数量与模型数量不同时在迭代过程中抛出
+    """
+    _validate_chunk_size(chunk_size)
+    _validate_method(method)
+    _validate_backend(backend)
+    
+    def generate() -> Iterator[Dict[str, Any]]:
+        for offset, chunk, names in _iter_model_chunks(ar_models, model_names, chunk_size):
+            for result in batch_stationarity_check(chunk, names, method=method, backend=backend, n_jobs=n_jobs):
+                result['model_index'] += offset
+                yield result
+    
+    return generate()
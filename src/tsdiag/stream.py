@@ -0,0 +1,263 @@
+"""
+按行的流式检验
+
+每行一个模型，每个模型输出一行紧凑的JSON结果。已经到达的多行合并为一个微批，
+按阶数分桶做向量化检验；输入暂时没有更多数据时立即处理已读到的行，不等待凑满批次，
+因此既适合管道中的大批量数据，也适合逐条到达的交互式输入。
+"""
+
+import json
+import os
+import numpy as np
+from itertools import islice
+from typing import Any, Dict, Iterator, List, TextIO
+from .core import (
+    stationarity_check_batch,
+    invertibility_check_batch,
+    _validate_batch,
+    _bucketed_check,
+    _risk_level,
+    _RISK_LEVELS,
+)
+
+try:
+    import select
+except ImportError:
+    select = None
+
+
+STREAM_KINDS = ('ar', 'ma', 'arma')
+
+# ARMA模型一行中AR系数和MA系数的分隔符
+_ARMA_SEPARATOR = '|'
+
+# 每次从文件描述符读取的字节数
+_READ_SIZE = 65536
+
+_PARTS = {
+    'ar': ('AR', stationarity_check_batch, 'is_stationary', 'stability_margin'),
+    'ma': ('MA', invertibility_check_batch, 'is_invertible', 'invertibility_margin'),
+}
+
+
+def _parse_coefficients(text: str, name: str) -> List[float]:
+    """解析逗号或空格分隔的系数，也接受JSON数组"""
+    text = text.strip()
+    if text.startswith('['):
+        try:
+            values = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"无法解析{name}系数数组 '{text}': {e}")
+        if not isinstance(values, list):
+            raise ValueError(f"{name}系数必须是数组")
+        return values
+    
+    try:
+        return [float(value) for value in text.replace(',', ' ').split()]
+    except ValueError as e:
+        raise ValueError(f"无法解析{name}系数字符串 '{text}': {e}")
+
+
+def parse_line(line: str, kind: str = 'ar') -> Dict[str, List[float]]:
+    """
+    解析一行模型
+    
+    - ar/ma: "0.5,-0.3"、"0.5 -0.3" 或 "[0.5, -0.3]"
+    - arma: "AR系数|MA系数"（任一侧可以为空），或 {"ar": [...], "ma": [...]}
+    
+    Args:
+        line: 输入行
+        kind: 模型类型，'ar'、'ma' 或 'arma'
+    
+    Returns:
+        Dict: 包含'ar'和/或'ma'键的模型字典
+    
+    Raises:
+        ValueError: 如果无法解析或模型类型未知
+    """
+    if kind not in STREAM_KINDS:
+        raise ValueError(f"未知的模型类型: {kind}，可选值为 {', '.join(STREAM_KINDS)}")
+    
+    if kind != 'arma':
+        return {kind: _parse_coefficients(line, _PARTS[kind][0])}
+    
+    line = line.strip()
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"无法解析ARMA模型 '{line}': {e}")
+        if not isinstance(record, dict):
+            raise ValueError("ARMA模型必须是JSON对象")
+        model = {key: record[key] for key in _PARTS if record.get(key) is not None}
+    else:
+        ar_text, _, ma_text = line.partition(_ARMA_SEPARATOR)
+        model = {
+            key: _parse_coefficients(text, _PARTS[key][0])
+            for key, text in (('ar', ar_text), ('ma', ma_text)) if text.strip()
+        }
+    
+    if not model:
+        raise ValueError("ARMA模型至少需要AR或MA系数")
+    return model
+
+
+def check_lines(lines: List[str], kind: str = 'ar', first_line: int = 1) -> List[Dict[str, Any]]:
+    """
+    对一个微批的输入行做批量检验
+    
+    Args:
+        lines: 输入行，每行一个模型
+        kind: 模型类型，'ar'、'ma' 或 'arma'
+        first_line: 第一行的行号，写入结果的 line 字段
+    
+    Returns:
+        List[Dict]: 与输入行一一对应的紧凑结果。出错的行只有 line 和 error 字段；
+        其他行包含各部分的判定结果和边际（没有有限根时为None），以及风险等级，
+        ARMA模型另有 model_valid
+    """
+    models: Dict[int, Dict[str, List[float]]] = {}
+    errors: Dict[int, str] = {}
+    for i, line in enumerate(lines):
+        try:
+            models[i] = parse_line(line, kind)
+        except ValueError as e:
+            errors[i] = str(e)
+    
+    outcomes = _check_parsed(models, errors, len(lines), with_validity=kind == 'arma')
+    return [dict({'line': first_line + i}, **outcome) for i, outcome in enumerate(outcomes)]
+
+
+def check_models(models: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    对一批模型字典做向量化检验
+    
+    各模型的AR和MA部分分别按阶数分桶批量求根，不为每个模型构造结果对象。
+    
+    Args:
+        models: 模型列表，每个模型是包含'ar'和/或'ma'键的字典，值为None的键视为不存在
+    
+    Returns:
+        List[Dict]: 与输入一一对应的紧凑结果，字段与 check_lines 相同（没有 line），
+        且总是包含 model_valid
+    """
+    parsed: Dict[int, Dict[str, Any]] = {}
+    errors: Dict[int, str] = {}
+    for i, model in enumerate(models):
+        parts = {key: model[key] for key in _PARTS if model.get(key) is not None}
+        if parts:
+            parsed[i] = parts
+        else:
+            errors[i] = "模型至少需要AR或MA系数"
+    
+    return _check_parsed(parsed, errors, len(models), with_validity=True)
+
+
+def _check_parsed(
+    models: Dict[int, Dict[str, Any]],
+    errors: Dict[int, str],
+    count: int,
+    with_validity: bool
+) -> List[Dict[str, Any]]:
+    """检验已解析的模型，errors 中的模型只输出错误信息"""
+    outcomes = {}
+    for key, (name, batch_check, _, _) in _PARTS.items():
+        valid, part_errors = _validate_batch({i: m[key] for i, m in models.items() if key in m}, name)
+        for i, error in part_errors.items():
+            errors.setdefault(i, error)
+        outcomes[key] = _bucketed_check(
+            {i: coeffs for i, coeffs in valid.items() if i not in errors}, batch_check
+        )
+    
+    results = []
+    for i in range(count):
+        if i in errors:
+            results.append({'error': errors[i]})
+            continue
+        
+        result: Dict[str, Any] = {}
+        passed, risk = True, 0
+        for key, (_, _, flag_key, margin_key) in _PARTS.items():
+            if i not in outcomes[key]:
+                continue
+            flag, min_modulus, _, _ = outcomes[key][i]
+            margin = float(min_modulus) - 1.0
+            result[flag_key] = bool(flag)
+            result[margin_key] = margin if np.isfinite(margin) else None
+            passed = passed and bool(flag)
+            risk = max(risk, _RISK_LEVELS.index(_risk_level(margin)))
+        
+        if with_validity:
+            result['model_valid'] = passed
+        result['risk_level'] = _RISK_LEVELS[risk]
+        results.append(result)
+    
+    return results
+
+
+def iter_line_batches(stream: TextIO, max_batch: int = 256) -> Iterator[List[str]]:
+    """
+    按微批读取输入行
+    
+    在POSIX系统上直接读取文件描述符，并用 select 判断是否还有已到达的数据：
+    有则继续合并到当前批次（最多 max_batch 行），没有则立即产出，不阻塞等待。
+    不支持文件描述符的内存流中的数据总是已到达，直接按 max_batch 分批。
+    
+    Args:
+        stream: 文本输入流
+        max_batch: 每批的最大行数
+    
+    Returns:
+        Iterator[List[str]]: 不含换行符的输入行
+    """
+    if max_batch < 1:
+        raise ValueError("max_batch必须是正整数")
+    
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = None
+    
+    if fd is None:
+        return _iter_memory_batches(stream, max_batch)
+    if select is None or os.name != 'posix':
+        # 无法探测是否有更多输入时逐行处理
+        return ([line.rstrip('\r\n')] for line in stream)
+    return _iter_fd_batches(fd, max_batch)
+
+
+def _iter_memory_batches(stream: TextIO, max_batch: int) -> Iterator[List[str]]:
+    """内存流按 max_batch 分批"""
+    while True:
+        batch = [line.rstrip('\r\n') for line in islice(stream, max_batch)]
+        if not batch:
+            return
+        yield batch
+
+
+def _iter_fd_batches(fd: int, max_batch: int) -> Iterator[List[str]]:
+    """从文件描述符读取已到达的数据并按行分批"""
+    pending = bytearray()
+    eof = False
+    
+    while not eof:
+        # 已有完整的行时只做非阻塞的探测，否则阻塞等待输入
+        while pending.count(b'\n') < max_batch:
+            timeout = 0 if b'\n' in pending else None
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if not ready:
+                break
+            chunk = os.read(fd, _READ_SIZE)
+            if not chunk:
+                eof = True
+                break
+            pending += chunk
+        
+        lines = bytes(pending).split(b'\n')
+        pending = bytearray(lines.pop())
+        if eof and pending:
+            lines.append(bytes(pending))
+        
+        decoded = [line.decode('utf-8', errors='replace').rstrip('\r') for line in lines]
+        for start in range(0, len(decoded), max_batch):
+            yield decoded[start:start + max_batch]
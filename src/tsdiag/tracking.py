@@ -0,0 +1,191 @@
+"""
+特征根的连续跟踪
+
+对于系数随时间缓慢变化的模型（如每分钟重新估计的AR系数），
+以上一次的根为初值进行少量Aberth–Ehrlich迭代，避免每次从头求根。
+"""
+
+import numpy as np
+from typing import List, Union, Dict, Optional, Tuple
+from .core import (
+    StationarityResult,
+    InvertibilityResult,
+    aberth_roots,
+    _validate_coefficients,
+    _validate_coefficient_matrix,
+    _validate_finite_rows,
+    _build_characteristic_polynomial,
+    _build_stationarity_result,
+    _build_invertibility_result,
+    _characteristic_roots,
+    _refine_near_unit_circle,
+    _ABERTH_CHUNK_SIZE,
+)
+
+
+_KINDS = {
+    'ar': ('AR', -1.0, _build_stationarity_result),
+    'ma': ('MA', 1.0, _build_invertibility_result),
+}
+
+
+def _min_root_separation(roots: np.ndarray) -> float:
+    """计算根之间的最小相对距离，按块计算避免构造 n×n 矩阵"""
+    n = len(roots)
+    if n < 2:
+        return np.inf
+    
+    scale = np.maximum(1.0, np.abs(roots))
+    separation = np.inf
+    
+    for start in range(0, n, _ABERTH_CHUNK_SIZE):
+        block = roots[start:start + _ABERTH_CHUNK_SIZE]
+        distance = np.abs(block[:, None] - roots[None, :]) / scale[start:start + _ABERTH_CHUNK_SIZE, None]
+        distance[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+        separation = min(separation, float(distance.min()))
+    
+    return separation
+
+
+class RootTracker:
+    """
+    特征根跟踪器
+    
+    保存上一次的特征根，系数更新后以其为初值进行少量Aberth–Ehrlich迭代。
+    未收敛、阶数变化或两个根发生碰撞时回退为完整求根。
+    
+    Examples:
+        >>> tracker = RootTracker('ar')
+        >>> result = tracker.update([0.5, 0.3])
+        >>> result = tracker.update([0.51, 0.29])  # 从上一次的根热启动
+    """
+    
+    def __init__(
+        self,
+        kind: str = 'ar',
+        max_iter: int = 10,
+        tol: float = 1e-12,
+        collision_tol: float = 1e-6
+    ):
+        """
+        初始化跟踪器
+        
+        Args:
+            kind: 模型类型，'ar' 检验平稳性，'ma' 检验可逆性
+            max_iter: 热启动时的最大迭代次数，超过后回退为完整求根
+            tol: 收敛容差
+            collision_tol: 根之间的最小相对距离，小于该值视为根碰撞
+        
+        Raises:
+            ValueError: 如果模型类型未知或参数不是正数
+        """
+        if kind not in _KINDS:
+            raise ValueError(f"未知的模型类型: {kind}，可选值为 {', '.join(_KINDS)}")
+        if max_iter < 1:
+            raise ValueError("max_iter必须是正整数")
+        if tol <= 0 or collision_tol <= 0:
+            raise ValueError("tol和collision_tol必须是正数")
+        
+        self.kind = kind
+        self.max_iter = max_iter
+        self.tol = tol
+        self.collision_tol = collision_tol
+        
+        self._roots: Optional[np.ndarray] = None
+        self.warm_updates = 0
+        self.full_solves = 0
+        self.iterations = 0
+    
+    @property
+    def roots(self) -> Optional[np.ndarray]:
+        """上一次更新得到的特征根，尚未更新时为None"""
+        return self._roots
+    
+    def reset(self) -> None:
+        """清除保存的根，下一次更新将完整求根"""
+        self._roots = None
+    
+    def update(self, coefficients: Union[List[float], np.ndarray]) -> Union[StationarityResult, InvertibilityResult]:
+        """
+        用新的系数更新特征根
+        
+        Args:
+            coefficients: 模型系数，AR为 [φ₁, ..., φₚ]，MA为 [θ₁, ..., θₑ]
+        
+        Returns:
+            StationarityResult 或 InvertibilityResult: 与 stationarity_check/
+            invertibility_check 相同的检验结果
+        
+        Raises:
+            TypeError: 如果系数不是列表或numpy数组
+            ValueError: 如果系数为空、包含非数值或非有限数值
+        """
+        name, sign, build_result = _KINDS[self.kind]
+        coeffs = _validate_coefficients(coefficients, name)
+        if not np.all(np.isfinite(coeffs)):
+            raise ValueError(f"{name}系数必须都是有限数值")
+        poly_coeffs = _build_characteristic_polynomial([sign * c for c in coeffs])
+        
+        warm = self._warm_start(poly_coeffs)
+        if warm is None:
+            roots, escalated = _characteristic_roots(poly_coeffs)
+            self.full_solves += 1
+        else:
+            roots, escalated = warm
+            self.warm_updates += 1
+        
+        self._roots = roots
+        return build_result(coeffs, poly_coeffs, roots, escalated)
+    
+    def track(self, path: Union[List[List[float]], np.ndarray]) -> List[Union[StationarityResult, InvertibilityResult]]:
+        """
+        依次处理系数路径上的每一组系数
+        
+        Args:
+            path: 形状为 (T, p) 的系数矩阵，每行是一个时刻的模型系数
+        
+        Returns:
+            List: 每个时刻的检验结果，顺序与输入一致
+        
+        Raises:
+            TypeError: 如果输入不是列表或numpy数组
+            ValueError: 如果输入不是二维矩阵或包含非有限数值
+        """
+        name = _KINDS[self.kind][0]
+        matrix = _validate_coefficient_matrix(path, name)
+        # 在处理任何一行之前检查，避免路径中途出错时已更新了保存的根
+        _validate_finite_rows(matrix, name)
+        return [self.update(row) for row in matrix]
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        获取跟踪统计信息
+        
+        Returns:
+            Dict: 热启动次数、完整求根次数和热启动累计迭代次数
+        """
+        return {
+            'warm_updates': self.warm_updates,
+            'full_solves': self.full_solves,
+            'iterations': self.iterations,
+        }
+    
+    def _warm_start(self, poly_coeffs: List[float]) -> Optional[Tuple[np.ndarray, bool]]:
+        """从上一次的根热启动，返回 (根数组, 是否经过扩展精度修正)，无法使用或失败时返回None"""
+        if self._roots is None:
+            return None
+        
+        # 最高次项为零时次数降低，与上一次的根个数不一致
+        nonzero = np.flatnonzero(poly_coeffs)
+        if len(self._roots) != nonzero[-1]:
+            return None
+        
+        result = aberth_roots(poly_coeffs, initial_roots=self._roots, tol=self.tol, max_iter=self.max_iter)
+        self.iterations += result.iterations
+        
+        if not result.converged:
+            return None
+        if _min_root_separation(result.roots) < self.collision_tol:
+            return None
+        
+        return _refine_near_unit_circle(poly_coeffs, result.roots)
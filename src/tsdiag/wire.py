@@ -0,0 +1,369 @@
+"""
+批量接口的二进制请求与响应格式
+
+大批量请求使用JSON浮点数列表时，每个系数都要在Python中逐个解析和校验。
+本模块把 application/x-npy 和 MessagePack 请求体直接解码为NumPy系数矩阵，
+向量化检验后以结构化数组返回，整个过程没有逐元素的Python操作。
+
+MessagePack中的数组统一编码为 {"data": 原始字节, "shape": [...], "dtype": "<f8"}，
+dtype 可省略（默认为小端float64）。需要安装msgpack。
+"""
+
+import io
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .core import (
+    stationarity_check_batch,
+    invertibility_check_batch,
+    BATCH_RESULT_DTYPE,
+    _validate_coefficient_matrix,
+    _risk_codes,
+    _RISK_LEVELS,
+)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MSGPACK_AVAILABLE = msgpack is not None
+
+JSON_MEDIA_TYPE = 'application/json'
+NPY_MEDIA_TYPE = 'application/x-npy'
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+# 请求和响应中都接受的MessagePack媒体类型别名
+_MEDIA_TYPE_ALIASES = {
+    'application/x-msgpack': MSGPACK_MEDIA_TYPE,
+    'application/vnd.msgpack': MSGPACK_MEDIA_TYPE,
+}
+
+_PARTS = {
+    'ar': ('AR', stationarity_check_batch, 'is_stationary', 'stability_margin'),
+    'ma': ('MA', invertibility_check_batch, 'is_invertible', 'invertibility_margin'),
+}
+
+# 二进制响应的结构化数组：不存在或无效的部分判定为False、边际为NaN，
+# risk_level 为 RISK_LEVELS 中的下标，系数无效的模型为-1
+RESULT_DTYPE = np.dtype([
+    ('is_stationary', np.bool_),
+    ('stability_margin', np.float64),
+    ('is_invertible', np.bool_),
+    ('invertibility_margin', np.float64),
+    ('model_valid', np.bool_),
+    ('risk_level', np.int8),
+])
+
+RISK_LEVELS = _RISK_LEVELS
+
+_INVALID_RESULT = np.array((False, np.nan, False, np.nan, False, -1), dtype=RESULT_DTYPE)
+
+
+def _require_msgpack() -> None:
+    """检查是否安装了msgpack"""
+    if not MSGPACK_AVAILABLE:
+        raise ImportError("MessagePack格式需要先安装msgpack: pip install msgpack")
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """
+    规范化 Content-Type，去掉参数并把别名映射为标准媒体类型
+    
+    Args:
+        content_type: 请求头中的 Content-Type，缺省时视为JSON
+    
+    Returns:
+        str: 小写的媒体类型
+    """
+    if not content_type:
+        return JSON_MEDIA_TYPE
+    value = content_type.split(';', 1)[0].strip().lower()
+    return _MEDIA_TYPE_ALIASES.get(value, value)
+
+
+def negotiate(accept: Optional[str], offers: Sequence[str]) -> Optional[str]:
+    """
+    按 Accept 请求头选择响应格式
+    
+    按q值从高到低（相同时按出现顺序）匹配，支持 */* 和 application/* 通配。
+    
+    Args:
+        accept: 请求头中的 Accept，缺省时选择第一个候选格式
+        offers: 服务端支持的媒体类型，第一个为默认格式
+    
+    Returns:
+        Optional[str]: 选中的媒体类型，没有可接受的格式时为None
+    """
+    if not accept:
+        return offers[0]
+    
+    ranges = []
+    for position, item in enumerate(accept.split(',')):
+        value, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, number = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, position, media_type(value)))
+    
+    for _, _, wanted in sorted(ranges):
+        for offer in offers:
+            if wanted in ('*/*', offer) or (wanted.endswith('/*') and offer.startswith(wanted[:-1])):
+                return offer
+    return None
+
+
+def decode_npy(body: bytes) -> np.ndarray:
+    """
+    解码 .npy 格式的系数矩阵
+    
+    Args:
+        body: .npy 文件内容
+    
+    Returns:
+        np.ndarray: (N, p) 浮点系数矩阵，本身是float64时不复制
+    
+    Raises:
+        ValueError: 如果内容不是 .npy 格式，或不是二维实数数组
+    """
+    try:
+        array = np.load(io.BytesIO(body), allow_pickle=False)
+    except (ValueError, OSError, EOFError) as e:
+        raise ValueError(f"无法解析npy数据: {e}")
+    return _as_matrix(array)
+
+
+def _as_matrix(array: np.ndarray, name: str = '') -> np.ndarray:
+    """检查数组是二维实数数组并转换为float64"""
+    if array.dtype.fields is not None or not (
+        np.issubdtype(array.dtype, np.integer) or np.issubdtype(array.dtype, np.floating)
+    ):
+        raise ValueError(f"{name}系数矩阵必须是实数数组，实际类型为 {array.dtype}")
+    return _validate_coefficient_matrix(array, name)
+
+
+def _decode_array(value: Any, name: str) -> np.ndarray:
+    """把 {"data", "shape", "dtype"} 解码为NumPy数组视图"""
+    if not isinstance(value, dict) or not isinstance(value.get('data'), bytes) or 'shape' not in value:
+        raise ValueError(f"{name}系数必须是包含data和shape的数组对象")
+    
+    try:
+        dtype = np.dtype(value.get('dtype', '<f8'))
+        shape = tuple(int(size) for size in value['shape'])
+        array = np.frombuffer(value['data'], dtype=dtype).reshape(shape)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"无法解析{name}系数数组: {e}")
+    return _as_matrix(array, name)
+
+
+def decode_msgpack(body: bytes) -> Tuple[Dict[str, np.ndarray], Optional[List[str]]]:
+    """
+    解码MessagePack批量请求
+    
+    请求是一个映射，包含 "ar" 和/或 "ma" 系数矩阵（两者同时存在时为ARMA模型，
+    行数必须相同），以及可选的 "model_names" 名称列表。
+    
+    Args:
+        body: MessagePack数据
+    
+    Returns:
+        Tuple: ({'ar'/'ma': (N, p) 系数矩阵}, 模型名称或None)
+    
+    Raises:
+        ImportError: 如果未安装msgpack
+        ValueError: 如果数据格式不正确，或系数矩阵行数与名称数量不一致
+    """
+    _require_msgpack()
+    try:
+        request = msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise ValueError(f"无法解析MessagePack数据: {e}")
+    if not isinstance(request, dict):
+        raise ValueError("MessagePack请求必须是映射")
+    
+    parts = {
+        key: _decode_array(request[key], name)
+        for key, (name, _, _, _) in _PARTS.items() if request.get(key) is not None
+    }
+    names = request.get('model_names')
+    if names is not None:
+        if not isinstance(names, list):
+            raise ValueError("model_names必须是字符串列表")
+        names = [str(name) for name in names]
+    
+    _model_count(parts, names)
+    return parts, names
+
+
+def _model_count(parts: Dict[str, np.ndarray], model_names: Optional[Sequence[str]] = None) -> int:
+    """检查各部分和名称的数量一致，返回模型数"""
+    if not parts:
+        raise ValueError("请求中至少需要AR或MA系数矩阵")
+    counts = {len(matrix) for matrix in parts.values()}
+    if len(counts) != 1:
+        raise ValueError("AR和MA系数矩阵的行数必须相同")
+    count = counts.pop()
+    if model_names is not None and len(model_names) != count:
+        raise ValueError("模型名称数量必须与模型数量相同")
+    return count
+
+
+def check_matrices(parts: Dict[str, np.ndarray], model_names: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    对系数矩阵做向量化检验
+    
+    含非有限数值的行记为无效模型，其余行按矩阵整体批量判定，不保留特征根。
+    
+    Args:
+        parts: {'ar'/'ma': (N, p) 系数矩阵}，两者都给出时为ARMA模型
+        model_names: 模型名称（可选），只用于检查数量
+    
+    Returns:
+        np.ndarray: (N,) 类型为 RESULT_DTYPE 的结构化数组
+    
+    Raises:
+        ValueError: 如果没有系数矩阵、行数不一致或名称数量不符
+    """
+    n_models = _model_count(parts, model_names)
+    results = np.zeros(n_models, dtype=RESULT_DTYPE)
+    results['stability_margin'] = results['invertibility_margin'] = np.nan
+    results['model_valid'] = True
+    invalid = np.zeros(n_models, dtype=bool)
+    risk = np.zeros(n_models, dtype=np.int8)
+    
+    if not n_models:
+        return results
+    
+    for key, matrix in parts.items():
+        _, batch_check, flag_key, margin_key = _PARTS[key]
+        finite = np.isfinite(matrix).all(axis=1)
+        if not finite.all():
+            # 非有限数值的行以零系数代入计算，结果随后作废
+            matrix = np.where(finite[:, np.newaxis], matrix, 0.0)
+        
+        outcome = np.empty(len(matrix), dtype=BATCH_RESULT_DTYPE)
+        batch_check(matrix, out=outcome)
+        margins = outcome['min_modulus'] - 1.0
+        
+        results[flag_key] = outcome['flag']
+        results[margin_key] = margins
+        results['model_valid'] &= outcome['flag']
+        risk = np.maximum(risk, _risk_codes(margins))
+        invalid |= ~finite
+    
+    results['risk_level'] = risk
+    # 任一部分无效的模型整体作废，与JSON结果中的错误记录一致
+    results[invalid] = _INVALID_RESULT
+    return results
+
+
+def records_to_results(records: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    把 check_models 的紧凑结果转换为 RESULT_DTYPE 结构化数组
+    
+    Args:
+        records: 紧凑结果列表
+    
+    Returns:
+        np.ndarray: (N,) 结构化数组，出错的模型 risk_level 为-1
+    """
+    def margin(record: Dict[str, Any], key: str) -> float:
+        if key not in record:
+            return np.nan
+        # 没有有限根时紧凑结果中的边际为None
+        return np.inf if record[key] is None else record[key]
+    
+    results = np.zeros(len(records), dtype=RESULT_DTYPE)
+    for name in ('stability_margin', 'invertibility_margin'):
+        results[name] = [margin(r, name) for r in records]
+    for name in ('is_stationary', 'is_invertible', 'model_valid'):
+        results[name] = [r.get(name, False) for r in records]
+    results['risk_level'] = [RISK_LEVELS.index(r['risk_level']) if 'risk_level' in r else -1 for r in records]
+    return results
+
+
+def matrices_to_models(parts: Dict[str, np.ndarray]) -> List[Dict[str, List[float]]]:
+    """
+    把系数矩阵转换为模型字典列表，用于返回逐模型的JSON结果
+    
+    Args:
+        parts: {'ar'/'ma': (N, p) 系数矩阵}
+    
+    Returns:
+        List[Dict]: 每个模型一个字典
+    """
+    rows = {key: matrix.tolist() for key, matrix in parts.items()}
+    return [{key: rows[key][i] for key in rows} for i in range(_model_count(parts))]
+
+
+def summarize(results: np.ndarray) -> Dict[str, int]:
+    """
+    统计结构化结果的摘要，字段与批量分析接口的 summary 相同
+    
+    Args:
+        results: RESULT_DTYPE 结构化数组
+    
+    Returns:
+        Dict[str, int]: 摘要计数
+    """
+    return {
+        'total_models': int(len(results)),
+        'valid_models': int(results['model_valid'].sum()),
+        'error_models': int((results['risk_level'] < 0).sum()),
+        'ar_stationary_count': int(results['is_stationary'].sum()),
+        'ma_invertible_count': int(results['is_invertible'].sum()),
+    }
+
+
+def encode_npy(results: np.ndarray) -> bytes:
+    """
+    把结果编码为 .npy 格式
+    
+    Args:
+        results: RESULT_DTYPE 结构化数组
+    
+    Returns:
+        bytes: .npy 文件内容，可以用 np.load 直接读取
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, results, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def encode_msgpack(results: np.ndarray, model_names: Optional[Sequence[str]] = None) -> bytes:
+    """
+    把结果编码为MessagePack
+    
+    响应是一个映射：columns 中每列编码为 {"data", "shape", "dtype"}，
+    另有 risk_levels（risk_level 列下标对应的等级名称）、summary 和 model_names（如果提供）。
+    
+    Args:
+        results: RESULT_DTYPE 结构化数组
+        model_names: 模型名称（可选）
+    
+    Returns:
+        bytes: MessagePack数据
+    
+    Raises:
+        ImportError: 如果未安装msgpack
+    """
+    _require_msgpack()
+    columns = {}
+    for name in RESULT_DTYPE.names:
+        column = np.ascontiguousarray(results[name])
+        columns[name] = {'data': column.tobytes(), 'shape': [len(column)], 'dtype': column.dtype.str}
+    
+    response: Dict[str, Any] = {
+        'columns': columns,
+        'risk_levels': list(RISK_LEVELS),
+        'summary': summarize(results),
+    }
+    if model_names is not None:
+        response['model_names'] = list(model_names)
+    return msgpack.packb(response, use_bin_type=True)
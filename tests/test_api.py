@@ -0,0 +1,178 @@
+"""
+高级API测试
+"""
+
+import pytest
+import numpy as np
+from tsdiag import core
+from tsdiag.api import (
+    quick_ar_check,
+    quick_ma_check,
+    analyze_model_stability,
+    batch_model_analysis,
+    iter_model_analysis
+)
+
+
+class TestAnalyzeModelStability:
+    """测试模型稳定性综合分析"""
+    
+    def test_roots_computed_once(self, monkeypatch):
+        """测试每个多项式只求一次根"""
+        calls = []
+        original_roots = np.roots
+        
+        def counting_roots(p):
+            calls.append(p)
+            return original_roots(p)
+        
+        monkeypatch.setattr(core.np, 'roots', counting_roots)
+        analysis = analyze_model_stability([1.2, -0.1], [0.4])
+        
+        assert len(calls) == 2
+        assert not analysis['ar']['is_stationary']
+        assert analysis['ar']['suggested_coefficients'] == pytest.approx([1.08, -0.09])
+        assert analysis['overall']['max_risk_level'] == 'high'
+    
+    def test_string_input(self):
+        """测试字符串系数输入"""
+        analysis = analyze_model_stability("0.5, -0.3")
+        assert analysis['ar']['is_stationary']
+        assert 'ma' not in analysis
+
+
+class TestQuickChecks:
+    """测试快速检验"""
+    
+    @pytest.mark.parametrize('method', ['roots', 'schur'])
+    def test_methods_agree(self, method):
+        """测试两种判定方法结果一致"""
+        assert quick_ar_check([0.5, -0.3], method=method)
+        assert not quick_ar_check([1.0], method=method)
+        assert not quick_ma_check([1.2, 0.1], method=method)
+    
+    def test_unknown_method(self):
+        """测试未知的判定方法"""
+        with pytest.raises(ValueError, match="未知的判定方法"):
+            quick_ar_check([0.5], method='invalid')
+
+
+class TestBatchModelAnalysis:
+    """测试批量模型分析"""
+    
+    def test_matches_single_analysis(self):
+        """测试分桶批量结果与逐个分析一致"""
+        models = [
+            {'ar': [0.5, -0.3], 'ma': [0.4]},
+            {'ar': [1.1]},
+            {'ma': [1.1, 0.2, 0.1]},
+            {'ar': [0.3, 0.2, 0.1, 0.05], 'ma': [0.5, 0.2]},
+        ]
+        results = batch_model_analysis(models, bucket_width=4)
+        
+        for model, result in zip(models, results):
+            expected = analyze_model_stability(model.get('ar'), model.get('ma'))
+            for part, margin_key in (('ar', 'stability_margin'), ('ma', 'invertibility_margin')):
+                assert (part in result) == (part in expected)
+                if part not in expected:
+                    continue
+                assert result[part]['risk_level'] == expected[part]['risk_level']
+                assert result[part]['suggestions'] == expected[part]['suggestions']
+                assert result[part][margin_key] == pytest.approx(expected[part][margin_key])
+                assert len(result[part]['roots']) == len(expected[part]['roots'])
+    
+    def test_error_isolation(self):
+        """测试单个模型的错误不影响其他模型"""
+        models = [{'ar': [0.5]}, {'ar': []}, 'invalid', {'ma': [float('inf')]}, {}]
+        results = batch_model_analysis(models, model_names=['a', 'b', 'c', 'd', 'e'])
+        
+        assert [r['model_name'] for r in results] == ['a', 'b', 'c', 'd', 'e']
+        assert results[0]['ar']['is_stationary']
+        assert results[1]['error'] == "AR系数不能为空"
+        assert 'error' in results[2]
+        assert results[3]['error'] == "MA系数必须都是有限数值"
+        assert results[4] == {'model_name': 'e', 'model_index': 4}
+    
+    def test_bucket_failure_falls_back(self, monkeypatch):
+        """测试分桶计算失败时逐个模型分析，只有出错的模型记录错误"""
+        from tsdiag import api
+        
+        models = [{'ar': [0.5], 'ma': [0.4]}, {'ar': [0.9, 0.2]}, {'ma': [1.1]}]
+        expected = batch_model_analysis(models)
+        
+        def failing_check(*args, **kwargs):
+            raise RuntimeError("批量计算失败")
+        
+        original = api.analyze_model_stability
+        
+        def analyze(ar_coefficients=None, ma_coefficients=None):
+            if ar_coefficients == [0.9, 0.2]:
+                raise RuntimeError("单个模型失败")
+            return original(ar_coefficients, ma_coefficients)
+        
+        monkeypatch.setattr(api, '_bucketed_check', failing_check)
+        monkeypatch.setattr(api, 'analyze_model_stability', analyze)
+        results = batch_model_analysis(models)
+        
+        assert results[0] == expected[0]
+        assert results[1] == {'error': "单个模型失败", 'model_name': 'Model_2', 'model_index': 1}
+        assert results[2] == expected[2]
+    
+    def test_process_pool_matches_serial(self):
+        """测试多进程分块计算的结果和顺序与串行一致"""
+        models = [{'ar': [0.5, -0.3], 'ma': [0.4]}, {'ar': []}, {'ar': [1.1]}, {},
+                  {'ma': [1.1, 0.2, 0.1]}, 'invalid', {'ar': [0.3, 0.2, 0.1, 0.05], 'ma': [0.5, 0.2]}]
+        
+        serial = batch_model_analysis(models)
+        parallel = batch_model_analysis(models, n_jobs=2, chunk_size=2)
+        
+        assert parallel == serial
+    
+    def test_threads_backend(self):
+        """测试线程池并行与串行结果一致"""
+        models = [{'ar': [0.5, -0.3], 'ma': [0.4]}, {'ar': [1.1]}, 'invalid', {'ma': [1.1, 0.2, 0.1]}] * 10
+        
+        assert batch_model_analysis(models, n_jobs=3, backend='threads') == batch_model_analysis(models)
+        with pytest.raises(ValueError, match="未知的并行方式"):
+            batch_model_analysis(models, n_jobs=2, backend='gpu')
+    
+    def test_pack_round_trip(self):
+        """测试进程间传输格式的打包和解包"""
+        from tsdiag.api import _pack_models, _unpack_models
+        
+        ar_valid = {0: [0.5, -0.3], 3: [1.1]}
+        ma_valid = {0: [0.4], 2: [0.1, 0.2, 0.3]}
+        chunk = _pack_models([0, 2, 3], ar_valid, ma_valid)
+        
+        assert chunk['ar_lengths'].tolist() == [2, 0, 1]
+        assert _unpack_models(chunk) == (ar_valid, ma_valid)
+    
+    def test_invalid_parallel_arguments(self):
+        """测试无效的并行参数"""
+        with pytest.raises(ValueError, match="n_jobs"):
+            batch_model_analysis([{'ar': [0.5]}], n_jobs=0)
+        with pytest.raises(ValueError, match="chunk_size"):
+            batch_model_analysis([{'ar': [0.5]}], n_jobs=2, chunk_size=0)
+
+
+class TestIterModelAnalysis:
+    """测试流式批量模型分析"""
+    
+    MODELS = [{'ar': [0.5, -0.3], 'ma': [0.4]}, {'ar': []}, {'ar': [1.1]}, {},
+              {'ma': [1.1, 0.2, 0.1]}, 'invalid', {'ar': [0.3, 0.2, 0.1, 0.05], 'ma': [0.5, 0.2]}] * 3
+    
+    @pytest.mark.parametrize("n_jobs, backend", [(None, 'processes'), (2, 'threads'), (2, 'processes')])
+    def test_matches_batch(self, n_jobs, backend):
+        """测试各种执行方式下的结果与一次性批量分析一致"""
+        results = list(iter_model_analysis(iter(self.MODELS), chunk_size=4, n_jobs=n_jobs, backend=backend))
+        
+        assert results == batch_model_analysis(self.MODELS)
+    
+    def test_generator_input(self):
+        """测试生成器输入和名称"""
+        models = ({'ar': [0.1 * (i % 9)]} for i in range(50))
+        names = (f"m{i}" for i in range(50))
+        results = list(iter_model_analysis(models, model_names=names, chunk_size=7))
+        
+        assert [r['model_index'] for r in results] == list(range(50))
+        assert results[-1]['model_name'] == "m49"
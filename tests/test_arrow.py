@@ -0,0 +1,137 @@
+"""
+Arrow/Parquet列式读写测试
+"""
+
+import numpy as np
+import pytest
+from tsdiag.batch import BatchDiagnostics
+
+
+@pytest.fixture
+def pa():
+    # 在测试中才导入pyarrow，避免其线程池影响其他测试中的进程池
+    return pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def arrow():
+    pytest.importorskip("pyarrow")
+    from tsdiag import arrow
+    return arrow
+
+
+class TestListColumnGroups:
+    """测试系数列表列按长度分组"""
+    
+    def test_fixed_size_zero_copy(self, pa, arrow):
+        """测试定长列表列零拷贝转换，且保留切片偏移"""
+        column = pa.FixedSizeListArray.from_arrays(pa.array(np.arange(12, dtype=float) / 20), 3)
+        groups, errors = arrow.list_column_groups(column.slice(1, 2))
+        
+        rows, matrix = groups[3]
+        assert list(groups) == [3]
+        assert rows.tolist() == [0, 1]
+        assert np.allclose(matrix, [[0.15, 0.2, 0.25], [0.3, 0.35, 0.4]])
+        assert np.shares_memory(matrix, column.values.to_numpy())
+        assert errors == {}
+    
+    def test_variable_size_groups_and_errors(self, pa, arrow):
+        """测试变长列表列按长度分组，以及空值、空列表和非有限值"""
+        column = pa.chunked_array([
+            pa.array([[0.5, -0.3], None], type=pa.list_(pa.float64())),
+            pa.array([[], [0.1, float('nan')], [0.2], [0.4, 0.1]], type=pa.list_(pa.float64())),
+        ])
+        groups, errors = arrow.list_column_groups(column, 'MA')
+        
+        assert sorted(groups) == [1, 2]
+        assert groups[1][0].tolist() == [4]
+        assert groups[1][1].tolist() == [[0.2]]
+        assert groups[2][0].tolist() == [0, 5]
+        assert groups[2][1].tolist() == [[0.5, -0.3], [0.4, 0.1]]
+        assert errors == {1: "MA系数缺失", 2: "MA系数不能为空", 3: "MA系数必须都是有限数值"}
+    
+    def test_not_a_list(self, pa, arrow):
+        """测试非列表列"""
+        with pytest.raises(TypeError, match="列表类型"):
+            arrow.list_column_groups(pa.array([0.5, 0.3]))
+
+
+class TestArrowDiagnostics:
+    """测试Arrow表的批量检验和结果写出"""
+    
+    def test_matches_from_models(self, pa, arrow):
+        """测试结果与 BatchDiagnostics.from_models 一致"""
+        models = [[0.5, -0.3], [1.2], None, [0.2, 0.1, 0.05]]
+        table = pa.table({'ar': models, 'name': ['a', 'b', 'c', 'd']})
+        
+        diagnostics = arrow.from_arrow(table)
+        expected = BatchDiagnostics.from_models([m or [] for m in models], 'ar')
+        
+        assert diagnostics.model_names.tolist() == ['a', 'b', 'c', 'd']
+        assert np.array_equal(diagnostics.flags, expected.flags)
+        assert np.allclose(diagnostics.margins, expected.margins, equal_nan=True)
+        assert np.allclose(np.sort_complex(diagnostics.roots), np.sort_complex(expected.roots))
+        assert diagnostics.errors[2] == "AR系数缺失"
+    
+    def test_groups_ragged_rows_by_length(self, pa, arrow, monkeypatch):
+        """测试变长列表列按列表长度分组检验，不按最大阶数补零"""
+        models = [[0.5], [0.2, 0.1, 0.05, 0.01], [1.2], None, [0.3, 0.2, 0.1, float('inf')], [0.4, -0.2]]
+        column = pa.array(models, type=pa.list_(pa.float64())).slice(0, 6)
+        shapes = []
+        original = BatchDiagnostics.from_matrix.__func__
+        
+        def recording_from_matrix(cls, coefficients, *args, **kwargs):
+            shapes.append(np.shape(coefficients))
+            return original(cls, coefficients, *args, **kwargs)
+        
+        monkeypatch.setattr(BatchDiagnostics, 'from_matrix', classmethod(recording_from_matrix))
+        diagnostics = arrow.from_arrow(column, kind='ar')
+        
+        assert sorted(shapes) == [(1, 2), (1, 4), (2, 1)]
+        assert diagnostics.indices.tolist() == list(range(6))
+        assert diagnostics.flags.tolist() == [True, True, False, False, False, True]
+        assert diagnostics.errors[3] == "AR系数缺失"
+        assert diagnostics.errors[4] == "AR系数必须都是有限数值"
+        
+        monkeypatch.undo()
+        expected = BatchDiagnostics.from_models([[0.5], [0.2, 0.1, 0.05, 0.01], [1.2], [0.4, -0.2]], 'ar')
+        valid = diagnostics.take(np.array([0, 1, 2, 5]))
+        assert np.allclose(valid.margins, expected.margins)
+        assert np.allclose(np.sort_complex(valid.roots), np.sort_complex(expected.roots))
+    
+    def test_to_arrow(self, pa, arrow):
+        """测试结果表的列和取值"""
+        table = arrow.to_arrow(arrow.from_arrow(pa.table({'ma': [[0.4], [1.5], None]}), kind='ma'))
+        
+        assert table.column_names[:5] == [
+            'model_index', 'model_name', 'is_invertible', 'invertibility_margin', 'risk_level'
+        ]
+        rows = table.to_pylist()
+        assert rows[0]['risk_level'] == 'low'
+        assert rows[0]['roots_real'] == pytest.approx([-2.5])
+        assert rows[1]['is_invertible'] is False
+        assert rows[2]['risk_level'] is None
+        assert rows[2]['error'] == "MA系数缺失"
+    
+    def test_parquet_round_trip(self, pa, arrow, tmp_path):
+        """测试Parquet读写"""
+        import pyarrow.parquet as pq
+        
+        path = str(tmp_path / 'models.parquet')
+        pq.write_table(pa.table({'name': ['a', 'b'], 'ar': [[0.5], [0.3, 0.2]], 'ma': [[0.1], None]}), path)
+        
+        diagnostics = arrow.read_parquet(path)
+        output = str(tmp_path / 'results.parquet')
+        arrow.write_parquet(diagnostics, output)
+        
+        table = pq.read_table(output)
+        assert table.column('model_name').to_pylist() == ['a', 'b']
+        assert table.column('is_stationary').to_pylist() == [True, True]
+        
+        records = list(arrow.iter_parquet_models(path, batch_size=1))
+        assert records == [('a', {'ar': [0.5], 'ma': [0.1]}), ('b', {'ar': [0.3, 0.2]})]
+    
+    def test_missing_column(self, pa, arrow):
+        """测试缺少系数列"""
+        with pytest.raises(ValueError, match="缺少系数列"):
+            arrow.from_arrow(pa.table({'ar': [[0.5]]}), kind='ma')
@@ -0,0 +1,117 @@
+"""
+批量结果容器测试
+"""
+
+import pytest
+import numpy as np
+from tsdiag.batch import BatchDiagnostics
+from tsdiag.core import StationarityResult, InvertibilityResult
+from tsdiag.stationarity import batch_stationarity_check
+
+
+class TestFromMatrix:
+    """测试由同阶系数矩阵构建"""
+    
+    def test_basic_fields(self):
+        """测试各字段的取值"""
+        diagnostics = BatchDiagnostics.from_matrix([[0.5, 0.0], [1.2, -0.1], [0.95, 0.0]])
+        
+        assert len(diagnostics) == 3
+        assert diagnostics.flags.tolist() == [True, False, True]
+        assert diagnostics.risk_levels.tolist() == ['low', 'high', 'medium']
+        # 最高次项系数为零时只有一个有限根
+        assert diagnostics.num_roots.tolist() == [1, 2, 1]
+        assert diagnostics.margins[0] == pytest.approx(1.0)
+    
+    def test_materialize_row(self):
+        """测试按下标构建结果对象"""
+        diagnostics = BatchDiagnostics.from_matrix([[0.5], [1.1]], kind='ma')
+        result = diagnostics[1]
+        
+        assert isinstance(result, InvertibilityResult)
+        assert not result.is_invertible
+        assert result.ma_coefficients == [1.1]
+        assert result.roots[0].magnitude == pytest.approx(1 / 1.1)
+    
+    @pytest.mark.skipif(
+        np.finfo(np.longdouble).eps == np.finfo(float).eps,
+        reason="当前平台的 np.longdouble 与 float64 精度相同"
+    )
+    def test_precision_escalated(self):
+        """测试结果对象沿用批量求根时的扩展精度修正标记"""
+        # 特征多项式为 (1 - z/(1+1e-7))²，两个根都落在不确定带内
+        radius = 1 + 1e-7
+        diagnostics = BatchDiagnostics.from_models([[2.0 / radius, -1.0 / radius ** 2], [0.5]])
+        
+        assert diagnostics.escalated.tolist() == [True, False]
+        assert diagnostics[0].precision_escalated
+        assert not diagnostics[1:][0].precision_escalated
+    
+    def test_unknown_kind(self):
+        """测试未知的模型类型"""
+        with pytest.raises(ValueError, match="未知的模型类型"):
+            BatchDiagnostics.from_matrix([[0.5]], kind='arma')
+
+
+class TestFromModels:
+    """测试由混合阶数的模型列表构建"""
+    
+    def setup_method(self):
+        self.models = [[0.5, -0.3], [1.1], [], [0.95], [1.2, -0.1, 0.05]]
+        self.diagnostics = BatchDiagnostics.from_models(self.models, bucket_width=4)
+    
+    def test_original_order(self):
+        """测试结果保持原始顺序"""
+        assert self.diagnostics.indices.tolist() == [0, 1, 2, 3, 4]
+        assert self.diagnostics.has_error.tolist() == [False, False, True, False, False]
+        assert self.diagnostics.errors[2] == "AR系数不能为空"
+        assert self.diagnostics[2] is None
+    
+    def test_matches_batch_check(self):
+        """测试与字典列表形式的批量检验结果一致"""
+        expected = batch_stationarity_check(self.models)
+        records = self.diagnostics.to_records()
+        
+        for record, reference in zip(records, expected):
+            assert record['model_name'] == reference['model_name']
+            assert record['is_stationary'] == reference['is_stationary']
+            if 'error' in reference:
+                assert record['error'] == reference['error']
+                continue
+            assert record['coefficients'] == reference['coefficients']
+            assert record['risk_level'] == reference['risk_level']
+            assert record['stability_margin'] == pytest.approx(reference['stability_margin'])
+            assert isinstance(record['result'], StationarityResult)
+    
+    def test_filter_and_sort(self):
+        """测试向量化的过滤和排序"""
+        passed = self.diagnostics.filter(self.diagnostics.flags)
+        assert passed.indices.tolist() == [0, 3]
+        assert passed[1].ar_coefficients == [0.95]
+        
+        ordered = self.diagnostics.sort('margin')
+        assert ordered.indices[-1] == 2  # 出错的模型排在最后
+        assert np.all(np.diff(ordered.margins[:-1]) >= 0)
+        
+        descending = self.diagnostics.sort('margin', descending=True)
+        assert descending.indices[0] == 0
+    
+    def test_slicing(self):
+        """测试切片和下标数组"""
+        tail = self.diagnostics[3:]
+        assert tail.indices.tolist() == [3, 4]
+        assert tail[1].ar_coefficients == [1.2, -0.1, 0.05]
+        assert tail._names().tolist() == ['Model_4', 'Model_5']
+        
+        picked = self.diagnostics[[4, 0]]
+        assert picked[0].ar_coefficients == [1.2, -0.1, 0.05]
+        assert len(picked[1].roots) == 2
+    
+    def test_model_names(self):
+        """测试自定义模型名称"""
+        names = ['a', 'b', 'c', 'd', 'e']
+        diagnostics = BatchDiagnostics.from_models(self.models, model_names=names)
+        assert diagnostics.filter(diagnostics.flags).model_names.tolist() == ['a', 'd']
+        
+        with pytest.raises(ValueError, match="模型名称数量必须与模型数量相同"):
+            BatchDiagnostics.from_models(self.models, model_names=['a'])
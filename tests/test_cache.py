@@ -0,0 +1,225 @@
+"""
+检验结果缓存测试
+"""
+
+import pytest
+import numpy as np
+from tsdiag import core
+from tsdiag.cache import (
+    DiagnosticsCache,
+    DiskDiagnosticsCache,
+    enable_cache,
+    disable_cache,
+    get_cache
+)
+from tsdiag.core import stationarity_check, invertibility_check
+from tsdiag.api import analyze_model_stability
+
+
+@pytest.fixture
+def cache():
+    """启用全局缓存，测试结束后停用"""
+    yield enable_cache(max_entries=16)
+    disable_cache()
+
+
+class TestDiagnosticsCache:
+    """测试LRU缓存本身"""
+    
+    def test_canonical_key(self):
+        """测试键的规范化"""
+        cache = DiagnosticsCache()
+        assert cache.make_key([0.5, -0.0]) == cache.make_key(np.array([0.5]))
+        assert cache.make_key([0.5, 0.2]) != cache.make_key([0.5, 0.2000001])
+    
+    def test_quantized_key(self):
+        """测试量化后的键"""
+        cache = DiagnosticsCache(tolerance=1e-4)
+        assert cache.make_key([0.5, 0.2]) == cache.make_key([0.50001, 0.2000001, 1e-6])
+        assert cache.make_key([0.5]) != DiagnosticsCache(tolerance=1e-3).make_key([0.5])
+    
+    def test_entry_limit(self):
+        """测试按条目数淘汰"""
+        cache = DiagnosticsCache(max_entries=2)
+        for i in range(3):
+            cache.put((i,), np.array([complex(i)]))
+        
+        assert len(cache) == 2
+        assert cache.get((0,)) is None
+        assert cache.get((2,)) is not None
+        assert cache.stats()['evictions'] == 1
+    
+    def test_lru_order(self):
+        """测试最近使用的条目被保留"""
+        cache = DiagnosticsCache(max_entries=2)
+        cache.put((0,), np.zeros(1))
+        cache.put((1,), np.zeros(1))
+        cache.get((0,))
+        cache.put((2,), np.zeros(1))
+        
+        assert cache.get((0,)) is not None
+        assert cache.get((1,)) is None
+    
+    def test_byte_limit(self):
+        """测试按字节数淘汰"""
+        cache = DiagnosticsCache(max_entries=None, max_bytes=1000)
+        for i in range(10):
+            cache.put((i,), np.zeros(20, dtype=complex))
+        
+        stats = cache.stats()
+        assert stats['bytes'] <= 1000
+        assert stats['entries'] == 1
+    
+    def test_cached_roots_read_only(self):
+        """测试缓存中的根数组不可修改"""
+        cache = DiagnosticsCache()
+        roots = cache.put((0.5,), np.array([2.0]))
+        with pytest.raises(ValueError):
+            roots[0] = 1.0
+    
+    def test_invalid_limits(self):
+        """测试无效的容量设置"""
+        with pytest.raises(ValueError):
+            DiagnosticsCache(max_entries=None, max_bytes=None)
+        with pytest.raises(ValueError):
+            DiagnosticsCache(tolerance=0)
+
+
+class TestDiskDiagnosticsCache:
+    """测试SQLite磁盘缓存"""
+    
+    def test_round_trip(self, tmp_path):
+        """测试写入后重新打开仍可读取"""
+        path = tmp_path / "cache.sqlite3"
+        store = DiskDiagnosticsCache(path)
+        store.put((-0.5, 0.3), np.array([1 + 2j, 1 - 2j]))
+        store.close()
+        
+        store = DiskDiagnosticsCache(path)
+        assert np.array_equal(store.get((-0.5, 0.3)), [1 + 2j, 1 - 2j])
+        assert store.get((0.5,)) is None
+        store.close()
+    
+    def test_quantized_key_round_trip(self, tmp_path):
+        """测试量化键可以序列化"""
+        store = DiskDiagnosticsCache(tmp_path / "cache.sqlite3")
+        key = DiagnosticsCache(tolerance=1e-4).make_key([0.5, 0.2])
+        store.put(key, np.array([2.0]))
+        assert store.hottest(1)[0][0] == key
+        store.close()
+    
+    def test_ttl(self, tmp_path, monkeypatch):
+        """测试过期条目不再返回且会被淘汰"""
+        store = DiskDiagnosticsCache(tmp_path / "cache.sqlite3", ttl=60)
+        store.put((0.5,), np.array([2.0]))
+        
+        now = __import__('time').time()
+        monkeypatch.setattr('tsdiag.cache.time.time', lambda: now + 120)
+        assert store.get((0.5,)) is None
+        assert store.evict() == 1
+        assert len(store) == 0
+        store.close()
+    
+    def test_max_entries(self, tmp_path):
+        """测试超出条目数上限时删除最久未访问的条目"""
+        store = DiskDiagnosticsCache(tmp_path / "cache.sqlite3", max_entries=2)
+        for i in range(4):
+            store.put((float(i),), np.array([complex(i)]))
+        store.evict()
+        
+        assert len(store) == 2
+        store.close()
+    
+    def test_buffered_hits(self, tmp_path, monkeypatch):
+        """测试命中信息先在内存中累积，写入、超过间隔或关闭时才写回"""
+        import sqlite3
+        
+        path = tmp_path / "cache.sqlite3"
+        store = DiskDiagnosticsCache(path)
+        store.put((0.5,), np.array([2.0]))
+        store.put((0.25,), np.array([4.0]))
+        
+        def stored_hits():
+            with sqlite3.connect(path) as reader:
+                return dict(reader.execute("SELECT key, hits FROM roots").fetchall())
+        
+        store.get((0.5,))
+        store.get((0.5,))
+        assert stored_hits() == {'[0.5]': 0, '[0.25]': 0}
+        
+        store.put((0.125,), np.array([8.0]))
+        assert stored_hits() == {'[0.5]': 2, '[0.25]': 0, '[0.125]': 0}
+        
+        monkeypatch.setattr(DiskDiagnosticsCache, 'HIT_FLUSH_INTERVAL', 0.0)
+        store.get((0.25,))
+        assert stored_hits()['[0.25]'] == 1
+        
+        monkeypatch.setattr(DiskDiagnosticsCache, 'HIT_FLUSH_INTERVAL', 60.0)
+        store.get((0.125,))
+        store.close()
+        assert stored_hits()['[0.125]'] == 1
+    
+    def test_restart_and_warm_up(self, tmp_path, monkeypatch):
+        """测试重启后预加载最热的条目"""
+        # 使用预筛选无法判定、必须求根的模型
+        path = str(tmp_path / "cache.sqlite3")
+        enable_cache(path=path)
+        stationarity_check([1.2, -0.5])
+        stationarity_check([1.5, -0.6])
+        get_cache().store.get(get_cache().make_key([-1.5, 0.6]))
+        disable_cache()
+        
+        cache = enable_cache(path=path, warm_up=1)
+        try:
+            assert len(cache) == 1
+            
+            def fail(p):
+                raise AssertionError("不应重新求根")
+            
+            monkeypatch.setattr(core.np, 'roots', fail)
+            assert stationarity_check([1.5, -0.6]).is_stationary
+            assert stationarity_check([1.2, -0.5]).is_stationary
+            assert cache.stats()['hits'] == 1
+            assert cache.stats()['store_hits'] == 1
+        finally:
+            disable_cache()
+
+
+class TestCachedChecks:
+    """测试检验函数使用全局缓存"""
+    
+    def test_disabled_by_default(self):
+        """测试默认不启用缓存"""
+        assert get_cache() is None
+    
+    def test_hits_and_misses(self, cache):
+        """测试重复检验命中缓存"""
+        # 使用预筛选无法判定、必须求根的模型
+        first = stationarity_check([1.2, -0.5])
+        second = stationarity_check([1.2, -0.5])
+        
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        assert first == second
+    
+    def test_ar_ma_share_entry(self, cache):
+        """测试系数互为相反数的AR和MA模型共用缓存条目"""
+        ar_result = stationarity_check([1.2, -0.5])
+        ma_result = invertibility_check([-1.2, 0.5])
+        
+        assert len(cache) == 1
+        assert cache.hits == 1
+        assert ma_result.ma_coefficients == [-1.2, 0.5]
+        assert ma_result.is_invertible == ar_result.is_stationary
+    
+    def test_analyze_model_stability(self, cache, monkeypatch):
+        """测试综合分析复用缓存的根"""
+        analyze_model_stability([0.5], [0.4])
+        
+        def fail(p):
+            raise AssertionError("不应重新求根")
+        
+        monkeypatch.setattr(core.np, 'roots', fail)
+        analysis = analyze_model_stability([0.5], [0.4])
+        assert analysis['ar']['is_stationary']
+        assert cache.hits == 2
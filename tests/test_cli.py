@@ -0,0 +1,151 @@
+"""
+命令行接口测试
+"""
+
+import csv
+import io
+import json
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from tsdiag.cli import main
+
+
+@pytest.fixture
+def runner():
+    return CliRunner()
+
+
+class TestBatchCommand:
+    """测试batch子命令"""
+    
+    def test_jsonl_input(self, runner):
+        """测试按输入顺序输出结果"""
+        lines = '{"ar": [0.5], "name": "a"}\n{"ma": [0.4]}\n'
+        result = runner.invoke(main, ['batch', '--jobs', '2', '--chunk-size', '1'], input=lines)
+        
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r['model_name'] for r in records] == ['a', 'Model_2']
+        assert records[0]['ar']['is_stationary']
+    
+    def test_exit_codes(self, runner):
+        """测试存在未通过模型或错误时的退出码"""
+        assert runner.invoke(main, ['batch'], input='{"ar": [1.2]}\n').exit_code == 1
+        
+        result = runner.invoke(main, ['batch'], input='{"ar": [0.5]}\nnot json\n')
+        assert result.exit_code == 2
+        assert "第2行不是有效的JSON" in json.loads(result.stdout.splitlines()[1])['error']
+    
+    def test_names_across_chunks(self, runner):
+        """测试名称随模型一起分块，解析失败的行不会打乱后续模型的名称"""
+        lines = '{"ar": [0.5], "name": "a"}\nnot json\n{"ma": [0.4]}\n{"ar": [0.2], "name": "d"}\n{"ar": [0.1]}\n'
+        result = runner.invoke(main, ['batch', '--chunk-size', '2'], input=lines)
+        
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r['model_name'] for r in records] == ['a', 'Model_2', 'Model_3', 'd', 'Model_5']
+        assert [r['model_index'] for r in records] == [0, 1, 2, 3, 4]
+        assert 'error' in records[1] and records[3]['ar']['is_stationary']
+    
+    def test_csv_input_and_output(self, runner, tmp_path):
+        """测试CSV输入、CSV输出和汇总信息"""
+        path = tmp_path / 'models.csv'
+        path.write_text('name,ar,ma\na,0.5 -0.3,0.4\nb,1.2,\n', encoding='utf-8')
+        
+        result = runner.invoke(main, ['batch', str(path), '--output-format', 'csv', '--chunk-size', '1'])
+        
+        assert result.exit_code == 1
+        rows = list(csv.DictReader(io.StringIO(result.stdout)))
+        assert [row['model_name'] for row in rows] == ['a', 'b']
+        assert rows[0]['model_valid'] == 'True'
+        assert rows[1]['is_stationary'] == 'False'
+        assert "总计 2 个模型：通过 1，未通过 1，错误 0" in result.stderr
+    
+    def test_npy_input(self, runner, tmp_path):
+        """测试npy输入按 --kind 解释，并写入输出文件"""
+        path = tmp_path / 'coeffs.npy'
+        np.save(path, np.array([[0.5, 0.2], [0.3, 0.1]]))
+        output = tmp_path / 'results.jsonl'
+        
+        result = runner.invoke(main, ['batch', str(path), '--kind', 'ma', '-o', str(output), '--quiet'])
+        
+        assert result.exit_code == 0
+        assert result.stderr == ''
+        records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+        assert len(records) == 2
+        assert all(r['ma']['is_invertible'] for r in records)
+    
+    def test_npy_output(self, runner, tmp_path):
+        """测试npy输入按窗口检验并写入内存映射输出"""
+        path = tmp_path / 'coeffs.npy'
+        np.save(path, np.array([[0.5, 0.2], [1.2, 0.1], [0.3, 0.1]]))
+        output = tmp_path / 'flags.npy'
+        
+        args = ['batch', str(path), '-o', str(output), '--output-format', 'npy', '--chunk-size', '2']
+        result = runner.invoke(main, args)
+        
+        assert result.exit_code == 1
+        assert np.load(output)['flag'].tolist() == [True, False, True]
+        assert "总计 3 个模型：通过 2，未通过 1" in result.stderr
+        
+        result = runner.invoke(main, ['batch', str(path), '--output-format', 'npy'])
+        assert result.exit_code == 2
+        assert "必须通过 --output 指定文件" in result.stderr
+    
+    def test_npy_output_non_finite_rows(self, runner, tmp_path):
+        """测试npy输出中包含NaN的行记为错误"""
+        path = tmp_path / 'coeffs.npy'
+        np.save(path, np.array([[0.5, 0.2], [np.nan, 0.1], [0.3, 0.1]]))
+        output = tmp_path / 'flags.npy'
+        
+        result = runner.invoke(main, ['batch', str(path), '-o', str(output), '--output-format', 'npy'])
+        
+        assert result.exit_code == 2
+        saved = np.load(output)
+        assert saved['flag'].tolist() == [True, False, True]
+        assert saved['error'].tolist() == [False, True, False]
+        assert "总计 3 个模型：通过 2，未通过 0，错误 1" in result.stderr
+    
+    def test_parquet_input(self, runner, tmp_path):
+        """测试Parquet输入"""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+        
+        path = tmp_path / 'models.parquet'
+        pq.write_table(pa.table({'name': ['a', 'b'], 'ar': [[0.5], [1.2]]}), str(path))
+        
+        result = runner.invoke(main, ['batch', str(path), '--quiet'])
+        
+        assert result.exit_code == 1
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r['model_name'] for r in records] == ['a', 'b']
+        assert not records[1]['ar']['is_stationary']
+    
+    def test_unknown_extension(self, runner, tmp_path):
+        """测试无法推断格式时报错"""
+        path = tmp_path / 'models.txt'
+        path.write_text('0.5\n', encoding='utf-8')
+        
+        result = runner.invoke(main, ['batch', str(path)])
+        assert result.exit_code == 2
+        assert "无法根据扩展名推断输入格式" in result.stderr
+
+
+class TestStreamCommand:
+    """测试stream子命令"""
+    
+    def test_compact_output(self, runner):
+        """测试每行输入对应一行紧凑的JSON输出"""
+        result = runner.invoke(main, ['stream', '--kind', 'arma', '--max-batch', '2'], input='0.5|0.4\n|1.5\n0.3\n')
+        
+        assert result.exit_code == 1
+        lines = result.stdout.splitlines()
+        assert len(lines) == 3
+        assert ' ' not in lines[0]
+        assert [json.loads(line)['model_valid'] for line in lines] == [True, False, True]
+    
+    def test_exit_code_on_error(self, runner):
+        """测试存在无法解析的行时退出码为2"""
+        result = runner.invoke(main, ['stream'], input='0.5\nabc\n')
+        assert result.exit_code == 2
+        assert "无法解析AR系数字符串" in json.loads(result.stdout.splitlines()[1])['error']
@@ -4,16 +4,47 @@
 
 import pytest
 import numpy as np
+from tsdiag import core
 from tsdiag.core import (
     stationarity_check,
     invertibility_check,
+    stationarity_check_batch,
+    invertibility_check_batch,
+    open_result_memmap,
+    aberth_roots,
+    set_root_solver,
+    set_prefilter,
+    prefilter_stats,
+    reset_prefilter_stats,
+    set_precision_escalation,
+    set_kernel_backend,
     StationarityResult,
     InvertibilityResult,
     RootInfo,
     _validate_coefficients,
     _build_characteristic_polynomial,
-    _compute_polynomial_roots
+    _compute_polynomial_roots,
+    _companion_matrices,
+    _bucketed_check,
+    _group_indices_by_order
 )
+from tsdiag import _kernels
+
+
+@pytest.fixture(autouse=True, params=['numpy', 'loops'])
+def kernel_backend(request, monkeypatch):
+    """
+    每个测试分别在NumPy内核和循环内核下运行
+    
+    未安装numba时循环内核以普通Python函数执行，同样覆盖内核的分派逻辑。
+    """
+    if request.param == 'loops':
+        monkeypatch.setattr(_kernels, 'NUMBA_AVAILABLE', True)
+        set_kernel_backend('numba')
+    else:
+        set_kernel_backend('numpy')
+    yield request.param
+    set_kernel_backend('auto')
 
 
 class TestValidateCoefficients:
@@ -209,6 +240,547 @@ class TestInvertibilityCheck:
             invertibility_check("invalid")
 
 
+class TestBatchChecks:
+    """测试同阶模型的批量检验"""
+    
+    def test_companion_matrices_shape(self):
+        """测试伴随矩阵的构建"""
+        companions = _companion_matrices(np.array([[0.5, -0.3], [0.1, 0.2]]))
+        assert companions.shape == (2, 2, 2)
+        assert np.allclose(companions[0], [[-0.5, 0.3], [1.0, 0.0]])
+    
+    def test_stationarity_matches_single_check(self):
+        """测试批量结果与单模型检验一致"""
+        models = np.array([[0.5, -0.06], [1.2, -0.1], [0.1, 0.2], [1.0, 0.0]])
+        batch = stationarity_check_batch(models)
+        
+        assert batch.flags.shape == (4,)
+        assert batch.roots.shape == (4, 2)
+        for row, coeffs in enumerate(models):
+            single = stationarity_check(coeffs)
+            assert batch.flags[row] == single.is_stationary
+            expected_min = min(root.magnitude for root in single.roots)
+            assert abs(batch.min_moduli[row] - expected_min) < 1e-10
+    
+    def test_invertibility_matches_single_check(self):
+        """测试批量可逆性结果与单模型检验一致"""
+        models = [[0.5, 0.06], [1.2, 0.1], [-0.4, 0.3]]
+        batch = invertibility_check_batch(models)
+        
+        for row, coeffs in enumerate(models):
+            assert batch.flags[row] == invertibility_check(coeffs).is_invertible
+    
+    def test_zero_leading_coefficient(self):
+        """测试最高次项系数为零的模型"""
+        batch = stationarity_check_batch([[0.5, 0.0], [0.0, 0.0]])
+        assert batch.flags.tolist() == [True, True]
+        assert abs(batch.min_moduli[0] - 2.0) < 1e-10
+        assert np.isinf(batch.min_moduli[1])
+    
+    def test_invalid_matrix(self):
+        """测试无效的系数矩阵"""
+        with pytest.raises(ValueError):
+            stationarity_check_batch([0.5, 0.3])
+        
+        with pytest.raises(ValueError):
+            invertibility_check_batch(np.zeros((3, 0)))
+    
+    def test_non_finite_rows(self):
+        """测试包含非有限数值的行给出与单模型检验相同的错误信息"""
+        with pytest.raises(ValueError, match="AR系数必须都是有限数值（第1行）"):
+            stationarity_check_batch([[0.5, 0.1], [np.nan, 0.2]])
+        
+        with pytest.raises(ValueError, match="MA系数必须都是有限数值（第12行）"):
+            invertibility_check_batch(np.vstack([np.zeros((12, 2)), [[np.inf, 0.0]]]), window=5)
+    
+    def test_schur_matches_roots(self):
+        """测试Schur–Cohn递推与求根方法的判定一致"""
+        rng = np.random.default_rng(0)
+        for order in (1, 2, 5, 12):
+            models = rng.normal(scale=0.6, size=(200, order))
+            for check in (stationarity_check_batch, invertibility_check_batch):
+                by_roots = check(models)
+                by_schur = check(models, method='schur')
+                assert by_schur.roots is None
+                assert by_schur.min_moduli is None
+                assert np.array_equal(by_schur.flags, by_roots.flags)
+    
+    def test_schur_unit_root(self):
+        """测试Schur–Cohn递推对单位根的判定"""
+        flags = stationarity_check_batch([[1.0], [0.999], [-1.0]], method='schur').flags
+        assert flags.tolist() == [False, True, False]
+        assert not stationarity_check_batch([[0.5, 0.5]], method='schur').flags[0]
+    
+    def test_schur_near_double_root(self):
+        """测试单位圆外附近的重根（模长约1+1e-8）两种方法判定一致"""
+        models = [[1.9999999800000003, -0.9999999800000006], [2.0, -1.0]]
+        by_roots = stationarity_check_batch(models).flags
+        by_schur = stationarity_check_batch(models, method='schur').flags
+        
+        assert by_roots.tolist() == [True, False]
+        assert np.array_equal(by_schur, by_roots)
+        assert invertibility_check_batch([[-m for m in models[0]]], method='schur').flags[0]
+    
+    def test_unknown_method(self):
+        """测试未知的判定方法"""
+        with pytest.raises(ValueError, match="未知的判定方法"):
+            stationarity_check_batch([[0.5]], method='invalid')
+
+
+class TestWindowedBatch:
+    """测试按窗口处理的同阶批量检验和内存映射输入输出"""
+    
+    @pytest.fixture
+    def models(self):
+        return np.random.default_rng(1).normal(scale=0.5, size=(103, 3))
+    
+    def test_windows_match_single_pass(self, models):
+        """测试分窗口结果与整体计算一致"""
+        whole = stationarity_check_batch(models, window=len(models))
+        windowed = stationarity_check_batch(models, window=10)
+        
+        assert np.array_equal(windowed.flags, whole.flags)
+        assert np.allclose(windowed.min_moduli, whole.min_moduli)
+        assert np.allclose(windowed.roots, whole.roots)
+        assert windowed.escalated.shape == (103,)
+        assert invertibility_check_batch(models, method='schur', window=7).min_moduli is None
+    
+    def test_default_window_scales_with_order(self, monkeypatch):
+        """测试默认窗口按元素预算随阶数缩小"""
+        assert core._default_window(1) == core._MATRIX_WINDOW_ELEMENTS
+        assert core._default_window(64) == core._MATRIX_WINDOW_ELEMENTS // 4096
+        assert core._default_window(10 ** 6) == 1
+    
+        windows = []
+        original = core._batch_decide
+    
+        def recording_decide(poly_tail, method):
+            windows.append(len(poly_tail))
+            return original(poly_tail, method)
+    
+        monkeypatch.setattr(core, '_MATRIX_WINDOW_ELEMENTS', 100)
+        monkeypatch.setattr(core, '_batch_decide', recording_decide)
+        stationarity_check_batch(np.zeros((30, 4)))
+        assert windows == [6, 6, 6, 6, 6]
+    
+    def test_memmap_input_and_output(self, models, tmp_path):
+        """测试内存映射的float32输入和结构化输出"""
+        path = str(tmp_path / 'coeffs.npy')
+        np.save(path, models.astype(np.float32))
+        matrix = np.load(path, mmap_mode='r')
+        
+        out = open_result_memmap(str(tmp_path / 'out.npy'), len(matrix))
+        result = invertibility_check_batch(matrix, window=16, out=out)
+        expected = invertibility_check_batch(np.asarray(matrix, dtype=float))
+        
+        assert result.roots is None
+        assert np.array_equal(result.flags, expected.flags)
+        saved = np.load(str(tmp_path / 'out.npy'))
+        assert np.allclose(saved['min_modulus'], expected.min_moduli)
+    
+    def test_schur_output(self, models):
+        """测试Schur–Cohn递推写入输出数组时最小根模长为NaN"""
+        out = np.zeros(len(models), dtype=core.BATCH_RESULT_DTYPE)
+        stationarity_check_batch(models, method='schur', out=out)
+        
+        assert np.array_equal(out['flag'], stationarity_check_batch(models).flags)
+        assert np.all(np.isnan(out['min_modulus']))
+    
+    def test_invalid_arguments(self, models):
+        """测试无效的窗口和输出数组"""
+        with pytest.raises(ValueError, match="window"):
+            stationarity_check_batch(models, window=0)
+        with pytest.raises(TypeError, match="结构化数组"):
+            stationarity_check_batch(models, out=np.zeros(len(models)))
+        with pytest.raises(ValueError, match="长度"):
+            stationarity_check_batch(models, out=np.zeros(5, dtype=core.BATCH_RESULT_DTYPE))
+        with pytest.raises(ValueError):
+            stationarity_check_batch(np.zeros((2, 3, 1)))
+
+
+class TestBucketedCheck:
+    """测试按阶数分桶的批量检验"""
+    
+    def test_group_by_bucket_width(self):
+        """测试阶数向上取整到分桶宽度"""
+        coefficients = {0: [0.1], 1: [0.1] * 3, 2: [0.1] * 4, 3: [0.1] * 5}
+        assert _group_indices_by_order(coefficients) == {1: [0], 3: [1], 4: [2], 5: [3]}
+        assert _group_indices_by_order(coefficients, bucket_width=4) == {4: [0, 1, 2], 8: [3]}
+    
+    def test_padding_preserves_roots(self):
+        """测试补零后的结果与单模型检验一致"""
+        rng = np.random.default_rng(1)
+        coefficients = {i: list(rng.normal(scale=0.4, size=i % 7 + 1)) for i in range(30)}
+        outcomes = _bucketed_check(coefficients, stationarity_check_batch, bucket_width=8)
+        
+        assert sorted(outcomes) == list(range(30))
+        for i, (flag, min_modulus, roots, _) in outcomes.items():
+            single = stationarity_check(coefficients[i])
+            assert flag == single.is_stationary
+            assert len(roots) == len(single.roots)
+            expected = sorted(root.magnitude for root in single.roots)
+            assert np.allclose(sorted(np.abs(roots)), expected)
+            assert min_modulus == pytest.approx(expected[0])
+    
+    def test_schur_outcomes(self):
+        """测试分桶使用Schur–Cohn递推"""
+        outcomes = _bucketed_check({0: [0.5], 1: [1.2, -0.1]}, stationarity_check_batch, 4, method='schur')
+        assert outcomes == {0: (True, None, None, None), 1: (False, None, None, None)}
+
+
+class TestAberthRoots:
+    """测试Aberth–Ehrlich求根"""
+    
+    def test_matches_numpy_roots(self):
+        """测试与np.roots的结果一致"""
+        rng = np.random.default_rng(2)
+        for order in (1, 3, 40, 300):
+            poly = np.concatenate([[1.0], rng.normal(scale=0.5 / np.sqrt(order), size=order)])
+            result = aberth_roots(poly)
+            expected = np.roots(poly[::-1])
+            
+            assert result.converged
+            assert len(result.roots) == order
+            assert np.allclose(np.sort(np.abs(result.roots)), np.sort(np.abs(expected)))
+    
+    def test_zero_coefficients(self):
+        """测试最高次项和常数项的零系数"""
+        result = aberth_roots([0.0, 1.0, -0.5, 0.0])
+        assert sorted(np.abs(result.roots)) == pytest.approx([0.0, 2.0])
+    
+    def test_warm_start(self):
+        """测试从上一次的根热启动时迭代次数更少"""
+        rng = np.random.default_rng(3)
+        poly = np.concatenate([[1.0], rng.normal(scale=0.05, size=100)])
+        cold = aberth_roots(poly)
+        
+        perturbed = poly + np.concatenate([[0.0], rng.normal(scale=1e-6, size=100)])
+        warm = aberth_roots(perturbed, initial_roots=cold.roots)
+        
+        assert warm.converged
+        assert warm.iterations < cold.iterations
+        
+        with pytest.raises(ValueError, match="初始根的个数"):
+            aberth_roots(poly, initial_roots=cold.roots[:10])
+    
+    def test_threshold_selection(self, monkeypatch):
+        """测试达到阶数阈值时使用Aberth–Ehrlich迭代"""
+        def fail(p):
+            raise AssertionError("不应调用np.roots")
+        
+        set_root_solver(aberth_min_order=2)
+        try:
+            monkeypatch.setattr(np, 'roots', fail)
+            result = stationarity_check([0.5, -0.06])
+            assert result.is_stationary
+            assert sorted(root.magnitude for root in result.roots) == pytest.approx([10 / 3, 5.0])
+        finally:
+            set_root_solver()
+    
+    def test_fallback_when_not_converged(self):
+        """测试未收敛时回退到np.roots"""
+        set_root_solver(aberth_min_order=1, max_iter=1)
+        try:
+            result = stationarity_check([0.5, -0.06])
+            assert sorted(root.magnitude for root in result.roots) == pytest.approx([10 / 3, 5.0])
+        finally:
+            set_root_solver()
+
+
+class TestPrefilter:
+    """测试系数预筛选"""
+    
+    @pytest.fixture(autouse=True)
+    def clean_stats(self):
+        reset_prefilter_stats()
+        yield
+        set_prefilter(True)
+        reset_prefilter_stats()
+    
+    def test_decisions(self):
+        """测试接受、拒绝和无法判定的情况"""
+        tail = np.array([
+            [-0.5, -0.3],   # Σ|c| < 1
+            [-1.0, 0.0],    # 单位根，P(1) = 0
+            [0.5, 1.2],     # 最高次系数 ≥ 1
+            [1.5, 0.0],     # 补零后的MA(1)，|θ| > 1
+            [-1.2, 0.5],    # 复根在单位圆外，需要求根
+        ])
+        assert core._prefilter(tail).tolist() == [
+            core._PREFILTER_ACCEPTED,
+            core._PREFILTER_REJECTED,
+            core._PREFILTER_REJECTED,
+            core._PREFILTER_REJECTED,
+            core._PREFILTER_UNDECIDED,
+        ]
+    
+    def test_consistent_with_roots(self):
+        """测试预筛选的判定与求根结果一致"""
+        rng = np.random.default_rng(5)
+        tail = rng.uniform(-1.2, 1.2, size=(2000, 4)) / np.arange(1, 5)
+        decisions = core._prefilter(tail)
+        flags = stationarity_check_batch(-tail).flags
+        
+        decided = decisions != core._PREFILTER_UNDECIDED
+        assert np.any(decided)
+        assert np.array_equal(flags[decided], decisions[decided] == core._PREFILTER_ACCEPTED)
+        
+        # 单模型的纯Python实现与向量化实现一致
+        single = [core._prefilter_decision([1.0] + row.tolist()) for row in tail[:200]]
+        assert single == decisions[:200].tolist()
+    
+    def test_single_check_defers_roots(self, monkeypatch):
+        """测试预筛选判定后根在首次访问时才计算"""
+        calls = []
+        original = core._characteristic_roots
+        monkeypatch.setattr(core, '_characteristic_roots', lambda p: calls.append(p) or original(p))
+        
+        result = stationarity_check([0.5, 0.3])
+        assert result.is_stationary
+        assert calls == []
+        
+        assert len(result.roots) == 2
+        assert len(calls) == 1
+        assert result == core._build_stationarity_result([0.5, 0.3], [1, -0.5, -0.3], *original([1, -0.5, -0.3]))
+        
+        assert not invertibility_check([1.5]).is_invertible
+        assert prefilter_stats() == {'accepted': 1, 'rejected': 1, 'solved': 0}
+    
+    def test_schur_batch_counts(self):
+        """测试Schur–Cohn批量检验只对无法判定的模型递推"""
+        flags = stationarity_check_batch([[0.5, 0.3], [1.0, 0.0], [1.2, -0.5]], method='schur').flags
+        
+        assert flags.tolist() == [True, False, True]
+        assert prefilter_stats() == {'accepted': 1, 'rejected': 1, 'solved': 1}
+    
+    def test_roots_batch_defers_decided_rows(self, monkeypatch):
+        """测试求根批量检验只立即求解无法判定的模型，其余模型在读取根时才求解"""
+        models = [[0.5, 0.3], [1.0, 0.0], [1.2, -0.5]]
+        set_prefilter(False)
+        expected = stationarity_check_batch(models)
+        set_prefilter(True)
+        reset_prefilter_stats()
+        
+        sizes = []
+        original = core._batch_check
+        monkeypatch.setattr(core, '_batch_check', lambda tail: sizes.append(len(tail)) or original(tail))
+        
+        result = stationarity_check_batch(models)
+        assert result.flags.tolist() == [True, False, True]
+        assert sizes == [1]
+        assert prefilter_stats() == {'accepted': 1, 'rejected': 1, 'solved': 1}
+        
+        assert np.array_equal(result.min_moduli, expected.min_moduli)
+        assert np.array_equal(result.roots, expected.roots)
+        assert np.array_equal(result.escalated, expected.escalated)
+        assert sizes == [1, 2]
+    
+    def test_disabled(self):
+        """测试关闭预筛选"""
+        set_prefilter(False)
+        result = stationarity_check([0.5, 0.3])
+        
+        assert result.is_stationary
+        assert prefilter_stats() == {'accepted': 0, 'rejected': 0, 'solved': 0}
+
+
+def _double_root_ar(radius):
+    """特征多项式为 (1 - z/radius)² 的AR(2)系数"""
+    return [2.0 / radius, -1.0 / radius ** 2]
+
+
+class TestPrecisionEscalation:
+    """测试近单位根模型的扩展精度修正"""
+    
+    @pytest.fixture(autouse=True)
+    def restore_options(self):
+        yield
+        set_precision_escalation()
+    
+    @pytest.mark.skipif(
+        np.finfo(np.longdouble).eps == np.finfo(float).eps,
+        reason="当前平台的 np.longdouble 与 float64 精度相同"
+    )
+    def test_refined_roots(self):
+        """测试近重根被修正到扩展精度下的结果"""
+        # 系数舍入后，两个根的模长精确值为 1 + 9.7173200675e-8 和 1 + 1.0282679947e-7
+        result = stationarity_check(_double_root_ar(1 + 1e-7))
+        
+        assert result.precision_escalated
+        assert np.sort(np.abs(result.root_values)) - 1 == pytest.approx([9.7173200675e-8, 1.0282679947e-7], abs=1e-10)
+    
+    @pytest.mark.skipif(
+        np.finfo(np.longdouble).eps == np.finfo(float).eps,
+        reason="当前平台的 np.longdouble 与 float64 精度相同"
+    )
+    def test_unit_root_verdict(self):
+        """测试模长为 1 + 1e-8 的共轭复根判定为平稳"""
+        result = stationarity_check(_double_root_ar(1 + 1e-8))
+        
+        assert result.precision_escalated
+        assert result.is_stationary
+        assert np.abs(result.root_values) - 1 == pytest.approx([1e-8, 1e-8], abs=1e-10)
+    
+    def test_far_from_unit_circle(self):
+        """测试远离单位圆的模型不做修正"""
+        assert not stationarity_check([1.2, -0.5]).precision_escalated
+        assert not invertibility_check([0.5]).precision_escalated
+    
+    def test_prefiltered_results(self):
+        """测试预筛选直接判定的模型在根求出后报告是否经过修正"""
+        for coeffs in ([2.0, -1.0], [1.0], [1.0000000001]):
+            result = stationarity_check(coeffs)
+            assert not result.is_stationary
+            assert result.precision_escalated
+        
+        assert invertibility_check([-1.0]).precision_escalated
+        assert not stationarity_check([0.1]).precision_escalated
+    
+    def test_batch_escalation(self):
+        """测试批量检验只修正不确定带内的模型"""
+        batch = stationarity_check_batch([_double_root_ar(1 + 1e-7), [1.2, -0.5]])
+        
+        assert batch.escalated.tolist() == [True, False]
+        assert batch.flags.tolist() == [True, True]
+        assert stationarity_check_batch([[0.5]], method='schur').escalated is None
+    
+    def test_not_escalated_when_refinement_skipped(self, monkeypatch):
+        """测试根的个数不符或迭代失败时不标记为修正，并保留float64的根"""
+        roots = np.array([1.0 + 0j, 2.0 + 0j])
+        refined, escalated = core._refine_near_unit_circle([1.0, -1.0], roots)
+        assert not escalated
+        assert refined is roots
+        
+        monkeypatch.setattr(core, '_mpmath', None)
+        set_precision_escalation(max_iter=1)
+        coeffs = _double_root_ar(1 + 1e-7)
+        result = stationarity_check(coeffs)
+        expected = np.roots([-coeffs[1], -coeffs[0], 1.0]).astype(complex)
+        
+        assert not result.precision_escalated
+        assert np.allclose(np.sort_complex(result.root_values), np.sort_complex(expected), rtol=0, atol=0)
+        assert stationarity_check_batch([coeffs]).escalated.tolist() == [False]
+    
+    def test_longdouble_aberth_non_finite(self):
+        """测试修正量出现非有限值时不返回扰动后的根"""
+        # 导数在 z = 0 处为零，且零初值不受扰动
+        assert core._longdouble_aberth(np.array([-1.0, 0.0, 1.0]), np.array([0j, 1 + 0j]), np.array([True, False])) is None
+    
+    def test_disabled(self):
+        """测试关闭扩展精度修正"""
+        set_precision_escalation(False)
+        
+        assert not stationarity_check(_double_root_ar(1 + 1e-7)).precision_escalated
+        with pytest.raises(ValueError):
+            set_precision_escalation(band=0)
+
+
+class TestKernels:
+    """测试循环内核与NumPy实现一致"""
+    
+    def test_schur_cohn(self):
+        """测试Schur–Cohn递推"""
+        rng = np.random.default_rng(7)
+        tail = rng.uniform(-1.5, 1.5, size=(300, 5)) / np.arange(1, 6)
+        tail[0] = [-1.9999999800000003, 0.9999999800000006, 0.0, 0.0, 0.0]
+        band = core._SCHUR_AMBIGUOUS_BAND
+        
+        set_kernel_backend('numpy')
+        expected = core._schur_cohn_decisions(tail)
+        assert expected[0] == core._PREFILTER_UNDECIDED
+        assert np.array_equal(_kernels.schur_cohn_decide(tail, 1.0 - band, 1.0 + band), expected)
+    
+    def test_newton_corrections(self):
+        """测试Horner求值得到的Newton修正量"""
+        rng = np.random.default_rng(8)
+        coeffs = np.concatenate([[1.0], rng.normal(size=6)])
+        z = rng.normal(size=20) * 2 + 1j * rng.normal(size=20) * 2
+        
+        set_kernel_backend('numpy')
+        assert np.allclose(_kernels.newton_corrections(coeffs, z), core._newton_corrections(coeffs, z))
+    
+    def test_zero_derivative(self):
+        """测试导数为零时两种实现都返回非有限修正量，Aberth迭代正常结束"""
+        coeffs = np.array([1.0, 0.0, 1.0])
+        z = np.array([0.0 + 0j, 0.5 + 0.5j])
+        
+        set_kernel_backend('numpy')
+        expected = core._newton_corrections(coeffs, z)
+        # 未编译时循环内核的标量运算遵循NumPy的浮点错误设置，除以零会抛出异常
+        with np.errstate(divide='raise', invalid='raise'):
+            actual = _kernels.newton_corrections(coeffs, z)
+        assert np.array_equal(np.isfinite(actual), np.isfinite(expected))
+        assert np.allclose(actual[1], expected[1])
+    
+    def test_aberth_critical_point(self, kernel_backend):
+        """测试初值落在导数零点时不抛出异常"""
+        result = aberth_roots([1.0, 0.0, 1.0], initial_roots=np.array([0.0 + 0j, 0.5 + 0.5j]))
+        assert result.roots.shape == (2,)
+    
+    def test_classify_roots(self):
+        """测试根的分类和最小模长"""
+        roots = np.array([[2.0 + 0j, np.inf], [0.5j, 3.0], [np.inf, np.inf]])
+        flags, min_moduli = _kernels.classify_roots(roots, 1.0 + core._UNIT_CIRCLE_TOL)
+        
+        assert flags.tolist() == [True, False, True]
+        assert min_moduli.tolist() == [2.0, 0.5, np.inf]
+    
+    def test_backend_validation(self, monkeypatch):
+        """测试内核实现的参数检查"""
+        with pytest.raises(ValueError, match="未知的内核实现"):
+            set_kernel_backend('cuda')
+        
+        monkeypatch.setattr(_kernels, 'NUMBA_AVAILABLE', False)
+        with pytest.raises(ImportError):
+            set_kernel_backend('numba')
+
+
+class TestReentrancy:
+    """测试多线程并发调用"""
+    
+    def test_concurrent_checks(self):
+        """测试并发的单模型和批量检验与串行结果一致"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        rng = np.random.default_rng(11)
+        models = [rng.uniform(-0.9, 0.9, size=3) for _ in range(64)]
+        expected = [stationarity_check(m).is_stationary for m in models]
+        matrix = np.array(models)
+        
+        def work(i):
+            single = stationarity_check(models[i]).is_stationary
+            batch = stationarity_check_batch(matrix).flags[i]
+            return single, bool(batch)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(work, range(64)))
+        
+        assert [single for single, _ in results] == expected
+        assert [batch for _, batch in results] == expected
+    
+    def test_prefilter_counts(self):
+        """测试并发更新预筛选计数不会丢失"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        reset_prefilter_stats()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: stationarity_check([0.5]), range(400)))
+        
+        assert prefilter_stats()['accepted'] == 400
+        reset_prefilter_stats()
+    
+    def test_lazy_roots_shared(self):
+        """测试多个线程同时首次访问延迟求根的结果"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        result = stationarity_check([0.5, 0.3])
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            values = list(executor.map(lambda _: result.root_values, range(32)))
+        
+        assert all(np.array_equal(v, values[0]) for v in values)
+        assert len(values[0]) == 2
+
+
 class TestRootInfo:
     """测试根信息类"""
     
@@ -268,3 +840,26 @@ class TestResultClasses:
         assert "测试消息" in result_str
         assert "[0.5]" in result_str
         assert "✓" in result_str
+    
+    def test_lazy_result_from_array(self):
+        """测试由根数组构建的结果按需生成根信息和消息"""
+        result = StationarityResult(
+            is_stationary=False,
+            roots=np.array([0.5 + 0j, 2.0 + 0j]),
+            ar_coefficients=[2.5, -1.0],
+            characteristic_polynomial=[1.0, -2.5, 1.0]
+        )
+        assert result.message == "模型不满足平稳性条件：有1个根在单位圆内或单位圆上"
+        assert [root.magnitude for root in result.roots] == [0.5, 2.0]
+        assert isinstance(result.roots[0].value, complex)
+        assert not result.roots[0].is_outside_unit_circle
+        assert "✗" in str(result)
+    
+    def test_slots(self):
+        """测试结果对象使用__slots__"""
+        result = invertibility_check([0.5])
+        assert not hasattr(result, '__dict__')
+        assert not hasattr(result.roots[0], '__dict__')
+        assert result == invertibility_check([0.5])
+        assert result.root_values.dtype == complex
+
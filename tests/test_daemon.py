@@ -0,0 +1,196 @@
+"""
+常驻守护进程测试
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import pytest
+from tsdiag import daemon
+from tsdiag.daemon import DaemonServer, forward, launch, ping, stop
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="需要Unix域套接字")
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX路径长度有限，不使用pytest较深的临时目录
+    directory = tempfile.mkdtemp(prefix='tsdiag-')
+    yield os.path.join(directory, 'd.sock')
+    os.rmdir(directory)
+
+
+@pytest.fixture
+def server(socket_path):
+    server = DaemonServer(socket_path, cache_size=16)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    stop(socket_path)
+    thread.join(timeout=5)
+
+
+class TestDaemon:
+    """测试守护进程的请求处理"""
+    
+    def test_forward_commands(self, server, socket_path):
+        """测试转发子命令的输出和退出码"""
+        response = forward(['stationarity', '-c', '0.5,-0.3'], socket_path)
+        assert response['exit_code'] == 0
+        assert "平稳性检验结果: 平稳" in response['stdout']
+        
+        assert forward(['invertibility', '-c', '1.5'], socket_path)['exit_code'] == 1
+        
+        response = forward(['check', '-a', 'abc'], socket_path)
+        assert response['exit_code'] == 2
+        assert "无法解析AR系数字符串" in response['stdout'] + response['stderr']
+        
+        response = forward(['stationarity', '--bogus'], socket_path)
+        assert response['exit_code'] == 2
+        assert "No such option" in response['stderr']
+    
+    def test_rejects_other_commands(self, server, socket_path):
+        """测试只执行允许转发的子命令"""
+        response = forward(['batch', 'models.jsonl'], socket_path)
+        assert response['exit_code'] == 2
+        assert "只能转发" in response['stderr']
+    
+    def test_rejects_non_object_requests(self, server, socket_path):
+        """测试不是JSON对象的请求返回错误且守护进程继续运行"""
+        for body in (b'[]\n', b'"x"\n', b'null\n'):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(5)
+                client.connect(socket_path)
+                client.sendall(body)
+                client.shutdown(socket.SHUT_WR)
+                response = json.loads(client.makefile('rb').read())
+            assert response['exit_code'] == 2
+            assert "必须是JSON对象" in response['stderr']
+        
+        assert ping(socket_path) == os.getpid()
+    
+    def test_unexpected_error(self, server, socket_path, monkeypatch):
+        """测试执行命令时的意外异常返回错误响应且守护进程继续运行"""
+        def failing_command(argv):
+            raise RuntimeError("意外错误")
+        
+        monkeypatch.setattr(daemon, '_run_command', failing_command)
+        response = forward(['stationarity', '-c', '0.5'], socket_path)
+        
+        assert response['exit_code'] == 2
+        assert "意外错误" in response['stderr']
+        assert ping(socket_path) == os.getpid()
+    
+    def test_silent_client(self, server, socket_path, monkeypatch):
+        """测试连接后不发送请求的客户端不会长时间阻塞其他连接"""
+        monkeypatch.setattr(daemon, '_READ_TIMEOUT', 0.2)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+            silent.connect(socket_path)
+            assert ping(socket_path, timeout=5) == os.getpid()
+            
+            silent.settimeout(5)
+            assert "无效的请求" in json.loads(silent.makefile('rb').read())['stderr']
+    
+    def test_ping_and_stop(self, server, socket_path):
+        """测试状态检查和停止"""
+        assert ping(socket_path) == os.getpid()
+        assert stop(socket_path) == os.getpid()
+        
+        for _ in range(100):
+            if not os.path.exists(socket_path):
+                break
+            threading.Event().wait(0.05)
+        assert not os.path.exists(socket_path)
+        assert ping(socket_path) is None
+    
+    def test_already_running(self, server, socket_path):
+        """测试同一路径上不能启动第二个守护进程"""
+        with pytest.raises(RuntimeError, match="已在运行"):
+            DaemonServer(socket_path)
+    
+    def test_stale_socket(self, socket_path):
+        """测试删除异常退出留下的套接字文件"""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        
+        server = DaemonServer(socket_path, cache_size=0)
+        server.close()
+        assert not os.path.exists(socket_path)
+
+
+class TestLaunch:
+    """测试命令行入口的转发"""
+    
+    def test_forwards_when_running(self, server, socket_path, monkeypatch, capsys):
+        """测试守护进程运行时转发并使用其退出码"""
+        monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+        calls = []
+        monkeypatch.setattr(daemon, '_run_command', lambda argv: calls.append(argv) or {
+            'exit_code': 1, 'stdout': 'out\n', 'stderr': 'err\n'
+        })
+        
+        with pytest.raises(SystemExit) as exc_info:
+            launch(['stationarity', '-c', '1.2'])
+        
+        assert exc_info.value.code == 1
+        assert calls == [['stationarity', '-c', '1.2']]
+        assert capsys.readouterr() == ('out\n', 'err\n')
+    
+    def test_falls_back_without_daemon(self, socket_path, monkeypatch, capsys):
+        """测试守护进程未运行或禁止转发时在当前进程中执行"""
+        monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+        assert forward(['stationarity', '-c', '0.5'], socket_path) is None
+        
+        with pytest.raises(SystemExit) as exc_info:
+            launch(['stationarity', '-c', '0.5'])
+        assert exc_info.value.code == 0
+        assert "平稳" in capsys.readouterr().out
+    
+    def test_default_socket_path(self, monkeypatch):
+        """测试默认套接字路径的优先级"""
+        monkeypatch.setenv(daemon.SOCKET_ENV, '/run/a.sock')
+        assert daemon.default_socket_path() == '/run/a.sock'
+        
+        monkeypatch.delenv(daemon.SOCKET_ENV)
+        monkeypatch.setenv('XDG_RUNTIME_DIR', '/run/user/1000')
+        assert daemon.default_socket_path() == '/run/user/1000/tsdiag.sock'
+        
+        monkeypatch.delenv('XDG_RUNTIME_DIR')
+        monkeypatch.setattr(tempfile, 'tempdir', '/tmp')
+        assert daemon.default_socket_path() == f'/tmp/tsdiag-{os.getuid()}/tsdiag.sock'
+
+
+class TestSocketOwnership:
+    """测试套接字目录和守护进程属主的检查"""
+    
+    def test_private_directory(self, monkeypatch):
+        """测试回退路径的目录以0700权限创建，权限过宽时拒绝启动"""
+        root = tempfile.mkdtemp(prefix='tsdiag-')
+        monkeypatch.setattr(tempfile, 'tempdir', root)
+        monkeypatch.delenv(daemon.SOCKET_ENV, raising=False)
+        monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+        directory = os.path.join(root, f'tsdiag-{os.getuid()}')
+        try:
+            server = DaemonServer(cache_size=0)
+            assert server.socket_path == os.path.join(directory, 'tsdiag.sock')
+            assert os.stat(directory).st_mode & 0o777 == 0o700
+            server.close()
+            
+            os.chmod(directory, 0o755)
+            with pytest.raises(RuntimeError, match="私有"):
+                DaemonServer(cache_size=0)
+        finally:
+            os.rmdir(directory)
+            os.rmdir(root)
+    
+    def test_rejects_other_users_daemon(self, server, socket_path, monkeypatch):
+        """测试守护进程不属于当前用户时不转发"""
+        uid = os.getuid()
+        monkeypatch.setattr(os, 'getuid', lambda: uid + 1)
+        
+        assert ping(socket_path) is None
+        assert forward(['stationarity', '-c', '0.5'], socket_path) is None
@@ -0,0 +1,307 @@
+"""
+FastAPI服务测试
+"""
+
+import io
+import json
+import threading
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from tsdiag import fastapi_app
+from tsdiag.fastapi_app import app
+from tsdiag.wire import NPY_MEDIA_TYPE, RESULT_DTYPE
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """批量分析使用线程池的测试客户端，避免在每个测试中启动子进程"""
+    monkeypatch.setenv("BATCH_EXECUTOR", "threads")
+    monkeypatch.setenv("BATCH_EXECUTOR_WORKERS", "2")
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestExecutors:
+    """执行器的创建、使用和关闭"""
+    
+    def test_lifespan_creates_and_shuts_down_executors(self, client):
+        executor = app.state.executor
+        batch_executor = app.state.batch_executor
+        assert executor is not None and batch_executor is not None
+        assert executor is not batch_executor
+        
+        client.__exit__(None, None, None)
+        assert app.state.executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(int)
+    
+    def test_invalid_configuration(self, monkeypatch):
+        monkeypatch.setenv("BATCH_EXECUTOR", "gpu")
+        with pytest.raises(ValueError, match="批量执行方式"):
+            fastapi_app._create_executors()
+        
+        monkeypatch.setenv("BATCH_EXECUTOR", "threads")
+        monkeypatch.setenv("EXECUTOR_WORKERS", "0")
+        with pytest.raises(ValueError, match="EXECUTOR_WORKERS"):
+            fastapi_app._create_executors()
+    
+    def test_batch_workers_enable_cache(self, monkeypatch, tmp_path):
+        """测试进程池的子进程按相同配置启用缓存，结果写入共享的磁盘缓存"""
+        import sqlite3
+        from tsdiag.api import quick_ar_check
+        
+        path = tmp_path / "cache.sqlite3"
+        monkeypatch.setenv("CACHE_ENABLED", "true")
+        monkeypatch.setenv("CACHE_PATH", str(path))
+        monkeypatch.setenv("BATCH_EXECUTOR_WORKERS", "1")
+        monkeypatch.delenv("BATCH_EXECUTOR", raising=False)
+        
+        executor, batch_executor = fastapi_app._create_executors(fastapi_app._cache_options())
+        try:
+            # 预筛选无法判定、必须求根的模型
+            assert batch_executor.submit(quick_ar_check, [1.2, -0.5]).result(timeout=60)
+        finally:
+            executor.shutdown()
+            batch_executor.shutdown()
+        
+        with sqlite3.connect(path) as reader:
+            assert reader.execute("SELECT key FROM roots").fetchall() == [('[-1.2,0.5]',)]
+    
+    def test_checks_run_in_executor(self, client):
+        response = client.post("/api/v1/ar/check", json={"coefficients": [0.5, -0.3]})
+        assert response.status_code == 200
+        assert response.json()["is_stationary"] is True
+        
+        response = client.post("/api/v1/arma/quick", json={"ar_coefficients": [1.2], "ma_coefficients": [0.4]})
+        assert response.json()["overall_valid"] is False
+    
+    def test_errors_are_reported(self, client, monkeypatch):
+        def failing_check(coefficients):
+            raise ValueError("系数无效")
+        
+        monkeypatch.setattr(fastapi_app, "quick_ar_check", failing_check)
+        response = client.post("/api/v1/ar/quick", json={"coefficients": [0.5]})
+        assert response.status_code == 400
+        assert "系数无效" in response.json()["detail"]
+    
+    def test_process_batch_executor(self, monkeypatch):
+        monkeypatch.setenv("BATCH_EXECUTOR", "processes")
+        monkeypatch.setenv("BATCH_EXECUTOR_WORKERS", "1")
+        with TestClient(app) as test_client:
+            response = test_client.post(
+                "/api/v1/batch/analyze",
+                json={"models": [{"ar": [0.5]}, {"ar": [1.5]}, {"ma": [0.3]}]}
+            )
+        summary = response.json()["summary"]
+        assert summary["total_models"] == 3
+        assert summary["ar_stationary_count"] == 1
+        assert summary["ma_invertible_count"] == 1
+    
+    def test_small_requests_not_blocked_by_batch(self, client, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+        original = fastapi_app._batch_analysis
+        
+        def slow_batch(models, model_names):
+            started.set()
+            release.wait(timeout=10)
+            return original(models, model_names)
+        
+        monkeypatch.setattr(fastapi_app, "_batch_analysis", slow_batch)
+        
+        responses = {}
+        batch = threading.Thread(target=lambda: responses.setdefault(
+            "batch", client.post("/api/v1/batch/analyze", json={"models": [{"ar": [0.5]}]})
+        ))
+        batch.start()
+        try:
+            assert started.wait(timeout=10)
+            # 批量分析仍在执行时，其他请求照常完成
+            assert client.get("/health").status_code == 200
+            response = client.post("/api/v1/ma/quick", json={"coefficients": [0.3]})
+            assert response.json()["result"] is True
+            assert "batch" not in responses
+        finally:
+            release.set()
+            batch.join(timeout=10)
+        
+        assert responses["batch"].status_code == 200
+    
+    def test_batch_parsing_and_encoding_off_event_loop(self, client, monkeypatch):
+        threads = {}
+        parse, encode = fastapi_app._parse_batch_body, fastapi_app._encode_batch_response
+        
+        def recording(name, func):
+            def wrapper(*args):
+                threads[name] = threading.current_thread().name
+                return func(*args)
+            return wrapper
+        
+        monkeypatch.setattr(fastapi_app, "_parse_batch_body", recording("parse", parse))
+        monkeypatch.setattr(fastapi_app, "_encode_batch_response", recording("encode", encode))
+        
+        response = client.post("/api/v1/batch/analyze", json={"models": [{"ar": [0.5]}], "model_names": ["模型"]})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["results"][0]["model_name"] == "模型"
+        assert response.json()["summary"]["total_models"] == 1
+        assert threads["parse"].startswith("tsdiag_") and threads["encode"].startswith("tsdiag_")
+        
+        response = client.post("/api/v1/batch/analyze", json={"models": [{"ar": []}]})
+        assert response.status_code == 422
+
+
+class TestStreamingBatch:
+    """/api/v2/batch/analyze 的NDJSON流式响应"""
+    
+    def _records(self, response):
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        return [json.loads(line) for line in response.text.splitlines()]
+    
+    def test_records_and_summary(self, client):
+        models = [
+            {"ar": [0.5, -0.3]},
+            {"ar": [1.5]},
+            {"ma": [0.3]},
+            {"ar": [0.2], "ma": [2.0]},
+            {},
+        ]
+        response = client.post(
+            "/api/v2/batch/analyze?chunk_size=2",
+            json={"models": models, "model_names": list("abcde")}
+        )
+        records = self._records(response)
+        
+        assert [record.get("index") for record in records[:-1]] == [0, 1, 2, 3, 4]
+        assert [record.get("model_name") for record in records[:-1]] == list("abcde")
+        assert records[0]["is_stationary"] is True and records[0]["model_valid"] is True
+        assert records[1]["is_stationary"] is False and records[1]["risk_level"] == "high"
+        assert records[2]["is_invertible"] is True
+        assert records[3]["is_stationary"] is True and records[3]["is_invertible"] is False
+        assert records[3]["model_valid"] is False
+        assert "error" in records[4]
+        
+        assert records[-1]["summary"] == {
+            "total_models": 5,
+            "valid_models": 2,
+            "error_models": 1,
+            "ar_stationary_count": 2,
+            "ma_invertible_count": 1,
+        }
+    
+    def test_matches_v1_results(self, client):
+        models = [{"ar": [0.5, -0.3]}, {"ar": [0.9, 0.05]}, {"ma": [0.3, 0.2]}]
+        v1 = client.post("/api/v1/batch/analyze", json={"models": models}).json()["results"]
+        v2 = self._records(client.post("/api/v2/batch/analyze", json={"models": models}))
+        
+        assert [record["model_name"] for record in v2[:-1]] == [result["model_name"] for result in v1]
+        assert v2[0]["stability_margin"] == pytest.approx(v1[0]["ar"]["stability_margin"])
+        assert v2[1]["risk_level"] == v1[1]["ar"]["risk_level"]
+        assert v2[2]["invertibility_margin"] == pytest.approx(v1[2]["ma"]["invertibility_margin"])
+    
+    def test_failed_chunk(self, client, monkeypatch):
+        check_chunk = fastapi_app._check_chunk
+        
+        def failing_chunk(models, names, start):
+            if start == 2:
+                raise RuntimeError("worker died")
+            return check_chunk(models, names, start)
+        
+        monkeypatch.setattr(fastapi_app, "_check_chunk", failing_chunk)
+        models = [{"ar": [0.5]}, {"ar": [1.5]}, {"ar": [0.2]}, {"ma": [0.3]}, {"ar": [0.4]}]
+        records = self._records(client.post("/api/v2/batch/analyze?chunk_size=2", json={"models": models}))
+        
+        assert [record.get("index") for record in records[:-1]] == [0, 1, 2, 3, 4]
+        assert [record.get("model_name") for record in records[2:4]] == ["Model_3", "Model_4"]
+        assert all("worker died" in record["error"] for record in records[2:4])
+        assert records[4]["is_stationary"] is True
+        assert records[-1]["summary"]["total_models"] == 5
+        assert records[-1]["summary"]["error_models"] == 2
+    
+    def test_invalid_chunk_size(self, client):
+        response = client.post("/api/v2/batch/analyze?chunk_size=0", json={"models": [{"ar": [0.5]}]})
+        assert response.status_code == 422
+
+
+class TestBinaryFormats:
+    """批量接口的二进制请求和内容协商"""
+    
+    def _npy(self, array):
+        buffer = io.BytesIO()
+        np.save(buffer, array)
+        return buffer.getvalue()
+    
+    def test_npy_request_and_response(self, client):
+        body = self._npy(np.array([[0.5, -0.3], [1.5, 0.0], [np.nan, 0.0]]))
+        for path in ("/api/v1/batch/analyze", "/api/v2/batch/analyze"):
+            response = client.post(path, content=body, headers={"content-type": NPY_MEDIA_TYPE, "accept": NPY_MEDIA_TYPE})
+            assert response.status_code == 200
+            assert response.headers["content-type"] == NPY_MEDIA_TYPE
+            
+            results = np.load(io.BytesIO(response.content), allow_pickle=False)
+            assert results.dtype == RESULT_DTYPE
+            assert results['is_stationary'].tolist() == [True, False, False]
+            assert results['risk_level'].tolist() == [0, 2, -1]
+    
+    def test_npy_request_json_response(self, client):
+        body = self._npy(np.array([[0.3], [1.5]]))
+        response = client.post("/api/v1/batch/analyze?kind=ma", content=body, headers={"content-type": NPY_MEDIA_TYPE})
+        results = response.json()["results"]
+        assert results[0]["ma"]["is_invertible"] is True
+        assert results[1]["ma"]["is_invertible"] is False
+        
+        response = client.post("/api/v2/batch/analyze?kind=ma", content=body, headers={"content-type": NPY_MEDIA_TYPE})
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record.get("is_invertible") for record in records[:-1]] == [True, False]
+        assert records[-1]["summary"]["ma_invertible_count"] == 1
+    
+    def test_json_request_npy_response(self, client):
+        response = client.post(
+            "/api/v1/batch/analyze",
+            json={"models": [{"ar": [0.5]}, {"ma": [1.5]}, {}]},
+            headers={"accept": NPY_MEDIA_TYPE}
+        )
+        results = np.load(io.BytesIO(response.content), allow_pickle=False)
+        assert results['model_valid'].tolist() == [True, False, False]
+        assert results['risk_level'].tolist() == [0, 2, -1]
+    
+    def test_msgpack(self, client):
+        msgpack = pytest.importorskip("msgpack")
+        ar, ma = np.array([[0.5], [0.2]]), np.array([[0.4], [2.0]])
+        body = msgpack.packb({
+            "ar": {"data": ar.tobytes(), "shape": [2, 1]},
+            "ma": {"data": ma.tobytes(), "shape": [2, 1]},
+            "model_names": ["a", "b"],
+        })
+        response = client.post(
+            "/api/v1/batch/analyze",
+            content=body,
+            headers={"content-type": "application/x-msgpack", "accept": "application/msgpack"}
+        )
+        assert response.headers["content-type"] == "application/msgpack"
+        decoded = msgpack.unpackb(response.content)
+        assert decoded["model_names"] == ["a", "b"]
+        assert decoded["summary"]["valid_models"] == 1
+        
+        response = client.post("/api/v2/batch/analyze", content=body, headers={"content-type": "application/msgpack"})
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record.get("model_name") for record in records[:-1]] == ["a", "b"]
+    
+    def test_errors(self, client):
+        response = client.post("/api/v1/batch/analyze", content=b"x", headers={"content-type": "text/plain"})
+        assert response.status_code == 415
+        
+        response = client.post("/api/v1/batch/analyze", content=b"x", headers={"content-type": NPY_MEDIA_TYPE})
+        assert response.status_code == 400
+        
+        response = client.post("/api/v1/batch/analyze", json={"models": [{"ar": [0.5]}]}, headers={"accept": "text/csv"})
+        assert response.status_code == 406
+        
+        response = client.post("/api/v1/batch/analyze", json={"models": []})
+        assert response.status_code == 422
@@ -0,0 +1,140 @@
+"""
+批量文件读写测试
+"""
+
+import io
+import json
+import numpy as np
+import pytest
+from tsdiag.formats import ResultWriter, check_npy, detect_format, flatten_result, read_models
+
+
+class TestReadModels:
+    """测试模型读取"""
+    
+    def test_jsonl(self):
+        """测试对象、系数数组和无效行"""
+        stream = io.StringIO('{"ar": [0.5], "name": "a"}\n\n[0.4]\n"x"\n{bad\n')
+        records = list(read_models(stream, 'jsonl', kind='ma'))
+        
+        assert records[0].name == 'a'
+        assert records[1].model == {'ma': [0.4]}
+        assert "第4行必须是JSON对象或系数数组" in records[2].error
+        assert "第5行不是有效的JSON" in records[3].error
+    
+    def test_csv_with_header(self):
+        """测试带表头的CSV按列读取"""
+        stream = io.StringIO('name,ar,ma\nm1,0.5;-0.3,0.4\nm2,,0.2\n')
+        records = list(read_models(stream, 'csv'))
+        
+        assert records[0] == ('m1', {'ar': [0.5, -0.3], 'ma': [0.4]}, None)
+        assert records[1].model == {'ma': [0.2]}
+    
+    def test_csv_without_header(self):
+        """测试只有系数的CSV按 kind 解释，非数值行记录错误"""
+        stream = io.StringIO('0.5,-0.3\n0.2\nabc\n')
+        records = list(read_models(stream, 'csv', kind='ma'))
+        
+        assert records[0].model == {'ma': [0.5, -0.3]}
+        assert records[1].model == {'ma': [0.2]}
+        assert "第3行包含非数值系数" in records[2].error
+    
+    def test_npy(self, tmp_path):
+        """测试npy矩阵逐行读取"""
+        path = str(tmp_path / 'coeffs.npy')
+        np.save(path, np.array([[0.5, 0.2], [0.3, 0.1]]))
+        
+        records = list(read_models(path))
+        assert [r.model for r in records] == [{'ar': [0.5, 0.2]}, {'ar': [0.3, 0.1]}]
+        
+        np.save(path, np.zeros(3))
+        with pytest.raises(ValueError, match="二维"):
+            list(read_models(path))
+    
+    def test_invalid_arguments(self):
+        """测试无效的格式和模型类型"""
+        assert detect_format('a.NDJSON') == 'jsonl'
+        with pytest.raises(ValueError, match="无法根据扩展名推断"):
+            detect_format('models.txt')
+        with pytest.raises(ValueError, match="未知的输入格式"):
+            read_models(io.StringIO(''), 'xml')
+        with pytest.raises(ValueError, match="未知的模型类型"):
+            read_models(io.StringIO(''), 'csv', kind='arma')
+
+
+class TestCheckNpy:
+    """测试npy矩阵的窗口批量检验"""
+    
+    def test_non_finite_rows(self, tmp_path):
+        """测试包含NaN和无穷大的行记为错误，其余行照常检验"""
+        path, output = str(tmp_path / 'coeffs.npy'), str(tmp_path / 'flags.npy')
+        np.save(path, np.array([[0.5, 0.2], [np.nan, 0.1], [1.2, 0.1], [0.3, np.inf], [0.3, 0.1]]))
+        
+        counts = check_npy(path, output, window=2)
+        
+        assert counts == {'total': 5, 'passed': 2, 'failed': 1, 'errors': 2}
+        saved = np.load(output)
+        assert saved['flag'].tolist() == [True, False, False, False, True]
+        assert saved['error'].tolist() == [False, True, False, True, False]
+        assert np.isnan(saved['min_modulus'][[1, 3]]).all()
+        assert np.isfinite(saved['min_modulus'][[0, 2, 4]]).all()
+    
+    def test_failure_removes_output(self, tmp_path, monkeypatch):
+        """测试检验中途失败时删除未写完的输出文件"""
+        from tsdiag import core
+        
+        def failing_check(*args, **kwargs):
+            raise RuntimeError("检验失败")
+        
+        path, output = str(tmp_path / 'coeffs.npy'), tmp_path / 'flags.npy'
+        np.save(path, np.zeros((3, 2)))
+        monkeypatch.setattr(core, 'stationarity_check_batch', failing_check)
+        
+        with pytest.raises(RuntimeError, match="检验失败"):
+            check_npy(path, str(output))
+        assert not output.exists()
+
+
+class TestResultWriter:
+    """测试结果写出"""
+    
+    def test_counts_and_exit_code(self):
+        """测试统计和退出码"""
+        stream = io.StringIO()
+        with ResultWriter(stream) as writer:
+            writer.write({'model_index': 0, 'ar': {'is_stationary': True}})
+            assert writer.exit_code == 0
+            writer.write({'model_index': 1, 'ma': {'is_invertible': False}})
+            assert writer.exit_code == 1
+            writer.write({'model_index': 2, 'error': 'x'})
+            assert writer.exit_code == 2
+        
+        assert writer.counts == {'total': 3, 'passed': 1, 'failed': 1, 'errors': 1}
+        assert json.loads(stream.getvalue().splitlines()[2])['error'] == 'x'
+    
+    def test_csv(self):
+        """测试CSV表头和展平后的列"""
+        stream = io.StringIO()
+        ResultWriter(stream, 'csv').write({'model_index': 0, 'model_name': 'a', 'error': 'x'})
+        
+        header, row = stream.getvalue().splitlines()
+        assert header.startswith('model_index,model_name')
+        assert row.startswith('0,a,') and row.endswith(',x')
+        
+        with pytest.raises(ValueError, match="未知的输出格式"):
+            ResultWriter(stream, 'xml')
+    
+    def test_flatten_result(self):
+        """测试展平ARMA结果"""
+        result = {
+            'model_index': 3, 'model_name': 'm',
+            'ar': {'is_stationary': True, 'stability_margin': 0.5, 'risk_level': 'low'},
+            'ma': {'is_invertible': True, 'invertibility_margin': 0.2, 'risk_level': 'medium'},
+            'overall': {'model_valid': True},
+        }
+        row = flatten_result(result)
+        
+        assert row['stability_margin'] == 0.5
+        assert row['ma_risk_level'] == 'medium'
+        assert row['model_valid'] is True
+        assert row['error'] == ''
@@ -0,0 +1,99 @@
+"""
+导入开销测试
+
+命令行脚本每天被调用成千上万次，`import tsdiag` 和 `tsdiag --help` 不应加载NumPy和求根代码。
+"""
+
+import subprocess
+import sys
+import pytest
+import tsdiag
+
+
+# tsdiag.cli 的累计导入时间上限（微秒）。立即导入NumPy和core时约为150毫秒
+_STARTUP_BUDGET_US = 100_000
+
+# 启动时不应加载的模块
+_HEAVY_MODULES = ('numpy', 'tsdiag.core', 'tsdiag.api', 'tsdiag.stationarity', 'tsdiag.invertibility')
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    """在新的解释器中执行代码"""
+    return subprocess.run(
+        [sys.executable, *options, '-c', code],
+        capture_output=True, text=True, check=True
+    )
+
+
+def _loaded_heavy_modules(statement: str) -> str:
+    code = (
+        "import sys\n"
+        f"{statement}\n"
+        f"print('loaded:' + ','.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    return _run(code).stdout.splitlines()[-1][len('loaded:'):]
+
+
+class TestLazyImports:
+    """测试按需导入"""
+    
+    def test_import_package(self):
+        """测试导入包时不加载分析模块"""
+        assert _loaded_heavy_modules("import tsdiag") == ''
+    
+    def test_cli_help(self):
+        """测试显示帮助和示例时不加载分析模块"""
+        statement = (
+            "from tsdiag.cli import main\n"
+            "for args in (['--help'], ['batch', '--help'], ['examples']):\n"
+            "    try:\n"
+            "        main(args)\n"
+            "    except SystemExit:\n"
+            "        pass"
+        )
+        assert _loaded_heavy_modules(statement) == ''
+    
+    def test_daemon_launcher(self):
+        """测试命令行入口在转发前不导入click和分析模块"""
+        statement = "import tsdiag.daemon\nprint('click' in sys.modules)"
+        assert _run(f"import sys\n{statement}").stdout.strip() == 'False'
+        assert _loaded_heavy_modules("import tsdiag.daemon") == ''
+    
+    def test_attribute_access(self):
+        """测试访问公开名称时导入所在模块"""
+        assert _loaded_heavy_modules("import tsdiag; tsdiag.RootTracker") == ','.join(_HEAVY_MODULES[:2])
+        assert tsdiag.stationarity_check([0.5]).is_stationary
+        assert set(tsdiag.__all__) <= set(dir(tsdiag))
+        
+        with pytest.raises(AttributeError, match="no attribute 'missing'"):
+            tsdiag.missing
+    
+    def test_submodule_access(self):
+        """测试 import tsdiag 后可以直接访问子模块"""
+        statement = "import tsdiag\nprint(tsdiag.core.__name__, tsdiag.api.__name__, tsdiag.stationarity.__name__)"
+        assert _run(statement).stdout.split() == ['tsdiag.core', 'tsdiag.api', 'tsdiag.stationarity']
+        assert _loaded_heavy_modules("import tsdiag; tsdiag.formats") == ''
+        
+        with pytest.raises(AttributeError, match="no attribute 'missing_module'"):
+            tsdiag.missing_module
+    
+    def test_all_exports_resolve(self):
+        """测试 __all__ 中的每个名称都能导入"""
+        for name in tsdiag.__all__:
+            assert getattr(tsdiag, name) is not None
+
+
+class TestStartupBudget:
+    """导入时间基准"""
+    
+    def test_cli_import_time(self):
+        """测试 tsdiag.cli 的累计导入时间不超过预算"""
+        stderr = _run("import tsdiag.cli", '-X', 'importtime').stderr
+        
+        # 每行形如 "import time: self [us] | cumulative | imported package"
+        cumulative = {
+            line.split('|')[2].strip(): int(line.split('|')[1])
+            for line in stderr.splitlines()
+            if line.startswith('import time:') and line.count('|') == 2 and line.split('|')[1].strip().isdigit()
+        }
+        assert cumulative['tsdiag.cli'] < _STARTUP_BUDGET_US
@@ -9,6 +9,7 @@ from tsdiag.invertibility import (
     analyze_ma_invertibility_margin,
     suggest_ma_modifications,
     batch_invertibility_check,
+    iter_invertibility_check,
     compare_ma_models
 )
 
@@ -186,6 +187,40 @@ class TestBatchInvertibilityCheck:
         assert results[0]['risk_level'] == 'low'
         assert results[1]['risk_level'] == 'medium'
         assert results[0]['invertibility_margin'] > results[1]['invertibility_margin']
+    
+    def test_threads_backend(self):
+        """测试线程池执行与串行结果一致"""
+        models = [[0.5], [1.1, 0.2], [0.4, 0.3, 0.1], [0.9], [1.5]] * 20
+        
+        serial = batch_invertibility_check(models)
+        threaded = batch_invertibility_check(models, backend='threads', n_jobs=3)
+        
+        assert [r['is_invertible'] for r in threaded] == [r['is_invertible'] for r in serial]
+        assert [r['invertibility_margin'] for r in threaded] == [r['invertibility_margin'] for r in serial]
+    
+    def test_schur_method_keys(self):
+        """测试Schur–Cohn判定的结果与求根时有相同的键"""
+        results = batch_invertibility_check([[0.5], [1.1]], method='schur')
+        
+        assert [r['is_invertible'] for r in results] == [True, False]
+        assert results[0].keys() == batch_invertibility_check([[0.5]])[0].keys()
+        assert all(r['invertibility_margin'] is None and r['risk_level'] is None for r in results)
+
+
+class TestIterInvertibilityCheck:
+    """测试流式批量检验"""
+    
+    def test_matches_batch(self):
+        """测试结果与一次性批量检验一致"""
+        models = [[0.5], [1.1, 0.2], [], [0.4, 0.3, 0.1]] * 3
+        names = (f"m{i}" for i in range(len(models)))
+        
+        results = list(iter_invertibility_check(models, model_names=names, chunk_size=5, method='schur'))
+        expected = batch_invertibility_check(models, method='schur')
+        
+        assert [r['model_name'] for r in results] == [f"m{i}" for i in range(len(models))]
+        assert [r['is_invertible'] for r in results] == [r['is_invertible'] for r in expected]
+        assert [r.get('error') for r in results] == [r.get('error') for r in expected]
 
 
 class TestCompareMaModels:
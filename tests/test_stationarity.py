@@ -8,7 +8,8 @@ from tsdiag.stationarity import (
     check_ar_stationarity,
     analyze_ar_stability_margin,
     suggest_ar_modifications,
-    batch_stationarity_check
+    batch_stationarity_check,
+    iter_stationarity_check
 )
 
 
@@ -183,6 +184,86 @@ class TestBatchStationarityCheck:
         assert results[0]['risk_level'] == 'low'
         assert results[1]['risk_level'] == 'medium'
         assert results[0]['stability_margin'] > results[1]['stability_margin']
+    
+    def test_mixed_orders_keep_input_order(self):
+        """测试不同阶数混合时保持原始顺序"""
+        models = [[0.5, -0.3], [0.5], [float('nan')], [1.2, -0.1], [1.1]]
+        results = batch_stationarity_check(models)
+        
+        assert [r['model_index'] for r in results] == [0, 1, 2, 3, 4]
+        assert results[0]['is_stationary']
+        assert results[1]['is_stationary']
+        assert 'error' in results[2]
+        assert not results[3]['is_stationary']
+        assert not results[4]['is_stationary']
+        assert results[1]['result'].roots[0].magnitude == pytest.approx(2.0)
+    
+    def test_schur_method(self):
+        """测试Schur–Cohn判定方法只返回判定结果"""
+        results = batch_stationarity_check([[0.5], [1.1], [0.5, -0.3]], method='schur')
+        
+        assert [r['is_stationary'] for r in results] == [True, False, True]
+        assert all(r['result'] is None for r in results)
+        assert all(r['num_roots'] is None and r['stability_margin'] is None for r in results)
+        assert all(r['risk_level'] is None for r in results)
+        assert results[0].keys() == batch_stationarity_check([[0.5]])[0].keys()
+    
+    @pytest.mark.parametrize("method", ['roots', 'schur'])
+    def test_threads_backend(self, method):
+        """测试线程池执行与串行结果一致"""
+        rng = np.random.default_rng(4)
+        models = [rng.uniform(-0.6, 0.6, size=order).tolist() for order in rng.integers(1, 8, size=200)]
+        models[17] = [float('nan')]
+        
+        serial = batch_stationarity_check(models, method=method)
+        threaded = batch_stationarity_check(models, method=method, backend='threads', n_jobs=4)
+        
+        for expected, result in zip(serial, threaded):
+            assert result['is_stationary'] == expected['is_stationary']
+            assert result.get('error') == expected.get('error')
+            assert result.get('stability_margin') == expected.get('stability_margin')
+        
+        with pytest.raises(ValueError, match="未知的执行方式"):
+            batch_stationarity_check(models, backend='gpu')
+
+
+class TestIterStationarityCheck:
+    """测试流式批量检验"""
+    
+    def test_matches_batch(self):
+        """测试结果和全局索引与一次性批量检验一致"""
+        models = [[0.5, -0.3], [0.5], [float('nan')], [1.2, -0.1], [1.1]] * 5
+        expected = batch_stationarity_check(models)
+        
+        results = list(iter_stationarity_check(iter(models), chunk_size=3))
+        
+        assert [r['model_index'] for r in results] == list(range(len(models)))
+        assert [r['model_name'] for r in results] == [r['model_name'] for r in expected]
+        assert [r['is_stationary'] for r in results] == [r['is_stationary'] for r in expected]
+    
+    def test_lazy_consumption(self):
+        """测试只读取产出结果所需的输入块"""
+        consumed = []
+        
+        def models():
+            for i in range(10 ** 9):
+                consumed.append(i)
+                yield [0.5]
+        
+        stream = iter_stationarity_check(models(), chunk_size=4)
+        first = [next(stream) for _ in range(5)]
+        
+        assert [r['model_index'] for r in first] == [0, 1, 2, 3, 4]
+        assert len(consumed) <= 9
+    
+    def test_names_length_mismatch(self):
+        """测试名称数量与模型数量不同"""
+        with pytest.raises(ValueError, match="模型名称数量"):
+            list(iter_stationarity_check([[0.5], [0.3]], model_names=['a']))
+        with pytest.raises(ValueError, match="模型名称数量"):
+            list(iter_stationarity_check([[0.5]], model_names=['a', 'b']))
+        with pytest.raises(ValueError, match="chunk_size"):
+            iter_stationarity_check([[0.5]], chunk_size=0)
 
 
 class TestEdgeCases:
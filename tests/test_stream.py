@@ -0,0 +1,113 @@
+"""
+按行流式检验测试
+"""
+
+import io
+import os
+import pytest
+from tsdiag.stream import check_lines, check_models, iter_line_batches, parse_line
+
+
+class TestParseLine:
+    """测试单行解析"""
+    
+    def test_coefficients(self):
+        """测试逗号、空格和JSON数组格式"""
+        assert parse_line("0.5,-0.3") == {'ar': [0.5, -0.3]}
+        assert parse_line(" 0.5 -0.3 ", 'ma') == {'ma': [0.5, -0.3]}
+        assert parse_line("[0.5, -0.3]") == {'ar': [0.5, -0.3]}
+        assert parse_line("") == {'ar': []}
+    
+    def test_arma(self):
+        """测试ARMA模型的两种格式"""
+        assert parse_line("0.5,-0.3|0.4", 'arma') == {'ar': [0.5, -0.3], 'ma': [0.4]}
+        assert parse_line("|0.4", 'arma') == {'ma': [0.4]}
+        assert parse_line('{"ar": [0.5], "ma": null}', 'arma') == {'ar': [0.5]}
+        
+        with pytest.raises(ValueError, match="至少需要AR或MA系数"):
+            parse_line(" | ", 'arma')
+    
+    def test_invalid(self):
+        """测试无法解析的输入"""
+        with pytest.raises(ValueError, match="无法解析AR系数字符串"):
+            parse_line("0.5,abc")
+        with pytest.raises(ValueError, match="无法解析MA系数数组"):
+            parse_line("[0.5,", 'ma')
+        with pytest.raises(ValueError, match="未知的模型类型"):
+            parse_line("0.5", 'var')
+
+
+class TestCheckLines:
+    """测试微批检验"""
+    
+    def test_one_result_per_line(self):
+        """测试结果与输入行一一对应，不同阶数和错误行混合"""
+        results = check_lines(["0.5", "1.2", "", "0.5,-0.3,0.1", "x"], first_line=11)
+        
+        assert [r['line'] for r in results] == [11, 12, 13, 14, 15]
+        assert results[0] == {'line': 11, 'is_stationary': True, 'stability_margin': pytest.approx(1.0), 'risk_level': 'low'}
+        assert results[1]['risk_level'] == 'high'
+        assert results[2]['error'] == "AR系数不能为空"
+        assert results[3]['is_stationary']
+        assert 'error' in results[4]
+    
+    def test_arma(self):
+        """测试ARMA结果的综合判定"""
+        valid, invalid = check_lines(["0.5|0.4", "0.5|1.5"], 'arma')
+        
+        assert valid['model_valid'] and valid['is_stationary'] and valid['is_invertible']
+        assert not invalid['model_valid']
+        assert invalid['is_stationary'] and invalid['risk_level'] == 'high'
+    
+    def test_no_finite_roots(self):
+        """测试没有有限根时边际为None，保证输出是合法的JSON"""
+        assert check_lines(["0.0"])[0]['stability_margin'] is None
+
+
+class TestCheckModels:
+    """测试模型字典的批量检验"""
+    
+    def test_mixed_models(self):
+        """测试AR、MA、ARMA和无效模型混合，结果总是包含 model_valid"""
+        results = check_models([
+            {'ar': [0.5]},
+            {'ma': [1.5], 'ar': None},
+            {'ar': [0.5, -0.3], 'ma': [0.4]},
+            {'ar': None, 'ma': None},
+            {'ar': [float('nan')]},
+        ])
+        
+        assert results[0] == {'is_stationary': True, 'stability_margin': pytest.approx(1.0), 'model_valid': True, 'risk_level': 'low'}
+        assert not results[1]['model_valid'] and 'is_stationary' not in results[1]
+        assert results[2]['model_valid'] and results[2]['is_invertible']
+        assert results[3] == {'error': "模型至少需要AR或MA系数"}
+        assert 'error' in results[4]
+
+
+class TestIterLineBatches:
+    """测试按微批读取输入"""
+    
+    def test_memory_stream(self):
+        """测试内存流按最大行数分批"""
+        batches = list(iter_line_batches(io.StringIO("1\n2\r\n3\n4\n5"), max_batch=2))
+        assert batches == [['1', '2'], ['3', '4'], ['5']]
+    
+    def test_pipe_collects_available_lines(self):
+        """测试管道中已到达的行合并为一批，且不等待更多输入"""
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"1\n2\n3")
+        
+        with os.fdopen(read_fd) as stream:
+            batches = iter_line_batches(stream, max_batch=10)
+            assert next(batches) == ['1', '2']
+            
+            os.write(write_fd, b"\n4\n")
+            assert next(batches) == ['3', '4']
+            
+            os.close(write_fd)
+            assert list(batches) == []
+    
+    def test_invalid_batch_size(self):
+        """测试无效的批大小"""
+        with pytest.raises(ValueError, match="max_batch"):
+            iter_line_batches(io.StringIO(""), max_batch=0)
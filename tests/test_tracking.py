@@ -0,0 +1,103 @@
+"""
+特征根跟踪测试
+"""
+
+import pytest
+import numpy as np
+from tsdiag.tracking import RootTracker
+from tsdiag.core import stationarity_check, invertibility_check
+
+
+def _sorted_roots(result):
+    return np.sort_complex(np.array([root.value for root in result.roots]))
+
+
+class TestRootTracker:
+    """测试RootTracker"""
+    
+    def test_first_update_full_solve(self):
+        """测试第一次更新完整求根"""
+        tracker = RootTracker('ar')
+        result = tracker.update([0.5, 0.3])
+        
+        assert result.is_stationary
+        assert tracker.stats()['full_solves'] == 1
+        assert np.allclose(_sorted_roots(result), _sorted_roots(stationarity_check([0.5, 0.3])))
+    
+    def test_path_matches_independent_solves(self):
+        """测试系数路径的结果与逐个独立求根一致"""
+        rng = np.random.default_rng(0)
+        base = np.array([0.6, -0.2, 0.1, 0.05])
+        path = base + np.cumsum(rng.normal(scale=1e-3, size=(50, 4)), axis=0)
+        
+        tracker = RootTracker('ar')
+        results = tracker.track(path)
+        
+        assert len(results) == 50
+        for row, result in zip(path, results):
+            expected = stationarity_check(row)
+            assert result.is_stationary == expected.is_stationary
+            assert np.allclose(_sorted_roots(result), _sorted_roots(expected))
+        
+        stats = tracker.stats()
+        assert stats['full_solves'] == 1
+        assert stats['warm_updates'] == 49
+    
+    def test_ma_tracking(self):
+        """测试MA模型的可逆性跟踪"""
+        tracker = RootTracker('ma')
+        results = tracker.track([[0.5, 0.2], [0.6, 0.2], [1.5, 0.2]])
+        
+        assert [result.is_invertible for result in results] == [
+            invertibility_check(row).is_invertible for row in ([0.5, 0.2], [0.6, 0.2], [1.5, 0.2])
+        ]
+    
+    def test_order_change_falls_back(self):
+        """测试阶数变化时回退为完整求根"""
+        tracker = RootTracker('ar')
+        tracker.update([0.5, 0.2])
+        result = tracker.update([0.5, 0.0])
+        
+        assert len(result.roots) == 1
+        assert tracker.stats()['full_solves'] == 2
+    
+    def test_collision_falls_back(self):
+        """测试根碰撞时回退为完整求根"""
+        tracker = RootTracker('ar')
+        tracker.update([0.98, -0.2401])
+        # 1 - 0.98z + 0.2401z² 有二重根 z = 1/0.49
+        result = tracker.update([0.98, -0.2401])
+        
+        assert tracker.stats()['full_solves'] == 2
+        assert result.is_stationary
+    
+    def test_reset(self):
+        """测试重置后重新完整求根"""
+        tracker = RootTracker('ar')
+        tracker.update([0.5])
+        tracker.reset()
+        
+        assert tracker.roots is None
+        tracker.update([0.5])
+        assert tracker.stats()['full_solves'] == 2
+    
+    def test_invalid_arguments(self):
+        """测试无效参数"""
+        with pytest.raises(ValueError, match="未知的模型类型"):
+            RootTracker('arma')
+        with pytest.raises(ValueError):
+            RootTracker(max_iter=0)
+        with pytest.raises(ValueError):
+            RootTracker().track([0.5, 0.3])
+    
+    def test_non_finite_values(self):
+        """测试非有限系数报错且不改变保存的根"""
+        tracker = RootTracker()
+        tracker.update([0.5])
+        roots = tracker.roots
+        
+        with pytest.raises(ValueError, match="有限数值"):
+            tracker.update([float('nan')])
+        with pytest.raises(ValueError, match="有限数值（第1行）"):
+            tracker.track([[0.4], [float('inf')]])
+        assert tracker.roots is roots
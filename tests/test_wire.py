@@ -0,0 +1,152 @@
+"""
+批量接口二进制格式测试
+"""
+
+import io
+import numpy as np
+import pytest
+from tsdiag.stream import check_models
+from tsdiag.wire import (
+    NPY_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    RESULT_DTYPE,
+    check_matrices,
+    decode_msgpack,
+    decode_npy,
+    encode_msgpack,
+    encode_npy,
+    matrices_to_models,
+    media_type,
+    negotiate,
+    records_to_results,
+    summarize,
+)
+
+
+def _npy(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def msgpack():
+    return pytest.importorskip("msgpack")
+
+
+class TestNegotiation:
+    """测试媒体类型规范化和内容协商"""
+    
+    def test_media_type(self):
+        assert media_type(None) == 'application/json'
+        assert media_type('Application/X-NPY; charset=binary') == NPY_MEDIA_TYPE
+        assert media_type('application/x-msgpack') == MSGPACK_MEDIA_TYPE
+    
+    def test_negotiate(self):
+        offers = ('application/json', NPY_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)
+        assert negotiate(None, offers) == 'application/json'
+        assert negotiate('*/*', offers) == 'application/json'
+        assert negotiate('application/x-npy', offers) == NPY_MEDIA_TYPE
+        assert negotiate('application/json;q=0.5, application/x-msgpack', offers) == MSGPACK_MEDIA_TYPE
+        assert negotiate('text/csv, application/*;q=0.1', offers) == 'application/json'
+        assert negotiate('text/csv', offers) is None
+        assert negotiate('application/x-npy;q=0', offers) is None
+
+
+class TestDecode:
+    """测试请求解码"""
+    
+    def test_npy(self):
+        matrix = decode_npy(_npy(np.array([[0.5, -0.3], [1.5, 0.0]])))
+        assert matrix.shape == (2, 2) and matrix.dtype == np.float64
+        assert decode_npy(_npy(np.array([[1, 0]], dtype=np.int32))).dtype == np.float64
+    
+    def test_npy_invalid(self):
+        with pytest.raises(ValueError, match="无法解析npy数据"):
+            decode_npy(b'not npy')
+        with pytest.raises(ValueError, match="形状为\\(N, p\\)"):
+            decode_npy(_npy(np.array([0.5, 0.3])))
+        with pytest.raises(ValueError, match="实数数组"):
+            decode_npy(_npy(np.array([[1j]])))
+    
+    def test_msgpack(self, msgpack):
+        ar = np.array([[0.5, -0.3], [0.2, 0.1]])
+        body = msgpack.packb({
+            'ar': {'data': ar.tobytes(), 'shape': [2, 2]},
+            'ma': {'data': np.array([0.4, 0.2], dtype='<f4').tobytes(), 'shape': [2, 1], 'dtype': '<f4'},
+            'model_names': ['a', 'b'],
+        })
+        parts, names = decode_msgpack(body)
+        
+        np.testing.assert_array_equal(parts['ar'], ar)
+        assert parts['ma'].dtype == np.float64 and parts['ma'].shape == (2, 1)
+        assert names == ['a', 'b']
+    
+    def test_msgpack_invalid(self, msgpack):
+        with pytest.raises(ValueError, match="至少需要AR或MA"):
+            decode_msgpack(msgpack.packb({'model_names': []}))
+        with pytest.raises(ValueError, match="无法解析AR系数数组"):
+            decode_msgpack(msgpack.packb({'ar': {'data': b'\0' * 12, 'shape': [2, 2]}}))
+        with pytest.raises(ValueError, match="行数必须相同"):
+            decode_msgpack(msgpack.packb({
+                'ar': {'data': np.zeros(2).tobytes(), 'shape': [2, 1]},
+                'ma': {'data': np.zeros(3).tobytes(), 'shape': [3, 1]},
+            }))
+
+
+class TestCheckMatrices:
+    """测试系数矩阵的向量化检验"""
+    
+    def test_matches_check_models(self):
+        ar = np.array([[0.5, -0.3], [1.5, 0.0], [0.0, 0.0], [0.9, 0.05]])
+        ma = np.array([[0.4], [0.2], [2.0], [0.1]])
+        results = check_matrices({'ar': ar, 'ma': ma})
+        expected = records_to_results(check_models(matrices_to_models({'ar': ar, 'ma': ma})))
+        
+        assert results.dtype == RESULT_DTYPE
+        for name in RESULT_DTYPE.names:
+            np.testing.assert_allclose(results[name], expected[name])
+    
+    def test_invalid_rows(self):
+        results = check_matrices({'ar': np.array([[0.5], [np.nan], [np.inf]]), 'ma': np.array([[0.3], [0.3], [0.3]])})
+        
+        assert results['model_valid'].tolist() == [True, False, False]
+        assert results['risk_level'].tolist() == [0, -1, -1]
+        assert not results['is_invertible'][1:].any()
+        assert summarize(results) == {
+            'total_models': 3,
+            'valid_models': 1,
+            'error_models': 2,
+            'ar_stationary_count': 1,
+            'ma_invertible_count': 1,
+        }
+    
+    def test_single_part_and_empty(self):
+        results = check_matrices({'ma': np.array([[0.3], [1.5]])})
+        assert results['is_invertible'].tolist() == [True, False]
+        assert np.isnan(results['stability_margin']).all()
+        assert len(check_matrices({'ar': np.zeros((0, 2))})) == 0
+        
+        with pytest.raises(ValueError, match="名称数量"):
+            check_matrices({'ar': np.zeros((2, 1))}, ['a'])
+
+
+class TestEncode:
+    """测试响应编码"""
+    
+    def test_npy_roundtrip(self):
+        results = check_matrices({'ar': np.array([[0.5], [1.5]])})
+        loaded = np.load(io.BytesIO(encode_npy(results)), allow_pickle=False)
+        assert loaded.dtype == RESULT_DTYPE
+        for name in RESULT_DTYPE.names:
+            np.testing.assert_array_equal(loaded[name], results[name])
+    
+    def test_msgpack_columns(self, msgpack):
+        results = check_matrices({'ar': np.array([[0.5], [1.5]])})
+        response = msgpack.unpackb(encode_msgpack(results, ['a', 'b']))
+        
+        column = response['columns']['stability_margin']
+        np.testing.assert_array_equal(np.frombuffer(column['data'], dtype=column['dtype']), results['stability_margin'])
+        assert response['risk_levels'] == ['low', 'medium', 'high']
+        assert response['summary']['valid_models'] == 1
+        assert response['model_names'] == ['a', 'b']